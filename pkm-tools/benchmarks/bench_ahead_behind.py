@@ -0,0 +1,150 @@
+"""Benchmark ahead/behind computation on a branch far behind its upstream.
+
+Compares materialising commit lists (GitPython ``iter_commits`` and ``rev-list`` output)
+with the counting path used by ``pkm branches`` (``rev-list --left-right --count``).
+
+The GitPython baseline needs the ``bench`` extra (``pip install -e ".[bench]"``).
+
+Usage:
+    python benchmarks/bench_ahead_behind.py --commits 50000 --behind 45000 --output ab.json
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Tuple
+
+import git
+from synthetic import create_bare_repository
+
+from pkm_tools.git_driver import AsyncGit
+
+
+def _iter_commits(repo_path: Path) -> Tuple[int, int]:
+    """Count with GitPython Commit objects (the original implementation)."""
+    repo = git.Repo(repo_path)
+    ahead = list(repo.iter_commits("origin/main..HEAD"))
+    behind = list(repo.iter_commits("HEAD..origin/main"))
+    return len(ahead), len(behind)
+
+
+def _rev_list_lines(repo_path: Path) -> Tuple[int, int]:
+    """Count the lines of two ``rev-list`` listings."""
+
+    async def count() -> Tuple[int, int]:
+        driver = AsyncGit()
+        ahead = await driver.run("rev-list", "origin/main..HEAD", "--", cwd=repo_path)
+        behind = await driver.run("rev-list", "HEAD..origin/main", "--", cwd=repo_path)
+        return len(ahead.stdout.splitlines()), len(behind.stdout.splitlines())
+
+    return asyncio.run(count())
+
+
+def _rev_list_count(repo_path: Path) -> Tuple[int, int]:
+    """Count with a single ``rev-list --left-right --count``."""
+    counts = asyncio.run(AsyncGit().ahead_behind(repo_path, "HEAD", "origin/main"))
+    assert counts is not None
+    return counts
+
+
+METHODS = {
+    "iter_commits": _iter_commits,
+    "rev_list_lines": _rev_list_lines,
+    "rev_list_count": _rev_list_count,
+}
+
+
+def _measure(method: Callable[[Path], Tuple[int, int]], repo_path: Path, rounds: int) -> dict:
+    """Time a method over several rounds and record its peak Python allocation.
+
+    Args:
+        method: Ahead/behind implementation
+        repo_path: Repository to inspect
+        rounds: Number of timed rounds
+
+    Returns:
+        Measurement dictionary
+    """
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        counts = method(repo_path)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    method(repo_path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ahead": counts[0],
+        "behind": counts[1],
+        "median_seconds": round(statistics.median(timings), 4),
+        "min_seconds": round(min(timings), 4),
+        "peak_python_bytes": peak,
+    }
+
+
+def run(commits: int, behind: int, ahead: int, rounds: int) -> dict:
+    """Build a clone ``behind`` commits behind and ``ahead`` commits ahead of origin/main.
+
+    Args:
+        commits: Commits in the synthetic upstream repository
+        behind: Commits the local branch is behind its upstream
+        ahead: Local commits not on the upstream
+        rounds: Timed rounds per method
+
+    Returns:
+        Benchmark results
+    """
+    with tempfile.TemporaryDirectory(prefix="pkm-bench-") as tmp:
+        tmp_path = Path(tmp)
+        url = create_bare_repository(tmp_path / "remote.git", commits, files=20, blob_size=64)
+        repo_path = tmp_path / "clone"
+        subprocess.run(["git", "clone", "--quiet", url, str(repo_path)], check=True)
+        subprocess.run(
+            ["git", "-C", str(repo_path), "reset", "--quiet", "--hard", f"HEAD~{behind}"], check=True
+        )
+        for number in range(ahead):
+            subprocess.run(
+                [
+                    "git", "-C", str(repo_path),
+                    "-c", "user.name=PKM Bench", "-c", "user.email=bench@example.com",
+                    "commit", "--quiet", "--allow-empty", "-m", f"local {number}",
+                ],
+                check=True,
+            )
+
+        return {
+            "parameters": {"commits": commits, "behind": behind, "ahead": ahead, "rounds": rounds},
+            "methods": {name: _measure(method, repo_path, rounds) for name, method in METHODS.items()},
+        }
+
+
+def main() -> None:
+    """Run the ahead/behind benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commits", type=int, default=50000)
+    parser.add_argument("--behind", type=int, default=45000)
+    parser.add_argument("--ahead", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to a file")
+    args = parser.parse_args()
+
+    results = run(args.commits, args.behind, args.ahead, args.rounds)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
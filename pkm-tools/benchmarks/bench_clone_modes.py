@@ -0,0 +1,99 @@
+"""Benchmark clone time and disk footprint for each clone mode.
+
+Usage:
+    python benchmarks/bench_clone_modes.py --commits 2000 --blob-size 4096 --output clone.json
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import create_bare_repository, create_pkm_root, disk_usage
+
+from pkm_tools.config import CloneOptions, PKMConfig
+from pkm_tools.repo_sync import RepositorySync
+
+MODES = {
+    "full": CloneOptions(),
+    "depth-1": CloneOptions(depth=1),
+    "blob-none": CloneOptions(filter="blob:none"),
+    "single-branch": CloneOptions(single_branch=True),
+    "depth-1-single-branch": CloneOptions(depth=1, single_branch=True),
+}
+
+
+def run(commits: int, files: int, blob_size: int, branches: int, repos: int) -> dict:
+    """Clone the same synthetic repositories once per clone mode.
+
+    Args:
+        commits: Commits per repository
+        files: Files per repository
+        blob_size: Size in bytes of each file version
+        branches: Branches per repository
+        repos: Number of repositories
+
+    Returns:
+        Benchmark results
+    """
+    with tempfile.TemporaryDirectory(prefix="pkm-bench-") as tmp:
+        tmp_path = Path(tmp)
+        urls = [
+            create_bare_repository(
+                tmp_path / "remotes" / f"repo-{index}.git", commits, files, blob_size, branches
+            )
+            for index in range(repos)
+        ]
+
+        results = {
+            "parameters": {
+                "commits": commits,
+                "files": files,
+                "blob_size": blob_size,
+                "branches": branches,
+                "repos": repos,
+            },
+            "modes": {},
+        }
+
+        for mode, options in MODES.items():
+            root = create_pkm_root(tmp_path / mode, {"bench": urls})
+            sync = RepositorySync(PKMConfig(pkm_root=root))
+
+            start = time.perf_counter()
+            clone_results = sync.clone_system("bench", "main", clone_options=options)
+            elapsed = time.perf_counter() - start
+
+            results["modes"][mode] = {
+                "options": options.git_args(),
+                "seconds": round(elapsed, 3),
+                "disk_bytes": disk_usage(root / "systems" / "bench" / "service-repositories"),
+                "failed": clone_results["failed"],
+            }
+
+    return results
+
+
+def main() -> None:
+    """Run the clone mode benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commits", type=int, default=1000)
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--blob-size", type=int, default=4096)
+    parser.add_argument("--branches", type=int, default=5)
+    parser.add_argument("--repos", type=int, default=4)
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to a file")
+    args = parser.parse_args()
+
+    results = run(args.commits, args.files, args.blob_size, args.branches, args.repos)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Benchmark git over SSH with and without shared master connections.
+
+Starts a throwaway ``sshd`` on localhost (needs the OpenSSH server binary), creates
+synthetic bare repositories and times ``git ls-remote`` and ``git fetch`` of every repository
+over ``ssh://``, once with a fresh SSH connection per command and once through an
+``SSHMultiplexer`` master connection.
+
+Usage:
+    python benchmarks/bench_ssh.py --repos 50 --output ssh.json
+"""
+
+import argparse
+import asyncio
+import getpass
+import json
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from synthetic import create_bare_repository
+
+from pkm_tools.git_driver import AsyncGit
+from pkm_tools.ssh import SSHMultiplexer
+
+_SSHD_CONFIG = """\
+Port {port}
+ListenAddress 127.0.0.1
+HostKey {tmp}/host_key
+AuthorizedKeysFile {tmp}/client_key.pub
+PidFile {tmp}/sshd.pid
+PasswordAuthentication no
+KbdInteractiveAuthentication no
+StrictModes no
+UsePAM no
+MaxStartups 100
+MaxSessions 100
+"""
+
+
+def _free_port() -> int:
+    """Get an unused local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_sshd(tmp_path: Path, port: int) -> subprocess.Popen:
+    """Start sshd on localhost accepting the benchmark's client key.
+
+    Args:
+        tmp_path: Scratch directory for keys and configuration
+        port: Port to listen on
+
+    Returns:
+        Running sshd process
+    """
+    sshd = shutil.which("sshd") or "/usr/sbin/sshd"
+    if not Path(sshd).exists():
+        sys.exit("sshd not found; install the OpenSSH server to run this benchmark")
+
+    for key in ("host_key", "client_key"):
+        subprocess.run(
+            ["ssh-keygen", "-q", "-t", "ed25519", "-N", "", "-f", str(tmp_path / key)], check=True
+        )
+    config = tmp_path / "sshd_config"
+    config.write_text(_SSHD_CONFIG.format(port=port, tmp=tmp_path))
+
+    process = subprocess.Popen([sshd, "-D", "-e", "-f", str(config)], stderr=subprocess.DEVNULL)
+    for _ in range(50):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    sys.exit("sshd did not start")
+
+
+async def _time_commands(driver: AsyncGit, urls: List[str], clones: List[Path]) -> dict:
+    """Time ls-remote and fetch of every repository through one driver."""
+    start = time.perf_counter()
+    await asyncio.gather(*(driver.run("ls-remote", url) for url in urls))
+    ls_remote = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await asyncio.gather(*(driver.run("fetch", "--quiet", "origin", cwd=clone) for clone in clones))
+    fetch = time.perf_counter() - start
+
+    return {"ls_remote_seconds": round(ls_remote, 3), "fetch_seconds": round(fetch, 3)}
+
+
+def run(repos: int, jobs: int) -> dict:
+    """Run the benchmark.
+
+    Args:
+        repos: Number of repositories
+        jobs: Concurrent git processes
+
+    Returns:
+        Benchmark results
+    """
+    with tempfile.TemporaryDirectory(prefix="pkm-bench-") as tmp:
+        tmp_path = Path(tmp)
+        port = _free_port()
+        sshd = _start_sshd(tmp_path, port)
+        try:
+            base_command = (
+                f"ssh -i {tmp_path / 'client_key'} -o StrictHostKeyChecking=no "
+                "-o UserKnownHostsFile=/dev/null -o LogLevel=ERROR"
+            )
+            user = getpass.getuser()
+            urls = []
+            clones = []
+            for index in range(repos):
+                path = tmp_path / "remotes" / f"repo-{index:04d}.git"
+                create_bare_repository(path, commits=10, files=5, blob_size=256)
+                url = f"ssh://{user}@127.0.0.1:{port}{path}"
+                clone = tmp_path / "clones" / path.stem
+                subprocess.run(
+                    ["git", "clone", "--quiet", "--bare", f"file://{path}", str(clone)], check=True
+                )
+                subprocess.run(
+                    ["git", "-C", str(clone), "remote", "set-url", "origin", url], check=True
+                )
+                urls.append(url)
+                clones.append(clone)
+
+            results = {"parameters": {"repos": repos, "jobs": jobs}, "modes": {}}
+
+            driver = AsyncGit(concurrency=jobs, ssh_command=base_command)
+            results["modes"]["per_command"] = asyncio.run(_time_commands(driver, urls, clones))
+
+            multiplexer = SSHMultiplexer(tmp_path / "control", base_command)
+            driver = AsyncGit(concurrency=jobs, ssh_command=multiplexer.command)
+
+            async def shared() -> dict:
+                start = time.perf_counter()
+                await multiplexer.connect(urls)
+                connect = time.perf_counter() - start
+                try:
+                    timings = await _time_commands(driver, urls, clones)
+                finally:
+                    await multiplexer.disconnect()
+                return {"connect_seconds": round(connect, 3), **timings}
+
+            results["modes"]["multiplexed"] = asyncio.run(shared())
+            return results
+        finally:
+            sshd.terminate()
+            sshd.wait()
+
+
+def main() -> None:
+    """Run the SSH multiplexing benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repos", type=int, default=50)
+    parser.add_argument("--jobs", type=int, default=8)
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to a file")
+    args = parser.parse_args()
+
+    results = run(args.repos, args.jobs)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
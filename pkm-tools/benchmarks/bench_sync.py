@@ -0,0 +1,277 @@
+"""Benchmark the sync engine end-to-end against synthetic local remotes.
+
+For each repository count, creates that many bare repositories (``file://`` URLs), writes
+them into a temporary ``repository-list.txt`` and times ``clone_system``,
+``get_repository_status``, ``get_branches``, ``sync_system`` and ``update_system``. Between
+runs a fraction of the remotes (the change rate) receives new commits.
+
+The files of each repository are spread over ``--directories`` directories. A second
+system lists the same remotes in a ``repositories.yaml`` with only ``--sparse-dirs`` of
+those directories checked out, and its sparse, partial clones and syncs are timed and
+measured on disk next to the full ones.
+
+Usage:
+    python benchmarks/bench_sync.py --repos 10 100 500 --output sync.json
+"""
+
+import argparse
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, List
+
+from synthetic import add_commits, create_bare_repository, create_pkm_root, disk_usage
+
+from pkm_tools.config import PKMConfig
+from pkm_tools.repo_sync import RepositorySync
+
+SYSTEM = "bench"
+SPARSE_SYSTEM = "bench-sparse"
+
+
+def _timed(operation: Callable[[], object]) -> dict:
+    """Run an operation and summarise its wall-clock time and outcome.
+
+    Args:
+        operation: Callable returning a run result dictionary or a list of per-repository
+            dictionaries
+
+    Returns:
+        Measurement dictionary
+    """
+    start = time.perf_counter()
+    result = operation()
+    measurement = {"seconds": round(time.perf_counter() - start, 3)}
+
+    if isinstance(result, dict):
+        # clone/sync/update run results
+        measurement["failed"] = result["failed"]
+        measurement["serial_seconds"] = round(result["serial_elapsed"], 3)
+    else:
+        measurement["failed"] = sum(1 for info in result if "error" in info or not info["exists"])
+
+    return measurement
+
+
+def _change_remotes(remotes: List[Path], change_rate: float, commits: int, blob_size: int) -> int:
+    """Add commits to a random fraction of the remotes.
+
+    Args:
+        remotes: Bare repository paths
+        change_rate: Fraction of remotes to change (0-1)
+        commits: Commits to add to each changed remote
+        blob_size: Size in bytes of each new file version
+
+    Returns:
+        Number of remotes changed
+    """
+    changed = random.sample(remotes, round(len(remotes) * change_rate))
+    with ThreadPoolExecutor() as pool:
+        list(pool.map(lambda path: add_commits(path, commits, blob_size), changed))
+    return len(changed)
+
+
+def run_one(
+    tmp_path: Path,
+    repos: int,
+    commits: int,
+    files: int,
+    blob_size: int,
+    change_rate: float,
+    new_commits: int,
+    jobs: int | None,
+    directories: int = 0,
+    sparse_dirs: int = 0,
+) -> dict:
+    """Benchmark every operation for one repository count.
+
+    Args:
+        tmp_path: Scratch directory
+        repos: Number of repositories
+        commits: Commits per repository
+        files: Files per repository
+        blob_size: Size in bytes of each file version
+        change_rate: Fraction of remotes that receive new commits before each sync/update
+        new_commits: Commits added to each changed remote
+        jobs: Concurrent operations (default: CPU count)
+        directories: Directories the files of each repository are spread over
+        sparse_dirs: Directories checked out by the sparse system (0 to skip it)
+
+    Returns:
+        Measurements keyed by operation
+    """
+    remotes = [tmp_path / "remotes" / f"repo-{index:04d}.git" for index in range(repos)]
+    with ThreadPoolExecutor() as pool:
+        urls = list(
+            pool.map(
+                lambda path: create_bare_repository(
+                    path, commits, files, blob_size, directories=directories
+                ),
+                remotes,
+            )
+        )
+
+    sparse = [f"dir-{index:02d}" for index in range(min(sparse_dirs, directories))]
+    systems = {SYSTEM: urls}
+    if sparse:
+        systems[SPARSE_SYSTEM] = []
+    root = create_pkm_root(tmp_path / "pkm", systems)
+    service_dir = root / "systems" / SYSTEM / "service-repositories"
+    sparse_dir = root / "systems" / SPARSE_SYSTEM / "service-repositories"
+    if sparse:
+        # Same remotes, but only the sparse directories (and top-level files) checked out
+        (sparse_dir / "repositories.yaml").write_text(
+            "repositories:\n"
+            + "".join(f"  - {{url: '{url}', sparse: [{', '.join(sparse)}]}}\n" for url in urls)
+        )
+    sync = RepositorySync(PKMConfig(pkm_root=root))
+    results = {}
+
+    results["clone_system"] = _timed(lambda: sync.clone_system(SYSTEM, "main", jobs))
+    results["clone_system"]["disk_bytes"] = disk_usage(service_dir)
+    if sparse:
+        results["clone_system_sparse"] = _timed(
+            lambda: sync.clone_system(SPARSE_SYSTEM, "main", jobs)
+        )
+        results["clone_system_sparse"]["disk_bytes"] = disk_usage(sparse_dir)
+    results["get_repository_status"] = _timed(lambda: sync.get_repository_status(SYSTEM))
+    results["get_branches"] = _timed(lambda: sync.get_branches(SYSTEM))
+
+    results["sync_system"] = _timed(lambda: sync.sync_system(SYSTEM, None, jobs))
+    results["sync_system"]["changed_remotes"] = 0
+    changed = _change_remotes(remotes, change_rate, new_commits, blob_size)
+    results["sync_system_changed"] = _timed(lambda: sync.sync_system(SYSTEM, None, jobs))
+    results["sync_system_changed"]["changed_remotes"] = changed
+    changed = _change_remotes(remotes, change_rate, new_commits, blob_size)
+    results["sync_system_fetch_first"] = _timed(
+        lambda: sync.sync_system(SYSTEM, None, jobs, fetch_first=True)
+    )
+    results["sync_system_fetch_first"]["changed_remotes"] = changed
+
+    if sparse:
+        # Fetches every change since the sparse clone, but checks out only its directories
+        _change_remotes(remotes, change_rate, new_commits, blob_size)
+        results["sync_system_sparse"] = _timed(lambda: sync.sync_system(SPARSE_SYSTEM, None, jobs))
+        results["sync_system_sparse"]["disk_bytes"] = disk_usage(sparse_dir)
+
+    # Remove a tenth of the clones so update both clones and syncs
+    for path in sorted(service_dir.glob("repo-*"))[: max(1, repos // 10)]:
+        shutil.rmtree(path)
+    changed = _change_remotes(remotes, change_rate, new_commits, blob_size)
+    results["update_system"] = _timed(lambda: sync.update_system(SYSTEM, None, jobs))
+    results["update_system"]["changed_remotes"] = changed
+
+    sync.state.close()
+    return results
+
+
+def run(
+    repo_counts: List[int],
+    commits: int,
+    files: int,
+    blob_size: int,
+    change_rate: float,
+    new_commits: int,
+    jobs: int | None,
+    seed: int,
+    directories: int = 0,
+    sparse_dirs: int = 0,
+) -> dict:
+    """Run the benchmark for each repository count.
+
+    Args:
+        repo_counts: Repository counts to benchmark
+        commits: Commits per repository
+        files: Files per repository
+        blob_size: Size in bytes of each file version
+        change_rate: Fraction of remotes that receive new commits before each sync/update
+        new_commits: Commits added to each changed remote
+        jobs: Concurrent operations (default: CPU count)
+        seed: Random seed selecting the changed remotes
+        directories: Directories the files of each repository are spread over
+        sparse_dirs: Directories checked out by the sparse system (0 to skip it)
+
+    Returns:
+        Benchmark results
+    """
+    random.seed(seed)
+    results = {
+        "parameters": {
+            "commits": commits,
+            "files": files,
+            "blob_size": blob_size,
+            "change_rate": change_rate,
+            "new_commits": new_commits,
+            "jobs": jobs,
+            "seed": seed,
+            "directories": directories,
+            "sparse_dirs": sparse_dirs,
+        },
+        "runs": {},
+    }
+
+    for repos in repo_counts:
+        with tempfile.TemporaryDirectory(prefix="pkm-bench-") as tmp:
+            results["runs"][str(repos)] = run_one(
+                Path(tmp),
+                repos,
+                commits,
+                files,
+                blob_size,
+                change_rate,
+                new_commits,
+                jobs,
+                directories,
+                sparse_dirs,
+            )
+
+    return results
+
+
+def main() -> None:
+    """Run the sync benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repos", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--commits", type=int, default=100)
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--blob-size", type=int, default=1024)
+    parser.add_argument("--change-rate", type=float, default=0.2)
+    parser.add_argument("--new-commits", type=int, default=3)
+    parser.add_argument("--jobs", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--directories", type=int, default=4)
+    parser.add_argument(
+        "--sparse-dirs", type=int, default=1, help="Directories checked out by sparse clones"
+    )
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to a file")
+    args = parser.parse_args()
+
+    if not 0 <= args.change_rate <= 1:
+        parser.error("--change-rate must be between 0 and 1")
+
+    results = run(
+        args.repos,
+        args.commits,
+        args.files,
+        args.blob_size,
+        args.change_rate,
+        args.new_commits,
+        args.jobs,
+        args.seed,
+        args.directories,
+        args.sparse_dirs,
+    )
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Synthetic git repositories for PKM tools benchmarks."""
+
+import os
+import subprocess
+from pathlib import Path
+
+_IDENTITY = "PKM Bench <bench@example.com>"
+
+
+def create_bare_repository(
+    path: Path,
+    commits: int = 100,
+    files: int = 20,
+    blob_size: int = 1024,
+    branches: int = 1,
+    directories: int = 0,
+) -> str:
+    """Create a bare repository with synthetic history using ``git fast-import``.
+
+    Each commit rewrites one file with fresh content, so the object count grows
+    linearly with ``commits`` while the working tree stays at ``files`` files.
+
+    Args:
+        path: Path of the bare repository to create
+        commits: Number of commits on the main branch
+        files: Number of files in the working tree
+        blob_size: Size in bytes of every file version
+        branches: Number of branches (extra branches fork from the last commit)
+        directories: Spread the files over this many top-level directories
+            (``dir-NN/``; 0 keeps them all at the top level)
+
+    Returns:
+        ``file://`` URL of the repository
+    """
+    subprocess.run(
+        ["git", "init", "--quiet", "--bare", "--initial-branch=main", str(path)], check=True
+    )
+    # Allow partial clones (--filter) from this repository over file:// URLs
+    subprocess.run(
+        ["git", "-C", str(path), "config", "uploadpack.allowFilter", "true"], check=True
+    )
+
+    process = subprocess.Popen(
+        ["git", "-C", str(path), "fast-import", "--quiet"], stdin=subprocess.PIPE
+    )
+    assert process.stdin is not None
+
+    for number in range(1, commits + 1):
+        content = os.urandom(blob_size // 2).hex().encode()
+        message = f"commit {number}".encode()
+        lines = [
+            b"commit refs/heads/main",
+            f"committer {_IDENTITY} {1_600_000_000 + number} +0000".encode(),
+            b"data %d" % len(message),
+            message,
+        ]
+        # First commits create the working tree one file at a time
+        file_number = number if number <= files else number % files
+        file_path = f"file-{file_number:04d}.txt"
+        if directories:
+            file_path = f"dir-{file_number % directories:02d}/{file_path}"
+        lines.append(f"M 644 inline {file_path}".encode())
+        lines += [b"data %d" % len(content), content, b""]
+        process.stdin.write(b"\n".join(lines) + b"\n")
+
+    for number in range(1, branches):
+        process.stdin.write(f"reset refs/heads/branch-{number}\nfrom refs/heads/main\n\n".encode())
+
+    process.stdin.close()
+    if process.wait() != 0:
+        raise RuntimeError(f"git fast-import failed for {path}")
+
+    return path.resolve().as_uri()
+
+
+def add_commits(path: Path, commits: int = 1, blob_size: int = 1024) -> None:
+    """Append commits to the main branch of a bare repository.
+
+    Args:
+        path: Path of the bare repository
+        commits: Number of commits to add
+        blob_size: Size in bytes of each new file version
+    """
+    process = subprocess.Popen(
+        ["git", "-C", str(path), "fast-import", "--quiet"], stdin=subprocess.PIPE
+    )
+    assert process.stdin is not None
+
+    for number in range(commits):
+        content = os.urandom(blob_size // 2).hex().encode()
+        message = f"update {number}".encode()
+        lines = [
+            b"commit refs/heads/main",
+            f"committer {_IDENTITY} {1_700_000_000 + number} +0000".encode(),
+            b"data %d" % len(message),
+            message,
+        ]
+        if number == 0:
+            # Continue from the existing branch; later commits chain in memory
+            lines.append(b"from refs/heads/main^0")
+        lines += [
+            f"M 644 inline update-{number:04d}.txt".encode(),
+            b"data %d" % len(content),
+            content,
+            b"",
+        ]
+        process.stdin.write(b"\n".join(lines) + b"\n")
+
+    process.stdin.close()
+    if process.wait() != 0:
+        raise RuntimeError(f"git fast-import failed for {path}")
+
+
+def create_pkm_root(root: Path, systems: dict) -> Path:
+    """Create a minimal PKM root with ``repository-list.txt`` files.
+
+    Args:
+        root: Directory to create the PKM root in
+        systems: Mapping of system name to list of repository URLs
+
+    Returns:
+        Path to the PKM root
+    """
+    for system, urls in systems.items():
+        service_dir = root / "systems" / system / "service-repositories"
+        service_dir.mkdir(parents=True, exist_ok=True)
+        (service_dir / "repository-list.txt").write_text("\n".join(urls) + "\n")
+    return root
+
+
+def disk_usage(path: Path) -> int:
+    """Get the total size in bytes of all files below a path.
+
+    Args:
+        path: Directory to measure
+
+    Returns:
+        Total size in bytes
+    """
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file() and not f.is_symlink())
@@ -0,0 +1,270 @@
+"""Bitbucket Server REST client with connection reuse and a response cache."""
+
+import hashlib
+import http.client
+import json
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Errors of a pooled connection the server closed while it sat idle
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+class BitbucketError(Exception):
+    """Bitbucket REST API request failure."""
+
+
+class BitbucketClient:
+    """Client for one Bitbucket Server instance.
+
+    Requests share a pool of keep-alive connections instead of opening one per call. JSON
+    responses are cached on disk with their ``ETag``: within ``ttl`` seconds a cached
+    response is returned without contacting the server, after that it is revalidated with
+    ``If-None-Match`` and reused if the server answers ``304 Not Modified``.
+
+    The client is thread-safe; ``get_many`` resolves several resources concurrently.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token: str,
+        cache_dir: Optional[Path] = None,
+        ttl: float = 300.0,
+        timeout: float = 10.0,
+        pool_size: int = 8,
+    ):
+        """Initialize the client.
+
+        Args:
+            base_url: Server URL (e.g. "https://mangit.maninvestments.com")
+            token: Personal access token sent as a bearer token
+            cache_dir: Directory of the response cache (None disables caching)
+            ttl: Seconds a cached response is used without revalidation
+            timeout: Socket timeout of each request in seconds
+            pool_size: Highest number of idle connections kept open
+        """
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise BitbucketError(f"Invalid Bitbucket URL: {base_url}")
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.token = token
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self.stats = {"requests": 0, "connections": 0, "cache_hits": 0, "not_modified": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str) -> None:
+        """Increment a statistics counter (called from worker threads)."""
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _connect(self) -> http.client.HTTPConnection:
+        """Take an idle connection from the pool, or open a new one."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        self._count("connections")
+        connection_class = (
+            http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        )
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, connection: http.client.HTTPConnection) -> None:
+        """Return a connection to the pool, closing it if the pool is full."""
+        if self._idle.qsize() >= self.pool_size:
+            connection.close()
+            return
+        self._idle.put(connection)
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _request(self, path: str, etag: Optional[str]) -> Tuple[int, bytes, Optional[str]]:
+        """Send one GET request over a pooled connection.
+
+        A request failing on a reused connection (closed by the server while idle) is
+        sent once more over a fresh one.
+
+        Args:
+            path: Request path including the query string
+            etag: ``ETag`` of the cached response, sent as ``If-None-Match``
+
+        Returns:
+            Tuple of (status code, body, ``ETag`` header)
+
+        Raises:
+            BitbucketError: If the server cannot be reached
+        """
+        headers = {
+            "Authorization": f"Bearer {self.token}",
+            "Accept": "application/json",
+        }
+        if etag:
+            headers["If-None-Match"] = etag
+
+        for attempt in range(2):
+            connection = self._connect()
+            reused = connection.sock is not None
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except _STALE_CONNECTION_ERRORS as e:
+                connection.close()
+                if reused and attempt == 0:
+                    continue
+                raise BitbucketError(f"Connection to {self.host} failed: {e}") from e
+            except (OSError, http.client.HTTPException) as e:
+                connection.close()
+                raise BitbucketError(f"Connection to {self.host} failed: {e}") from e
+
+            self._count("requests")
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(connection)
+            return response.status, body, response.getheader("ETag")
+
+        raise AssertionError("unreachable")
+
+    def _cache_file(self, path: str) -> Optional[Path]:
+        """Get the cache file of a request path (None if caching is disabled)."""
+        if self.cache_dir is None:
+            return None
+        key = hashlib.sha256(f"{self.scheme}://{self.host}:{self.port}{path}".encode())
+        return self.cache_dir / f"{key.hexdigest()}.json"
+
+    def _read_cache(self, cache_file: Optional[Path]) -> Optional[Dict[str, Any]]:
+        """Load a cache entry, ignoring missing, unreadable or malformed files."""
+        if cache_file is None:
+            return None
+        try:
+            entry = json.loads(cache_file.read_text())
+        except (OSError, ValueError):
+            return None
+
+        if (
+            not isinstance(entry, dict)
+            or "data" not in entry
+            or not isinstance(entry.get("fetched_at"), (int, float))
+            or not isinstance(entry.get("etag"), (str, type(None)))
+        ):
+            logger.debug(f"Ignoring malformed Bitbucket cache entry {cache_file}")
+            return None
+        return entry
+
+    def _write_cache(self, cache_file: Optional[Path], entry: Dict[str, Any]) -> None:
+        """Store a cache entry atomically, so concurrent readers never see partial files."""
+        if cache_file is None:
+            return
+        try:
+            cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as temp:
+                json.dump(entry, temp)
+            Path(temp_path).replace(cache_file)
+        except OSError as e:
+            logger.debug(f"Failed to write Bitbucket cache entry {cache_file}: {e}")
+
+    def get_json(self, path: str, max_age: Optional[float] = None) -> Any:
+        """Get a JSON resource, from the cache when it is fresh or still valid.
+
+        Args:
+            path: API path (e.g. "/rest/api/1.0/projects/ETS/repos/tomahawk2/pull-requests/1")
+            max_age: Seconds a cached response is used without revalidation (default: ``ttl``;
+                0 always revalidates)
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            BitbucketError: If the request fails or the response is not JSON
+        """
+        max_age = self.ttl if max_age is None else max_age
+        cache_file = self._cache_file(path)
+        cached = self._read_cache(cache_file)
+        if cached is not None and time.time() - cached["fetched_at"] < max_age:
+            self._count("cache_hits")
+            return cached["data"]
+
+        status, body, etag = self._request(path, cached.get("etag") if cached else None)
+
+        if status == 304 and cached is not None:
+            self._count("not_modified")
+            cached["fetched_at"] = time.time()
+            self._write_cache(cache_file, cached)
+            return cached["data"]
+        if status != 200:
+            detail = body.decode(errors="replace").strip()[:200]
+            raise BitbucketError(f"HTTP {status} for {path}: {detail}")
+
+        try:
+            data = json.loads(body)
+        except ValueError as e:
+            raise BitbucketError(f"Invalid JSON response for {path}: {e}") from e
+
+        self._write_cache(cache_file, {"etag": etag, "fetched_at": time.time(), "data": data})
+        return data
+
+    def get_many(self, paths: List[str], max_age: Optional[float] = None) -> List[Any]:
+        """Get several JSON resources concurrently over the connection pool.
+
+        Args:
+            paths: API paths
+            max_age: Seconds a cached response is used without revalidation (default: ``ttl``)
+
+        Returns:
+            Decoded JSON response, or the ``BitbucketError`` raised for it, per path in order
+        """
+
+        def get(path: str) -> Any:
+            try:
+                return self.get_json(path, max_age)
+            except BitbucketError as e:
+                return e
+
+        if len(paths) <= 1:
+            return [get(path) for path in paths]
+        with ThreadPoolExecutor(max_workers=min(self.pool_size, len(paths))) as executor:
+            return list(executor.map(get, paths))
+
+    @staticmethod
+    def pull_request_path(project_key: str, repo_slug: str, pr_id: str) -> str:
+        """Get the REST API path of a pull request.
+
+        Args:
+            project_key: Project key (e.g. "ETS")
+            repo_slug: Repository slug
+            pr_id: Pull request ID
+
+        Returns:
+            API path
+        """
+        return f"/rest/api/1.0/projects/{project_key}/repos/{repo_slug}/pull-requests/{pr_id}"
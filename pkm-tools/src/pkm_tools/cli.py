@@ -1,17 +1,379 @@
 """Command-line interface for PKM tools."""
 
+import json
 import sys
-from typing import Optional
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
 import click
-from rich.console import Console
-from rich.table import Table
 
-from pkm_tools.config import PKMConfig
-from pkm_tools.repo_sync import RepositorySync, RepositorySyncError
-from pkm_tools.utils import setup_logging
+from pkm_tools.utils import default_jobs, extract_repo_name, setup_logging
 
-console = Console()
+# Heavy modules (pydantic, rich, the sync engine) are imported by the commands that need
+# them, so --help, shell completion and trivial commands start quickly
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from pkm_tools.config import CloneOptions, PKMConfig
+    from pkm_tools.registry import RepositoryRegistry
+    from pkm_tools.repo_sync import RepositorySync
+
+
+class _LazyConsole:
+    """Stand-in for the rich console that creates it on first use."""
+
+    def __init__(self) -> None:
+        self._console: Optional["Console"] = None
+        self._stderr = False
+
+    def __getattr__(self, name: str) -> Any:
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console(stderr=self._stderr)
+        return getattr(self._console, name)
+
+    def use_stderr(self, enabled: bool) -> None:
+        """Write messages to stderr (keeping stdout for machine-readable output) or stdout."""
+        self._stderr = enabled
+        if self._console is not None:
+            self._console.stderr = enabled
+
+
+console = _LazyConsole()
+
+
+def _clone_mode_options(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Add shallow, partial and single-branch clone options to a command.
+
+    Args:
+        func: Click command function
+
+    Returns:
+        Decorated command function
+    """
+    func = click.option(
+        "--dissociate/--no-dissociate",
+        default=None,
+        help="Copy objects borrowed from the mirror cache into each clone",
+    )(func)
+    func = click.option(
+        "--reference/--no-reference",
+        default=None,
+        help="Borrow objects from the shared mirror cache (default: system configuration)",
+    )(func)
+    func = click.option(
+        "--single-branch/--no-single-branch",
+        default=None,
+        help="Clone only the requested branch (default: system configuration)",
+    )(func)
+    func = click.option(
+        "--filter",
+        "clone_filter",
+        default=None,
+        help="Partial clone filter, e.g. blob:none (default: system configuration)",
+    )(func)
+    return click.option(
+        "--depth",
+        type=click.IntRange(min=1),
+        default=None,
+        help="Shallow clone depth (default: system configuration)",
+    )(func)
+
+
+_from_mirror_option = click.option(
+    "--from-mirror/--no-from-mirror",
+    "use_mirror",
+    default=None,
+    help="Refresh the local mirrors once, then fetch from them (default: PKM_USE_MIRROR)",
+)
+
+
+def _profile_options(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Add per-phase timing options to a command.
+
+    Args:
+        func: Click command function
+
+    Returns:
+        Decorated command function
+    """
+    func = click.option(
+        "--trace",
+        type=click.Path(dir_okay=False, path_type=Path),
+        default=None,
+        help="Append every timing span to this JSON-lines file",
+    )(func)
+    return click.option(
+        "--profile",
+        is_flag=True,
+        help="Show the slowest repositories and where their time went",
+    )(func)
+
+
+def _system_choices(registry: "RepositoryRegistry", allow_all: bool) -> List[str]:
+    """List the valid values of a ``--system`` option.
+
+    Args:
+        registry: Repository registry of the PKM root
+        allow_all: Whether "all" is accepted
+
+    Returns:
+        System names discovered under ``systems/``, plus "all" if allowed
+    """
+    systems = sorted(registry.systems())
+    return [*systems, "all"] if allow_all else systems
+
+
+def _system_option(action: str, allow_all: bool = True) -> Callable[..., Any]:
+    """Build the option selecting a system, validated against the systems on disk.
+
+    Args:
+        action: What the command does to the system, for the help text (e.g. "sync")
+        allow_all: Whether "all" is accepted (and the default)
+
+    Returns:
+        Click option decorator
+    """
+
+    def validate(ctx: click.Context, param: click.Parameter, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return value
+        choices = _system_choices(_get_registry(ctx), allow_all)
+        if value not in choices:
+            raise click.BadParameter(
+                f"{value!r} is not one of {', '.join(map(repr, choices))}.", ctx, param
+            )
+        return value
+
+    def complete(_ctx: click.Context, _param: click.Parameter, incomplete: str) -> List[str]:
+        # Completion runs without the group callback, so nothing is cached in ctx.obj
+        from pkm_tools.config import PKMConfig
+        from pkm_tools.registry import RepositoryRegistry
+
+        try:
+            choices = _system_choices(RepositoryRegistry(PKMConfig()), allow_all)
+        except ValueError:
+            return []
+        return [choice for choice in choices if choice.startswith(incomplete)]
+
+    return click.option(
+        "--system",
+        metavar="SYSTEM",
+        default="all" if allow_all else None,
+        required=not allow_all,
+        callback=validate,
+        shell_complete=complete,
+        help=f"System to {action}" + (" (default: all)" if allow_all else ""),
+    )
+
+
+def _format_option(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Add the output format option to a command.
+
+    Args:
+        func: Click command function
+
+    Returns:
+        Decorated command function
+    """
+    return click.option(
+        "--format",
+        "output_format",
+        type=click.Choice(["table", "json", "jsonl"]),
+        default="table",
+        help=(
+            "Output format: table, json (one document at the end) or jsonl "
+            "(one record per repository as soon as it is done)"
+        ),
+    )(func)
+
+
+def _emit_record(system: str, record: Dict[str, Any]) -> None:
+    """Write one repository record as a line of JSON to stdout.
+
+    Args:
+        system: System the repository belongs to
+        record: Result or information dictionary of the repository
+    """
+    click.echo(json.dumps({"system": system, **record}, default=str))
+
+
+def _start_output(
+    output_format: str, sync_manager: Optional["RepositorySync"] = None
+) -> None:
+    """Prepare a command for its output format.
+
+    With json and jsonl, stdout carries only the records; messages move to stderr. With
+    jsonl, every repository handled by ``sync_manager`` is written as soon as it is done.
+
+    Args:
+        output_format: Output format (table, json or jsonl)
+        sync_manager: Repository sync manager whose results to stream
+    """
+    console.use_stderr(output_format != "table")
+    if output_format == "jsonl" and sync_manager is not None:
+        sync_manager.on_result = _emit_record
+
+
+def _emit_systems(
+    output_format: str, results: Dict[str, List[Dict[str, Any]]], streamed: bool
+) -> None:
+    """Write per-system repository records in a machine-readable format.
+
+    Args:
+        output_format: Output format (json or jsonl)
+        results: Dictionary of system name to repository dictionaries
+        streamed: Whether jsonl records were already written as they completed
+    """
+    if output_format == "json":
+        click.echo(json.dumps({"systems": results}, default=str, indent=2))
+    elif not streamed:
+        for system, records in results.items():
+            for record in records:
+                _emit_record(system, record)
+
+
+def _daemon_option(default: bool) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Build the option answering a command from a running daemon.
+
+    Args:
+        default: Whether the daemon is used unless the option is given
+
+    Returns:
+        Click option decorator
+    """
+    return click.option(
+        "--daemon/--no-daemon",
+        "use_daemon",
+        default=default,
+        help=(
+            "Answer from a running pkm daemon when available "
+            f"(default: {'on' if default else 'off'})"
+        ),
+    )
+
+
+def _daemon_answer(
+    config: "PKMConfig", command: str, systems: List[str]
+) -> Optional[Dict[str, Any]]:
+    """Ask a running daemon for status or branch information.
+
+    Args:
+        config: PKM configuration
+        command: Daemon command (status or branches)
+        systems: System names
+
+    Returns:
+        Dictionary of system name to repository dictionaries, or None if no daemon answered
+    """
+    from pkm_tools.daemon import query_daemon
+
+    response = query_daemon(config.daemon_socket, command, systems=systems)
+    if response is None:
+        return None
+    as_of = datetime.fromtimestamp(response["as_of"]).strftime("%Y-%m-%d %H:%M:%S")
+    console.print(f"[dim]From pkm daemon (as of {as_of})[/dim]")
+    systems_info: Dict[str, List[Dict[str, Any]]] = response["systems"]
+    return systems_info
+
+
+def _build_clone_options(
+    depth: Optional[int],
+    clone_filter: Optional[str],
+    single_branch: Optional[bool],
+    reference: Optional[bool],
+    dissociate: Optional[bool],
+) -> Optional["CloneOptions"]:
+    """Build clone options from command-line flags.
+
+    Args:
+        depth: Shallow clone depth
+        clone_filter: Partial clone filter spec
+        single_branch: Whether to clone only the requested branch
+        reference: Whether to borrow objects from the shared mirror cache
+        dissociate: Whether to copy borrowed objects into the clone
+
+    Returns:
+        Clone options, or None if no flag was given
+    """
+    from pkm_tools.config import CloneOptions
+
+    options = CloneOptions(
+        depth=depth,
+        filter=clone_filter,
+        single_branch=single_branch,
+        reference=reference,
+        dissociate=dissociate,
+    )
+    if not options.model_dump(exclude_none=True):
+        return None
+    return options
+
+
+def _get_config(ctx: click.Context) -> "PKMConfig":
+    """Get the configuration of the invocation, loading it on first use.
+
+    Args:
+        ctx: Click context
+
+    Returns:
+        PKM configuration
+    """
+    if "config" not in ctx.obj:
+        from pkm_tools.config import PKMConfig
+
+        try:
+            ctx.obj["config"] = PKMConfig()
+        except Exception as e:
+            console.print(f"[red]Error initializing PKM tools: {e}[/red]")
+            sys.exit(1)
+    config: "PKMConfig" = ctx.obj["config"]
+    return config
+
+
+def _get_registry(ctx: click.Context) -> "RepositoryRegistry":
+    """Get the repository registry of the invocation, creating it on first use.
+
+    Validating ``--system`` and listing systems only need the registry, so they do not
+    build the sync engine.
+
+    Args:
+        ctx: Click context
+
+    Returns:
+        Repository registry
+    """
+    if "registry" not in ctx.obj:
+        config = _get_config(ctx)
+        from pkm_tools.registry import RepositoryRegistry
+
+        ctx.obj["registry"] = RepositoryRegistry(config)
+    registry: "RepositoryRegistry" = ctx.obj["registry"]
+    return registry
+
+
+def _get_sync(ctx: click.Context) -> "RepositorySync":
+    """Get the repository sync manager of the invocation, creating it on first use.
+
+    Args:
+        ctx: Click context
+
+    Returns:
+        Repository sync manager
+    """
+    if "sync" not in ctx.obj:
+        config = _get_config(ctx)
+        from pkm_tools.repo_sync import RepositorySync
+
+        try:
+            ctx.obj["sync"] = RepositorySync(config, registry=_get_registry(ctx))
+        except Exception as e:
+            console.print(f"[red]Error initializing PKM tools: {e}[/red]")
+            sys.exit(1)
+    sync_manager: "RepositorySync" = ctx.obj["sync"]
+    return sync_manager
 
 
 @click.group()
@@ -21,39 +383,64 @@ def main(ctx: click.Context, log_level: str) -> None:
     """PKM Tools - Manage your Personal Knowledge Management repository."""
     setup_logging(log_level)
     ctx.ensure_object(dict)
-    try:
-        ctx.obj["config"] = PKMConfig()
-        ctx.obj["sync"] = RepositorySync(ctx.obj["config"])
-    except Exception as e:
-        console.print(f"[red]Error initializing PKM tools: {e}[/red]")
-        sys.exit(1)
+    console.use_stderr(False)
 
 
 @main.command()
+@_system_option("sync")
+@click.option("--branch", default=None, help="Branch to sync (default: auto-detect from repository)")
 @click.option(
-    "--system",
-    type=click.Choice(["thk", "man-oms", "GCP", "all"]),
-    default="all",
-    help="System to sync (default: all)",
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=default_jobs,
+    show_default="CPU count",
+    help="Number of repositories to sync concurrently",
 )
-@click.option("--branch", default=None, help="Branch to sync (default: auto-detect from repository)")
+@click.option(
+    "--fetch-first",
+    is_flag=True,
+    help="Check remote heads first, skip unchanged repositories and only fast-forward",
+)
+@_from_mirror_option
+@_profile_options
+@_format_option
 @click.pass_context
-def sync(ctx: click.Context, system: str, branch: Optional[str]) -> None:
+def sync(
+    ctx: click.Context,
+    system: str,
+    branch: Optional[str],
+    jobs: int,
+    fetch_first: bool,
+    use_mirror: Optional[bool],
+    profile: bool,
+    trace: Optional[Path],
+    output_format: str,
+) -> None:
     """Sync repositories for a system or all systems."""
-    sync_manager: RepositorySync = ctx.obj["sync"]
+    from pkm_tools.repo_sync import RepositorySyncError
+
+    sync_manager = _get_sync(ctx)
+    _start_output(output_format, sync_manager)
 
     try:
         if system == "all":
             console.print("[bold blue]Syncing all systems...[/bold blue]")
-            results = sync_manager.sync_all_systems(branch)
-
-            # Display results
-            for system_result in results["systems"]:
-                _display_sync_results(system_result)
+            results = sync_manager.sync_all_systems(branch, jobs, fetch_first, use_mirror)
+            system_results = results["systems"]
         else:
             console.print(f"[bold blue]Syncing system: {system}[/bold blue]")
-            results = sync_manager.sync_system(system, branch)
-            _display_sync_results(results)
+            results = sync_manager.sync_system(system, branch, jobs, fetch_first, use_mirror)
+            system_results = [results]
+
+        if output_format == "table":
+            for system_result in system_results:
+                _display_sync_results(system_result)
+            _display_timing(results)
+            _display_hosts(results)
+        elif output_format == "json":
+            click.echo(json.dumps(results, default=str, indent=2))
+        _report_profile(sync_manager, results, profile, trace)
 
     except RepositorySyncError as e:
         console.print(f"[red]Sync failed: {e}[/red]")
@@ -61,30 +448,94 @@ def sync(ctx: click.Context, system: str, branch: Optional[str]) -> None:
 
 
 @main.command()
+@_system_option("update")
+@click.option("--branch", default=None, help="Branch to update (default: auto-detect from repository)")
 @click.option(
-    "--system",
-    type=click.Choice(["thk", "man-oms", "GCP", "all"]),
-    default="all",
-    help="System to update (default: all)",
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=default_jobs,
+    show_default="CPU count",
+    help="Number of repositories to update concurrently",
 )
-@click.option("--branch", default=None, help="Branch to update (default: auto-detect from repository)")
+@click.option(
+    "--fetch-first",
+    is_flag=True,
+    help="Check remote heads first, skip unchanged repositories and only fast-forward",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="Show the planned action for every repository without changing anything",
+)
+@_clone_mode_options
+@_from_mirror_option
+@_profile_options
+@_format_option
 @click.pass_context
-def update(ctx: click.Context, system: str, branch: Optional[str]) -> None:
+def update(
+    ctx: click.Context,
+    system: str,
+    branch: Optional[str],
+    jobs: int,
+    fetch_first: bool,
+    dry_run: bool,
+    depth: Optional[int],
+    clone_filter: Optional[str],
+    single_branch: Optional[bool],
+    reference: Optional[bool],
+    dissociate: Optional[bool],
+    use_mirror: Optional[bool],
+    profile: bool,
+    trace: Optional[Path],
+    output_format: str,
+) -> None:
     """Update repositories (clone if new, sync if existing)."""
-    sync_manager: RepositorySync = ctx.obj["sync"]
+    from pkm_tools.repo_sync import RepositorySyncError
+
+    sync_manager = _get_sync(ctx)
+    _start_output(output_format, sync_manager)
+    clone_options = _build_clone_options(depth, clone_filter, single_branch, reference, dissociate)
 
     try:
+        if dry_run:
+            plan = sync_manager.plan_update(
+                None if system == "all" else system, branch, fetch_first, use_mirror
+            )
+            if output_format != "table":
+                _emit_systems(
+                    output_format,
+                    {system_plan["system"]: system_plan["repos"] for system_plan in plan["systems"]},
+                    streamed=False,
+                )
+                return
+            for system_plan in plan["systems"]:
+                _display_plan(system_plan)
+            counts = " | ".join(f"{action}: {count}" for action, count in plan["counts"].items())
+            console.print(f"\n[dim]Planned: {counts}[/dim]")
+            return
+
         if system == "all":
             console.print("[bold blue]Updating all systems...[/bold blue]")
-            results = sync_manager.update_all_systems(branch)
-
-            # Display results
-            for system_result in results["systems"]:
-                _display_update_results(system_result)
+            results = sync_manager.update_all_systems(
+                branch, jobs, fetch_first, clone_options, use_mirror
+            )
+            system_results = results["systems"]
         else:
             console.print(f"[bold blue]Updating system: {system}[/bold blue]")
-            results = sync_manager.update_system(system, branch)
-            _display_update_results(results)
+            results = sync_manager.update_system(
+                system, branch, jobs, fetch_first, clone_options, use_mirror
+            )
+            system_results = [results]
+
+        if output_format == "table":
+            for system_result in system_results:
+                _display_update_results(system_result)
+            _display_timing(results)
+            _display_hosts(results)
+        elif output_format == "json":
+            click.echo(json.dumps(results, default=str, indent=2))
+        _report_profile(sync_manager, results, profile, trace)
 
     except RepositorySyncError as e:
         console.print(f"[red]Update failed: {e}[/red]")
@@ -92,93 +543,178 @@ def update(ctx: click.Context, system: str, branch: Optional[str]) -> None:
 
 
 @main.command()
+@_system_option("clone")
+@click.option(
+    "--branch",
+    default=None,
+    help="Branch to clone (default: the branch in system.yaml, else main)",
+)
 @click.option(
-    "--system",
-    type=click.Choice(["thk", "man-oms", "GCP", "all"]),
-    default="all",
-    help="System to clone (default: all)",
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=default_jobs,
+    show_default="CPU count",
+    help="Number of repositories to clone concurrently",
 )
-@click.option("--branch", default="main", help="Branch to clone (default: main)")
+@_clone_mode_options
+@_from_mirror_option
+@_profile_options
+@_format_option
 @click.pass_context
-def clone(ctx: click.Context, system: str, branch: str) -> None:
+def clone(
+    ctx: click.Context,
+    system: str,
+    branch: Optional[str],
+    jobs: int,
+    depth: Optional[int],
+    clone_filter: Optional[str],
+    single_branch: Optional[bool],
+    reference: Optional[bool],
+    dissociate: Optional[bool],
+    use_mirror: Optional[bool],
+    profile: bool,
+    trace: Optional[Path],
+    output_format: str,
+) -> None:
     """Clone repositories for a system or all systems."""
-    sync_manager: RepositorySync = ctx.obj["sync"]
+    from pkm_tools.repo_sync import RepositorySyncError
+
+    sync_manager = _get_sync(ctx)
+    _start_output(output_format, sync_manager)
+    clone_options = _build_clone_options(depth, clone_filter, single_branch, reference, dissociate)
 
     try:
         if system == "all":
             console.print("[bold blue]Cloning all systems...[/bold blue]")
-            results = sync_manager.clone_all_systems(branch)
+            results = sync_manager.clone_all_systems(branch, jobs, clone_options, use_mirror)
+            system_results = results["systems"]
+        else:
+            console.print(f"[bold blue]Cloning system: {system}[/bold blue]")
+            results = sync_manager.clone_system(system, branch, jobs, clone_options, use_mirror)
+            system_results = [results]
+
+        if output_format == "table":
+            for system_result in system_results:
+                _display_clone_results(system_result)
+            _display_timing(results)
+            _display_hosts(results)
+        elif output_format == "json":
+            click.echo(json.dumps(results, default=str, indent=2))
+        _report_profile(sync_manager, results, profile, trace)
+
+    except RepositorySyncError as e:
+        console.print(f"[red]Clone failed: {e}[/red]")
+        sys.exit(1)
+
+
+@main.command()
+@_system_option("mirror")
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=default_jobs,
+    show_default="CPU count",
+    help="Number of mirrors to update concurrently",
+)
+@click.pass_context
+def mirror(ctx: click.Context, system: str, jobs: int) -> None:
+    """Create or refresh the local bare mirror of every repository."""
+    from pkm_tools.repo_sync import RepositorySyncError
+
+    sync_manager = _get_sync(ctx)
+
+    try:
+        if system == "all":
+            console.print("[bold blue]Mirroring all systems...[/bold blue]")
+            results = sync_manager.mirror_all_systems(jobs)
 
             # Display results
             for system_result in results["systems"]:
-                _display_clone_results(system_result)
+                _display_mirror_results(system_result)
+            _display_timing(results)
+            _display_hosts(results)
         else:
-            console.print(f"[bold blue]Cloning system: {system}[/bold blue]")
-            results = sync_manager.clone_system(system, branch)
-            _display_clone_results(results)
+            console.print(f"[bold blue]Mirroring system: {system}[/bold blue]")
+            results = sync_manager.mirror_system(system, jobs)
+            _display_mirror_results(results)
+            _display_timing(results)
+            _display_hosts(results)
 
     except RepositorySyncError as e:
-        console.print(f"[red]Clone failed: {e}[/red]")
+        console.print(f"[red]Mirror failed: {e}[/red]")
         sys.exit(1)
 
 
 @main.command()
+@_system_option("check status")
 @click.option(
-    "--system",
-    type=click.Choice(["thk", "man-oms", "GCP", "all"]),
-    default="all",
-    help="System to check status (default: all)",
+    "--cached",
+    is_flag=True,
+    help="Show the last recorded sync state without opening repositories",
 )
+@click.option(
+    "--untracked/--no-untracked",
+    default=False,
+    help="Also scan for untracked files (slow on large working trees; default: off)",
+)
+@click.option(
+    "--fsmonitor/--no-fsmonitor",
+    default=None,
+    help="Use core.fsmonitor and the untracked cache (default: PKM_STATUS_FSMONITOR)",
+)
+# Off by default: the daemon's view of working trees can be a rescan interval old
+@_daemon_option(default=False)
+@_format_option
 @click.pass_context
-def status(ctx: click.Context, system: str) -> None:
+def status(
+    ctx: click.Context,
+    system: str,
+    cached: bool,
+    untracked: bool,
+    fsmonitor: Optional[bool],
+    use_daemon: bool,
+    output_format: str,
+) -> None:
     """Show status of repositories for a system or all systems."""
-    sync_manager: RepositorySync = ctx.obj["sync"]
-    config: PKMConfig = ctx.obj["config"]
+    from pkm_tools.repo_sync import RepositorySyncError
+
+    sync_manager = _get_sync(ctx)
+    config = _get_config(ctx)
+    _start_output(output_format, sync_manager)
 
     try:
-        if system == "all":
-            systems = config.list_systems()
-            for sys_name in systems:
-                statuses = sync_manager.get_repository_status(sys_name)
-
-                table = Table(title=f"Repository Status - {sys_name}")
-                table.add_column("Repository", style="cyan")
-                table.add_column("Exists", style="green")
-                table.add_column("Branch", style="yellow")
-                table.add_column("Dirty", style="red")
-                table.add_column("Commit", style="blue")
-
-                for status_info in statuses:
-                    table.add_row(
-                        status_info["name"],
-                        "" if status_info["exists"] else "",
-                        status_info.get("branch", "-"),
-                        "" if status_info.get("dirty") else "",
-                        status_info.get("commit", "-"),
-                    )
-
-                console.print(table)
-                console.print()  # Add spacing between systems
+        systems = sync_manager.registry.systems() if system == "all" else [system]
+        streamed = False
+        if cached:
+            statuses = {
+                sys_name: sync_manager.get_cached_repository_status(sys_name)
+                for sys_name in systems
+            }
         else:
-            statuses = sync_manager.get_repository_status(system)
-
-            table = Table(title=f"Repository Status - {system}")
-            table.add_column("Repository", style="cyan")
-            table.add_column("Exists", style="green")
-            table.add_column("Branch", style="yellow")
-            table.add_column("Dirty", style="red")
-            table.add_column("Commit", style="blue")
-
-            for status_info in statuses:
-                table.add_row(
-                    status_info["name"],
-                    "" if status_info["exists"] else "",
-                    status_info.get("branch", "-"),
-                    "" if status_info.get("dirty") else "",
-                    status_info.get("commit", "-"),
-                )
+            # The daemon does not scan for untracked files
+            answer = (
+                _daemon_answer(config, "status", systems) if use_daemon and not untracked else None
+            )
+            streamed = answer is None
+            # Every system's repositories are checked in one concurrent pass
+            statuses = (
+                answer
+                if answer is not None
+                else sync_manager.get_all_repository_status(systems, untracked, fsmonitor)
+            )
 
-            console.print(table)
+        if output_format != "table":
+            _emit_systems(output_format, statuses, streamed)
+            return
+        for sys_name in systems:
+            if cached:
+                _display_cached_status(sys_name, statuses[sys_name])
+            else:
+                _display_status(sys_name, statuses[sys_name], untracked)
+            if system == "all":
+                console.print()  # Add spacing between systems
 
     except RepositorySyncError as e:
         console.print(f"[red]Status check failed: {e}[/red]")
@@ -186,62 +722,196 @@ def status(ctx: click.Context, system: str) -> None:
 
 
 @main.command()
-@click.option(
-    "--system",
-    type=click.Choice(["thk", "man-oms", "GCP", "all"]),
-    default="all",
-    help="System to show branches for (default: all)",
-)
+@_system_option("show branches for")
+@_daemon_option(default=False)
+@_format_option
 @click.pass_context
-def branches(ctx: click.Context, system: str) -> None:
+def branches(ctx: click.Context, system: str, use_daemon: bool, output_format: str) -> None:
     """Show current branch for each repository."""
-    sync_manager: RepositorySync = ctx.obj["sync"]
-    config: PKMConfig = ctx.obj["config"]
+    from pkm_tools.repo_sync import RepositorySyncError
+
+    sync_manager = _get_sync(ctx)
+    config = _get_config(ctx)
+    _start_output(output_format, sync_manager)
 
     try:
-        if system == "all":
-            systems = config.list_systems()
-            for sys_name in systems:
-                _display_branches(sync_manager, sys_name)
-        else:
-            _display_branches(sync_manager, system)
+        systems = sync_manager.registry.systems() if system == "all" else [system]
+        all_branches = _daemon_answer(config, "branches", systems) if use_daemon else None
+        streamed = all_branches is None
+        if all_branches is None:
+            # Every system's repositories are checked in one concurrent pass
+            all_branches = sync_manager.get_all_branches(systems)
+
+        if output_format != "table":
+            _emit_systems(output_format, all_branches, streamed)
+            return
+        for sys_name in systems:
+            _display_branches(sys_name, all_branches[sys_name])
 
     except RepositorySyncError as e:
         console.print(f"[red]Failed to get branch information: {e}[/red]")
         sys.exit(1)
 
 
-@main.command()
-@click.argument("pr_url")
+@main.group()
+def daemon() -> None:
+    """Keep repositories fetched in the background and serve their status."""
+
+
+@daemon.command("run")
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Maximum concurrent git processes (default: CPU count)",
+)
+@click.option(
+    "--min-interval",
+    type=click.FloatRange(min=1),
+    default=None,
+    help="Shortest per-repository fetch interval in seconds (default: PKM_DAEMON_MIN_INTERVAL)",
+)
+@click.option(
+    "--max-interval",
+    type=click.FloatRange(min=1),
+    default=None,
+    help="Longest per-repository fetch interval in seconds (default: PKM_DAEMON_MAX_INTERVAL)",
+)
+@click.option(
+    "--status-interval",
+    type=click.FloatRange(min=1),
+    default=None,
+    help="Seconds between working tree rescans (default: PKM_DAEMON_STATUS_INTERVAL)",
+)
+@click.pass_context
+def daemon_run(
+    ctx: click.Context,
+    jobs: Optional[int],
+    min_interval: Optional[float],
+    max_interval: Optional[float],
+    status_interval: Optional[float],
+) -> None:
+    """Run the daemon in the foreground until stopped (Ctrl+C or pkm daemon stop)."""
+    from pkm_tools.daemon import SyncDaemon
+    from pkm_tools.repo_sync import RepositorySyncError
+
+    sync_manager = _get_sync(ctx)
+    config = _get_config(ctx)
+
+    try:
+        console.print(f"[blue]pkm daemon listening on {config.daemon_socket}[/blue]")
+        SyncDaemon(
+            sync_manager,
+            jobs=jobs or default_jobs(),
+            min_interval=min_interval,
+            max_interval=max_interval,
+            status_interval=status_interval,
+        ).run()
+    except RepositorySyncError as e:
+        console.print(f"[red]Daemon failed: {e}[/red]")
+        sys.exit(1)
+
+
+@daemon.command("stop")
+@click.pass_context
+def daemon_stop(ctx: click.Context) -> None:
+    """Stop a running daemon."""
+    from pkm_tools.daemon import query_daemon
+
+    config = _get_config(ctx)
+
+    if query_daemon(config.daemon_socket, "stop") is None:
+        console.print("[yellow]No pkm daemon is running[/yellow]")
+        sys.exit(1)
+    console.print("[green]✓ pkm daemon stopping[/green]")
+
+
+@daemon.command("info")
 @click.pass_context
-def checkout(ctx: click.Context, pr_url: str) -> None:
-    """Checkout a branch from a BitBucket pull request URL.
+def daemon_info(ctx: click.Context) -> None:
+    """Show the running daemon's fetch schedule."""
+    from pkm_tools.daemon import query_daemon
 
+    config = _get_config(ctx)
+
+    ping = query_daemon(config.daemon_socket, "ping")
+    schedule = query_daemon(config.daemon_socket, "schedule")
+    if ping is None or schedule is None:
+        console.print("[yellow]No pkm daemon is running[/yellow]")
+        sys.exit(1)
+
+    console.print(f"[bold]pkm daemon[/bold] (pid {ping['pid']}, {ping['repos']} repositories)")
+    _display_schedule(schedule["repos"])
+
+
+@main.command()
+@click.argument("pr_urls", nargs=-1, required=True)
+@click.option(
+    "--refresh",
+    is_flag=True,
+    help="Revalidate cached PR information with BitBucket even if it is still fresh",
+)
+@click.option(
+    "--worktree",
+    is_flag=True,
+    help="Check each PR out into its own worktree under .pkm/worktrees, "
+    "leaving the repository's working tree untouched",
+)
+@_from_mirror_option
+@click.pass_context
+def checkout(
+    ctx: click.Context,
+    pr_urls: Tuple[str, ...],
+    refresh: bool,
+    worktree: bool,
+    use_mirror: Optional[bool],
+) -> None:
+    """Checkout branches from BitBucket pull request URLs.
+
+    Several URLs can be given; their PR information is fetched concurrently and the PRs
+    are checked out in parallel (one at a time per repository). Only each PR's source
+    ref is fetched. With --worktree, every PR gets its own review worktree.
     Requires BITBUCKET_TOKEN environment variable to be set.
 
     Example:
         pkm checkout https://mangit.maninvestments.com/projects/ETS/repos/tomahawk2/pull-requests/123
     """
-    sync_manager: RepositorySync = ctx.obj["sync"]
+    from pkm_tools.repo_sync import RepositorySyncError
+
+    sync_manager = _get_sync(ctx)
 
     try:
-        console.print(f"[blue]Fetching PR information...[/blue]")
-        result = sync_manager.checkout_pr_branch(pr_url)
+        console.print("[blue]Fetching PR information...[/blue]")
+        results = sync_manager.checkout_pr_branches(
+            list(pr_urls), use_mirror, refresh, worktree
+        )
+    except RepositorySyncError as e:
+        console.print(f"[red]Checkout failed: {e}[/red]")
+        sys.exit(1)
+
+    if len(results) > 1:
+        _display_checkout_results(results)
+    else:
+        result = results[0]
+        if result["status"] != "success":
+            console.print(f"[red]Checkout failed: {result['error']}[/red]")
+            sys.exit(1)
 
         console.print()
-        console.print(f"[green]✓ Successfully checked out PR branch![/green]")
+        console.print("[green]✓ Successfully checked out PR branch![/green]")
         console.print()
-        console.print(f"[bold]PR Details:[/bold]")
+        console.print("[bold]PR Details:[/bold]")
         console.print(f"  PR #[cyan]{result['pr_id']}[/cyan]: {result['pr_title']}")
         console.print(f"  Author: [yellow]{result['author']}[/yellow]")
         console.print()
-        console.print(f"[bold]Repository:[/bold]")
+        console.print("[bold]Repository:[/bold]")
         console.print(f"  System: [cyan]{result['system']}[/cyan]")
         console.print(f"  Repository: [cyan]{result['repo']}[/cyan]")
         console.print(f"  Branch: [yellow]{result['branch']}[/yellow]")
+        if result["worktree"]:
+            console.print(f"  Worktree: [cyan]{result['path']}[/cyan]")
 
-    except RepositorySyncError as e:
-        console.print(f"[red]Checkout failed: {e}[/red]")
+    if any(result["status"] != "success" for result in results):
         sys.exit(1)
 
 
@@ -249,9 +919,12 @@ def checkout(ctx: click.Context, pr_url: str) -> None:
 @click.pass_context
 def list_systems(ctx: click.Context) -> None:
     """List all available systems."""
-    config: PKMConfig = ctx.obj["config"]
+    from rich.table import Table
+
+    config = _get_config(ctx)
+    registry = _get_registry(ctx)
 
-    systems = config.list_systems()
+    systems = sorted(registry.systems())
 
     if not systems:
         console.print("[yellow]No systems found[/yellow]")
@@ -259,32 +932,39 @@ def list_systems(ctx: click.Context) -> None:
 
     table = Table(title="Available Systems")
     table.add_column("System", style="cyan")
+    table.add_column("Repositories", justify="right")
     table.add_column("Path", style="blue")
 
     for system in systems:
-        system_path = config.get_system_dir(system)
-        table.add_row(system, str(system_path))
+        try:
+            repo_count = str(len(registry.repositories(system)))
+        except ValueError as e:
+            repo_count = f"[red]{e}[/red]"
+        table.add_row(system, repo_count, str(config.systems_dir / system))
 
     console.print(table)
 
 
 @main.command()
-@click.option(
-    "--system",
-    type=click.Choice(["thk", "man-oms", "GCP"]),
-    required=True,
-    help="System to list repositories",
-)
+@_system_option("list repositories for", allow_all=False)
+@_format_option
 @click.pass_context
-def list_repos(ctx: click.Context, system: str) -> None:
+def list_repos(ctx: click.Context, system: str, output_format: str) -> None:
     """List configured repositories for a system."""
-    config: PKMConfig = ctx.obj["config"]
+    from rich.table import Table
 
-    try:
-        from pkm_tools.utils import read_repository_list
+    config = _get_config(ctx)
+    registry = _get_registry(ctx)
+    _start_output(output_format)
 
+    try:
+        repos = registry.repositories(system)
         repo_list_file = config.get_repository_list_file(system)
-        repos = read_repository_list(repo_list_file)
+
+        if output_format != "table":
+            records = [{"name": extract_repo_name(url), "url": url} for url in repos]
+            _emit_systems(output_format, {system: records}, streamed=False)
+            return
 
         if not repos:
             console.print(f"[yellow]No repositories configured for {system}[/yellow]")
@@ -305,12 +985,244 @@ def list_repos(ctx: click.Context, system: str) -> None:
         sys.exit(1)
 
 
-def _display_sync_results(results: dict) -> None:
+def _display_timing(results: Dict[str, Any]) -> None:
+    """Display wall-clock versus serial time for a concurrent run.
+
+    Args:
+        results: Results dictionary with ``elapsed`` and ``serial_elapsed`` keys
+    """
+    if "elapsed" not in results:
+        return
+
+    elapsed = results["elapsed"]
+    serial_elapsed = results["serial_elapsed"]
+    speedup = serial_elapsed / elapsed if elapsed > 0 else 1.0
+    console.print(
+        f"\n[dim]Wall-clock: {elapsed:.2f}s | Serial: {serial_elapsed:.2f}s | "
+        f"Speed-up: {speedup:.1f}x[/dim]"
+    )
+
+
+def _display_hosts(results: Dict[str, Any]) -> None:
+    """Display per-host throughput of the network operations in a run.
+
+    Args:
+        results: Run results with a ``hosts`` dictionary
+    """
+    from rich.table import Table
+
+    hosts = {host: info for host, info in results.get("hosts", {}).items() if info["limit"]}
+    if not hosts:
+        return
+
+    table = Table(title="Remote Hosts")
+    table.add_column("Host", style="cyan")
+    table.add_column("Operations", justify="right")
+    table.add_column("Failed", justify="right", style="red")
+    table.add_column("Retries", justify="right", style="yellow")
+    table.add_column("Peak / Limit", justify="right")
+    table.add_column("Throughput", justify="right", style="green")
+
+    for host, info in hosts.items():
+        table.add_row(
+            host,
+            str(info["operations"]),
+            str(info["failed"]),
+            str(info["retries"]),
+            f"{info['peak_concurrency'] or 0} / {info['limit']}",
+            f"{info['throughput']:.1f} ops/s",
+        )
+
+    console.print(table)
+
+
+def _report_profile(
+    sync_manager: "RepositorySync", results: Dict[str, Any], profile: bool, trace: Optional[Path]
+) -> None:
+    """Show the phase profile of a run and/or write its timing spans to a trace file.
+
+    Args:
+        sync_manager: Repository sync manager that performed the run
+        results: Run results (single system or all systems)
+        profile: Whether to display the profile tables
+        trace: JSON-lines trace file to append the spans to
+    """
+    if profile:
+        _display_profile(results)
+    if trace is not None:
+        sync_manager.profiler.write_trace(trace)
+        console.print(f"[dim]Timing trace appended to {trace}[/dim]")
+
+
+def _display_profile(results: Dict[str, Any], limit: int = 10) -> None:
+    """Display the slowest repositories and the time spent in each phase.
+
+    Args:
+        results: Run results (single system or all systems)
+        limit: Number of repositories to show
+    """
+    from rich.table import Table
+
+    system_results: List[Dict[str, Any]] = results.get("systems", [results])
+    repos = [
+        (system_result["system"], repo)
+        for system_result in system_results
+        for repo in system_result.get("repos", [])
+    ]
+    if not repos:
+        return
+
+    table = Table(title=f"Slowest Repositories (top {min(limit, len(repos))})")
+    table.add_column("Repository", style="cyan")
+    table.add_column("System", style="blue")
+    table.add_column("Total", justify="right")
+    table.add_column("Phases", style="dim")
+
+    slowest = sorted(repos, key=lambda item: item[1].get("duration", 0.0), reverse=True)
+    for system, repo in slowest[:limit]:
+        phases = sorted(repo.get("phases", {}).items(), key=lambda item: item[1], reverse=True)
+        table.add_row(
+            repo["name"],
+            system,
+            f"{repo.get('duration', 0.0):.2f}s",
+            ", ".join(f"{name} {seconds:.2f}s" for name, seconds in phases) or "-",
+        )
+
+    console.print()
+    console.print(table)
+
+    totals: Dict[str, Any] = {}
+    for _, repo in repos:
+        for name, seconds in repo.get("phases", {}).items():
+            total, count, slowest_seconds = totals.get(name, (0.0, 0, 0.0))
+            totals[name] = (total + seconds, count + 1, max(slowest_seconds, seconds))
+
+    table = Table(title="Time by Phase")
+    table.add_column("Phase", style="yellow")
+    table.add_column("Total", justify="right")
+    table.add_column("Repos", justify="right")
+    table.add_column("Mean", justify="right")
+    table.add_column("Max", justify="right")
+
+    for name, (total, count, slowest_seconds) in sorted(
+        totals.items(), key=lambda item: item[1][0], reverse=True
+    ):
+        table.add_row(
+            name, f"{total:.2f}s", str(count), f"{total / count:.2f}s", f"{slowest_seconds:.2f}s"
+        )
+    run_phases = results.get("run_phases", {})
+    for name, seconds in sorted(run_phases.items(), key=lambda item: item[1], reverse=True):
+        table.add_row(f"{name} (whole run)", f"{seconds:.2f}s", "-", "-", "-")
+
+    console.print(table)
+
+
+def _display_status(
+    system: str, statuses: List[Dict[str, Any]], untracked: bool = False
+) -> None:
+    """Display repository status in a formatted table.
+
+    Args:
+        system: System name
+        statuses: Repository status dictionaries
+        untracked: Whether untracked files were scanned (adds an Untracked column)
+    """
+    from rich.table import Table
+
+    table = Table(title=f"Repository Status - {system}")
+    table.add_column("Repository", style="cyan")
+    table.add_column("Exists", style="green")
+    table.add_column("Branch", style="yellow")
+    table.add_column("Dirty", style="red")
+    if untracked:
+        table.add_column("Untracked", style="red")
+    table.add_column("Commit", style="blue")
+
+    for status_info in statuses:
+        row = [
+            status_info["name"],
+            "✓" if status_info["exists"] else "✗",
+            status_info.get("branch", "-"),
+            "✓" if status_info.get("dirty") else "✗",
+        ]
+        if untracked:
+            row.append("✓" if status_info.get("untracked") else "✗")
+        row.append(status_info.get("commit", "-"))
+        table.add_row(*row)
+
+    console.print(table)
+
+
+def _display_cached_status(system: str, statuses: List[Dict[str, Any]]) -> None:
+    """Display the last recorded sync state in a formatted table.
+
+    Args:
+        system: System name
+        statuses: Cached repository status dictionaries
+    """
+    from rich.table import Table
+
+    table = Table(title=f"Last Sync State - {system}")
+    table.add_column("Repository", style="cyan")
+    table.add_column("Branch", style="yellow")
+    table.add_column("Commit", style="blue")
+    table.add_column("Last Sync", style="dim")
+    table.add_column("Duration", style="dim")
+    table.add_column("Error", style="red")
+
+    for status_info in statuses:
+        synced_at = status_info.get("last_synced_at")
+        duration = status_info.get("last_duration")
+        table.add_row(
+            status_info["name"],
+            status_info.get("branch", "-"),
+            status_info.get("commit", "-"),
+            datetime.fromtimestamp(synced_at).strftime("%Y-%m-%d %H:%M:%S") if synced_at else "never",
+            f"{duration:.2f}s" if duration is not None else "-",
+            status_info.get("last_error") or "",
+        )
+
+    console.print(table)
+
+
+def _display_schedule(repos: List[Dict[str, Any]]) -> None:
+    """Display the daemon's per-repository fetch schedule in a formatted table.
+
+    Args:
+        repos: Schedule dictionaries with path, interval and fetch timestamps
+    """
+    from rich.table import Table
+
+    table = Table(title="Fetch Schedule")
+    table.add_column("Repository", style="cyan")
+    table.add_column("Interval", justify="right")
+    table.add_column("Next Fetch", style="dim")
+    table.add_column("Last Fetch", style="dim")
+    table.add_column("Last Change", style="yellow")
+
+    def timestamp(value: Optional[float]) -> str:
+        return datetime.fromtimestamp(value).strftime("%H:%M:%S") if value else "never"
+
+    for entry in sorted(repos, key=lambda entry: entry["next_fetch_at"]):
+        table.add_row(
+            Path(entry["path"]).name,
+            f"{entry['interval']:.0f}s",
+            timestamp(entry["next_fetch_at"]),
+            timestamp(entry["last_fetched_at"]),
+            timestamp(entry["last_changed_at"]),
+        )
+
+    console.print(table)
+
+
+def _display_sync_results(results: Dict[str, Any]) -> None:
     """Display sync results in a formatted table.
 
     Args:
         results: Sync results dictionary
     """
+    from rich.table import Table
+
     system = results["system"]
     synced = results["synced"]
     failed = results["failed"]
@@ -343,12 +1255,14 @@ def _display_sync_results(results: dict) -> None:
         console.print(table)
 
 
-def _display_clone_results(results: dict) -> None:
+def _display_clone_results(results: Dict[str, Any]) -> None:
     """Display clone results in a formatted table.
 
     Args:
         results: Clone results dictionary
     """
+    from rich.table import Table
+
     system = results["system"]
     cloned = results["cloned"]
     failed = results["failed"]
@@ -371,12 +1285,14 @@ def _display_clone_results(results: dict) -> None:
         console.print(table)
 
 
-def _display_update_results(results: dict) -> None:
+def _display_update_results(results: Dict[str, Any]) -> None:
     """Display update results in a formatted table.
 
     Args:
         results: Update results dictionary
     """
+    from rich.table import Table
+
     system = results["system"]
     updated = results["updated"]
     failed = results["failed"]
@@ -404,6 +1320,129 @@ def _display_update_results(results: dict) -> None:
                 else:
                     status_text = "[green]✓ UP-TO-DATE[/green]"
                     details = "[dim]No changes[/dim]"
+            elif repo.get("action") == "conflict":
+                status_text = "[red]✗ CONFLICT[/red]"
+                details = repo.get("error", "")
+            else:
+                status_text = "[red]✗ FAILED[/red]"
+                details = repo.get("error", "")
+
+            table.add_row(repo["name"], status_text, details)
+
+        console.print(table)
+
+
+def _display_plan(system_plan: Dict[str, Any]) -> None:
+    """Display the planned update of a system in start order.
+
+    Args:
+        system_plan: Plan entry of one system with ``repos`` (and ``error`` if it failed to load)
+    """
+    from rich.table import Table
+
+    console.print(f"\n[bold]System: {system_plan['system']}[/bold]")
+    if "error" in system_plan:
+        console.print(f"[red]{system_plan['error']}[/red]")
+        return
+
+    action_styles = {
+        "clone": "[blue]clone[/blue]",
+        "fast-forward": "[green]fast-forward[/green]",
+        "merge": "[yellow]merge[/yellow]",
+        "skip": "[dim]skip[/dim]",
+        "conflict": "[red]conflict[/red]",
+    }
+
+    table = Table(title=f"Update Plan - {system_plan['system']}")
+    table.add_column("Order", justify="right", style="dim")
+    table.add_column("Repository", style="cyan")
+    table.add_column("Action", style="bold")
+    table.add_column("Branch")
+    table.add_column("Expected", justify="right")
+    table.add_column("Reason", style="dim")
+
+    for entry in sorted(system_plan["repos"], key=lambda entry: entry["order"]):
+        expected = entry["expected_duration"]
+        table.add_row(
+            str(entry["order"]),
+            entry["name"],
+            action_styles[entry["action"]],
+            entry["branch"] or "-",
+            f"{expected:.1f}s" if expected is not None else "-",
+            entry["reason"],
+        )
+
+    console.print(table)
+
+
+def _display_checkout_results(results: List[Dict[str, Any]]) -> None:
+    """Display the results of a batch PR checkout in a formatted table.
+
+    Args:
+        results: Checkout result dictionaries, one per PR URL
+    """
+    from rich.table import Table
+
+    checked_out = sum(1 for result in results if result["status"] == "success")
+    failed = len(results) - checked_out
+    console.print(f"\nChecked out: [green]{checked_out}[/green] | Failed: [red]{failed}[/red]\n")
+
+    table = Table()
+    table.add_column("Pull Request", style="cyan")
+    table.add_column("Status", style="bold")
+    table.add_column("Repository")
+    table.add_column("Branch", style="yellow")
+    table.add_column("Path")
+    table.add_column("Details", style="dim")
+
+    for result in results:
+        if result["status"] == "success":
+            table.add_row(
+                f"#{result['pr_id']}",
+                "[green]✓ CHECKED OUT[/green]",
+                f"{result['system']}/{result['repo']}",
+                result["branch"],
+                result["path"],
+                result["pr_title"],
+            )
+        else:
+            table.add_row(result["url"], "[red]✗ FAILED[/red]", "", "", "", result["error"])
+
+    console.print(table)
+
+
+def _display_mirror_results(results: Dict[str, Any]) -> None:
+    """Display mirror results in a formatted table.
+
+    Args:
+        results: Mirror results dictionary
+    """
+    from rich.table import Table
+
+    system = results["system"]
+    mirrored = results["mirrored"]
+    failed = results["failed"]
+
+    console.print(f"\n[bold]System: {system}[/bold]")
+    console.print(f"Mirrored: [green]{mirrored}[/green] | Failed: [red]{failed}[/red]\n")
+
+    if results["repos"]:
+        table = Table()
+        table.add_column("Repository", style="cyan")
+        table.add_column("Status", style="bold")
+        table.add_column("Details", style="dim")
+
+        for repo in results["repos"]:
+            if repo["status"] == "success":
+                if repo.get("action") == "created":
+                    status_text = "[green]✓ CREATED[/green]"
+                    details = "[blue]⬇ New mirror[/blue]"
+                elif repo.get("had_changes"):
+                    status_text = "[green]✓ UPDATED[/green]"
+                    details = "[yellow]↓ Refs updated[/yellow]"
+                else:
+                    status_text = "[green]✓ UP-TO-DATE[/green]"
+                    details = "[dim]No changes[/dim]"
             else:
                 status_text = "[red]✗ FAILED[/red]"
                 details = repo.get("error", "")
@@ -413,14 +1452,14 @@ def _display_update_results(results: dict) -> None:
         console.print(table)
 
 
-def _display_branches(sync_manager: RepositorySync, system: str) -> None:
+def _display_branches(system: str, branches: List[Dict[str, Any]]) -> None:
     """Display branch information for a system.
 
     Args:
-        sync_manager: Repository sync manager
         system: System name
+        branches: Branch information dictionaries
     """
-    branches = sync_manager.get_branches(system)
+    from rich.table import Table
 
     table = Table(title=f"Branches - {system}")
     table.add_column("Repository", style="cyan")
@@ -1,12 +1,93 @@
 """Configuration management for PKM tools."""
 
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List
 
-from pydantic import Field, field_validator
+import yaml
+from pydantic import BaseModel, Field, field_validator
 from pydantic_settings import BaseSettings
 
 
+class CloneOptions(BaseModel):
+    """Options controlling how repositories are cloned.
+
+    Fields left as None are not passed to git, so git's own defaults apply.
+    """
+
+    depth: int | None = Field(default=None, ge=1, description="Shallow clone depth")
+    filter: str | None = Field(
+        default=None, description="Partial clone filter spec (e.g. blob:none)"
+    )
+    single_branch: bool | None = Field(
+        default=None, description="Fetch only the cloned branch (--single-branch)"
+    )
+    reference: bool | None = Field(
+        default=None, description="Borrow objects from the shared mirror cache (--reference)"
+    )
+    dissociate: bool | None = Field(
+        default=None, description="Copy borrowed objects so the clone stands alone (--dissociate)"
+    )
+
+    def merged(self, overrides: "CloneOptions | None") -> "CloneOptions":
+        """Return a copy with every option set in ``overrides`` taking precedence.
+
+        Args:
+            overrides: Options to apply on top of these
+
+        Returns:
+            Merged clone options
+        """
+        if overrides is None:
+            return self
+        return self.model_copy(update=overrides.model_dump(exclude_none=True))
+
+    def git_args(self) -> List[str]:
+        """Build the corresponding ``git clone`` arguments.
+
+        ``reference`` and ``dissociate`` need the mirror path and are handled by the caller.
+
+        Returns:
+            List of command-line arguments
+        """
+        args = []
+        if self.depth is not None:
+            args.append(f"--depth={self.depth}")
+        if self.filter:
+            args.append(f"--filter={self.filter}")
+        if self.single_branch is True:
+            args.append("--single-branch")
+        elif self.single_branch is False:
+            args.append("--no-single-branch")
+        return args
+
+
+class SystemManifest(BaseModel):
+    """Per-system settings read from ``systems/<system>/system.yaml``.
+
+    Every section is optional, for example::
+
+        repositories:
+          - ssh://git@mangit.maninvestments.com:7999/ets/extra-service.git
+        concurrency: 4
+        branches:
+          tomahawk2: develop
+        clone:
+          depth: 1
+    """
+
+    repositories: List[str] = Field(
+        default_factory=list, description="Repository URLs in addition to repository-list.txt"
+    )
+    concurrency: int | None = Field(
+        default=None, ge=1, description="Highest number of concurrent operations in this system"
+    )
+    branches: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Branch per repository name, used when no branch is requested",
+    )
+    clone: CloneOptions | None = Field(default=None, description="Clone options of this system")
+
+
 class PKMConfig(BaseSettings):
     """Configuration for PKM tools."""
 
@@ -16,6 +97,56 @@ class PKMConfig(BaseSettings):
     )
     log_level: str = Field(default="INFO", description="Logging level")
     git_ssh_command: str | None = Field(default=None, description="Custom SSH command for Git")
+    clone_depth: int | None = Field(default=None, ge=1, description="Default shallow clone depth")
+    clone_filter: str | None = Field(default=None, description="Default partial clone filter")
+    clone_single_branch: bool | None = Field(
+        default=None, description="Clone only the requested branch by default"
+    )
+    clone_reference: bool | None = Field(
+        default=None, description="Borrow objects from the shared mirror cache by default"
+    )
+    clone_dissociate: bool | None = Field(
+        default=None, description="Copy borrowed mirror objects into each clone by default"
+    )
+    use_mirror: bool = Field(
+        default=False, description="Fetch through the local mirror cache instead of the remotes"
+    )
+    status_fsmonitor: bool = Field(
+        default=False, description="Use core.fsmonitor and the untracked cache for status"
+    )
+    host_concurrency: int = Field(
+        default=8, ge=1, description="Highest number of concurrent network operations per host"
+    )
+    network_retries: int = Field(
+        default=3, ge=0, description="Retries of a git network operation that failed transiently"
+    )
+    retry_backoff: float = Field(
+        default=1.0, gt=0, description="Base retry backoff in seconds, doubled on each retry"
+    )
+    ssh_multiplex: bool = Field(
+        default=True, description="Share one SSH connection per host between git commands"
+    )
+    ssh_control_persist: int = Field(
+        default=60, ge=0, description="Seconds an idle shared SSH connection stays open"
+    )
+    daemon_min_interval: float = Field(
+        default=60.0, gt=0, description="Shortest daemon fetch interval in seconds"
+    )
+    daemon_max_interval: float = Field(
+        default=3600.0, gt=0, description="Longest daemon fetch interval in seconds"
+    )
+    daemon_status_interval: float = Field(
+        default=30.0, gt=0, description="Seconds between daemon working tree rescans"
+    )
+    bitbucket_cache_ttl: float = Field(
+        default=300.0, ge=0, description="Seconds cached Bitbucket responses are used as is"
+    )
+    bitbucket_timeout: float = Field(
+        default=10.0, gt=0, description="Socket timeout of Bitbucket API requests in seconds"
+    )
+    bitbucket_connections: int = Field(
+        default=8, ge=1, description="Concurrent Bitbucket API connections kept open"
+    )
 
     @field_validator("pkm_root")
     @classmethod
@@ -30,6 +161,46 @@ class PKMConfig(BaseSettings):
         """Get the systems directory."""
         return self.pkm_root / "systems"
 
+    @property
+    def state_dir(self) -> Path:
+        """Get the directory for PKM tools local state (not version controlled)."""
+        return self.pkm_root / ".pkm"
+
+    @property
+    def state_file(self) -> Path:
+        """Get the SQLite sync state database path."""
+        return self.state_dir / "state.db"
+
+    @property
+    def mirror_dir(self) -> Path:
+        """Get the directory of shared bare repository mirrors."""
+        return self.state_dir / "mirrors"
+
+    @property
+    def ssh_control_dir(self) -> Path:
+        """Get the directory of shared SSH connection sockets."""
+        return self.state_dir / "ssh"
+
+    @property
+    def daemon_socket(self) -> Path:
+        """Get the Unix socket path of the background daemon."""
+        return self.state_dir / "daemon.sock"
+
+    @property
+    def registry_file(self) -> Path:
+        """Get the cached index of the repositories of every system."""
+        return self.state_dir / "registry.json"
+
+    @property
+    def worktrees_dir(self) -> Path:
+        """Get the directory of pull request review worktrees."""
+        return self.state_dir / "worktrees"
+
+    @property
+    def bitbucket_cache_dir(self) -> Path:
+        """Get the directory of cached Bitbucket API responses."""
+        return self.state_dir / "bitbucket"
+
     def get_system_dir(self, system: str) -> Path:
         """Get directory for a specific system.
 
@@ -72,6 +243,75 @@ class PKMConfig(BaseSettings):
             raise ValueError(f"Service repositories directory does not exist: {service_repos_dir}")
         return service_repos_dir
 
+    def get_system_config(self, system: str) -> Dict[str, Any]:
+        """Load the optional per-system configuration file.
+
+        The file lives at ``systems/<system>/system.yaml``, for example::
+
+            clone:
+              depth: 1
+              filter: blob:none
+
+        Args:
+            system: System name (thk, man-oms, GCP)
+
+        Returns:
+            Parsed configuration (empty if the file does not exist)
+
+        Raises:
+            ValueError: If the file is not a YAML mapping
+        """
+        config_file = self.get_system_dir(system) / "system.yaml"
+        if not config_file.exists():
+            return {}
+
+        with config_file.open() as f:
+            data = yaml.safe_load(f) or {}
+
+        if not isinstance(data, dict):
+            raise ValueError(f"System configuration must be a mapping: {config_file}")
+        return data
+
+    def get_system_manifest(self, system: str) -> SystemManifest:
+        """Load and validate the optional per-system configuration file.
+
+        Args:
+            system: System name (thk, man-oms, GCP)
+
+        Returns:
+            System manifest (all defaults if the file does not exist)
+
+        Raises:
+            ValueError: If the file is not a mapping or has invalid settings
+        """
+        return SystemManifest(**self.get_system_config(system))
+
+    def get_clone_options(
+        self, system: str, manifest: SystemManifest | None = None
+    ) -> CloneOptions:
+        """Get clone options for a system.
+
+        Global defaults (``PKM_CLONE_*`` environment variables) are overridden by the
+        ``clone`` section of the system's ``system.yaml``.
+
+        Args:
+            system: System name (thk, man-oms, GCP)
+            manifest: Already loaded manifest of the system (read from disk if None)
+
+        Returns:
+            Clone options for the system
+        """
+        defaults = CloneOptions(
+            depth=self.clone_depth,
+            filter=self.clone_filter,
+            single_branch=self.clone_single_branch,
+            reference=self.clone_reference,
+            dissociate=self.clone_dissociate,
+        )
+        if manifest is None:
+            manifest = self.get_system_manifest(system)
+        return defaults.merged(manifest.clone)
+
     def list_systems(self) -> List[str]:
         """List all available systems.
 
@@ -0,0 +1,383 @@
+"""Background daemon that keeps repositories continuously fetched."""
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import random
+import signal
+import socket
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from pkm_tools.git_driver import GitCommandError
+from pkm_tools.repo_sync import RepositorySync, RepositorySyncError
+from pkm_tools.utils import extract_repo_name
+
+logger = logging.getLogger(__name__)
+
+# Fraction of the interval added or removed at random, so repositories sharing an
+# interval do not all fetch at the same moment
+_JITTER = 0.1
+
+
+def next_interval(
+    interval: float, changed: bool, min_interval: float, max_interval: float
+) -> float:
+    """Adapt a repository's fetch interval to how often it changes.
+
+    A fetch that brings new commits halves the interval; an idle fetch lengthens it by half.
+
+    Args:
+        interval: Current interval in seconds
+        changed: Whether the last fetch brought new commits
+        min_interval: Shortest allowed interval in seconds
+        max_interval: Longest allowed interval in seconds
+
+    Returns:
+        New interval in seconds
+    """
+    interval = interval / 2 if changed else interval * 1.5
+    return min(max_interval, max(min_interval, interval))
+
+
+class SyncDaemon:
+    """Long-running fetcher serving repository status over a Unix socket.
+
+    Every cloned repository is fetched on its own adaptive schedule (persisted in the sync
+    state store, so restarts keep it). Fetches only update remote-tracking refs; working
+    trees are never touched. Status and branch information is kept in memory, refreshed
+    after each fetch and by a periodic rescan, and answered from memory over the socket.
+
+    The socket speaks JSON lines: one request object (``{"command": ...}``) per
+    connection, answered by one response object with an ``ok`` flag.
+    """
+
+    def __init__(
+        self,
+        sync: RepositorySync,
+        jobs: int | None = None,
+        min_interval: float | None = None,
+        max_interval: float | None = None,
+        status_interval: float | None = None,
+    ):
+        """Initialize the daemon.
+
+        Args:
+            sync: Repository sync manager
+            jobs: Maximum number of concurrent git processes (default: CPU count)
+            min_interval: Shortest fetch interval in seconds (default: configuration)
+            max_interval: Longest fetch interval in seconds (default: configuration)
+            status_interval: Seconds between working tree rescans (default: configuration)
+        """
+        config = sync.config
+        self.sync = sync
+        self.jobs = jobs
+        self.socket_path = config.daemon_socket
+        self.min_interval = min_interval or config.daemon_min_interval
+        self.max_interval = max(self.min_interval, max_interval or config.daemon_max_interval)
+        self.status_interval = status_interval or config.daemon_status_interval
+
+        self._layout: Dict[str, List[Tuple[str, Path]]] = {}
+        self._status: Dict[Path, Dict[str, Any]] = {}
+        self._branches: Dict[Path, Dict[str, Any]] = {}
+        self._schedule: Dict[str, Dict[str, Any]] = {}
+        self._workers: Dict[Path, asyncio.Task[None]] = {}
+        self._as_of: Optional[float] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    def run(self) -> None:
+        """Run the daemon in the foreground until it is stopped.
+
+        Raises:
+            RepositorySyncError: If another daemon is already serving the socket
+        """
+        asyncio.run(self._main())
+
+    async def _main(self) -> None:
+        """Serve the socket and keep the schedule running until stopped."""
+        self._stopping = asyncio.Event()
+        if self.jobs:
+            self.sync.git.concurrency = self.jobs
+        self._prepare_socket()
+        self._schedule = self.sync.state.get_schedule()
+
+        server = await asyncio.start_unix_server(self._handle_client, path=str(self.socket_path))
+        self.socket_path.chmod(0o600)
+
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, self._stopping.set)
+
+        logger.info(f"pkm daemon listening on {self.socket_path}")
+        try:
+            while not self._stopping.is_set():
+                await self._rescan()
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._stopping.wait(), self.status_interval)
+        finally:
+            server.close()
+            await server.wait_closed()
+            for worker in self._workers.values():
+                worker.cancel()
+            await asyncio.gather(*self._workers.values(), return_exceptions=True)
+            self.socket_path.unlink(missing_ok=True)
+            logger.info("pkm daemon stopped")
+
+    def _prepare_socket(self) -> None:
+        """Remove a stale socket, refusing to start if another daemon answers on it."""
+        if not self.socket_path.exists():
+            self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+            return
+        if query_daemon(self.socket_path, "ping") is not None:
+            raise RepositorySyncError(f"pkm daemon is already running on {self.socket_path}")
+        self.socket_path.unlink()
+
+    async def _rescan(self) -> None:
+        """Reload repository lists, start or stop fetch workers and refresh every status."""
+        layout: Dict[str, List[Tuple[str, Path]]] = {}
+        for system in self.sync.registry.systems():
+            try:
+                repos, service_repos_dir = self.sync.get_system_repositories(system)
+            except RepositorySyncError as e:
+                logger.warning(f"Skipping system {system}: {e}")
+                continue
+            layout[system] = [
+                (repo_url, service_repos_dir / extract_repo_name(repo_url)) for repo_url in repos
+            ]
+
+        watched = {
+            repo_path: repo_url
+            for entries in layout.values()
+            for repo_url, repo_path in entries
+            if repo_path.exists()
+        }
+        for repo_path in set(self._workers) - set(watched):
+            self._workers.pop(repo_path).cancel()
+        for repo_path, worker in list(self._workers.items()):
+            # A worker only ends on an unexpected error; start a new one below
+            if worker.done():
+                del self._workers[repo_path]
+                if not worker.cancelled() and worker.exception() is not None:
+                    logger.warning(f"Restarting fetch worker for {repo_path.name}")
+        for repo_path, repo_url in watched.items():
+            if repo_path not in self._workers:
+                self._workers[repo_path] = asyncio.create_task(self._watch(repo_url, repo_path))
+
+        async def inspect(repo_url: str, repo_path: Path) -> None:
+            status, branch_info = await asyncio.gather(
+                self.sync.repository_status(
+                    repo_url, repo_path.parent, fsmonitor=self.sync.config.status_fsmonitor
+                ),
+                self.sync.repository_branch(repo_url, repo_path.parent),
+            )
+            self._status[repo_path] = status
+            self._branches[repo_path] = branch_info
+
+        await asyncio.gather(
+            *(
+                inspect(repo_url, repo_path)
+                for entries in layout.values()
+                for repo_url, repo_path in entries
+            )
+        )
+        self._layout = layout
+        self._as_of = time.time()
+
+    async def _watch(self, repo_url: str, repo_path: Path) -> None:
+        """Fetch one repository on its adaptive schedule, forever.
+
+        Args:
+            repo_url: Git repository URL
+            repo_path: Local path of the repository
+        """
+        entry = self._schedule.setdefault(
+            str(repo_path),
+            {
+                "interval": self.min_interval,
+                "next_fetch_at": time.time(),
+                "last_fetched_at": None,
+                "last_changed_at": None,
+            },
+        )
+
+        while True:
+            delay = entry["next_fetch_at"] - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            try:
+                changed = await self._fetch(repo_url, repo_path)
+            except GitCommandError as e:
+                logger.warning(f"Fetch failed for {repo_path.name}: {e}")
+                changed = False
+            except Exception as e:
+                # E.g. the repository was removed between rescans; keep the schedule going
+                logger.warning(f"Fetch failed for {repo_path.name}: {e!r}")
+                changed = False
+
+            now = time.time()
+            entry["interval"] = next_interval(
+                entry["interval"], changed, self.min_interval, self.max_interval
+            )
+            jitter = random.uniform(1 - _JITTER, 1 + _JITTER)
+            entry["next_fetch_at"] = now + entry["interval"] * jitter
+            entry["last_fetched_at"] = now
+            if changed:
+                entry["last_changed_at"] = now
+                self._branches[repo_path] = await self.sync.repository_branch(
+                    repo_url, repo_path.parent
+                )
+                self._status[repo_path] = await self.sync.repository_status(
+                    repo_url, repo_path.parent, fsmonitor=self.sync.config.status_fsmonitor
+                )
+            self.sync.state.save_schedule(
+                repo_path,
+                entry["interval"],
+                entry["next_fetch_at"],
+                entry["last_fetched_at"],
+                entry["last_changed_at"],
+            )
+            logger.debug(
+                f"Fetched {repo_path.name} ({'changed' if changed else 'unchanged'}), "
+                f"next in {entry['interval']:.0f}s"
+            )
+
+    async def _fetch(self, repo_url: str, repo_path: Path) -> bool:
+        """Fetch a repository's remote-tracking refs.
+
+        Args:
+            repo_url: Git repository URL
+            repo_path: Local path of the repository
+
+        Returns:
+            True if any remote-tracking ref changed
+
+        Raises:
+            GitCommandError: If the fetch fails
+        """
+        use_mirror = self.sync.config.use_mirror
+        if use_mirror:
+            try:
+                await self.sync.mirrors.update(repo_url)
+            except GitCommandError as e:
+                logger.warning(f"Failed to refresh mirror for {repo_path.name}: {e}")
+
+        refs = ("for-each-ref", "--format=%(objectname) %(refname)", "refs/remotes/origin")
+        before = await self.sync.git.run(*refs, cwd=repo_path)
+        source = self.sync.source_args(repo_url, use_mirror)
+        # Through the per-host scheduler: capped concurrency and retries like a batch run
+        await self.sync.network(
+            None if source else repo_url,
+            lambda: self.sync.git.run(
+                *source, "fetch", "--quiet", "--prune", "origin", cwd=repo_path
+            ),
+            "fetch",
+        )
+        after = await self.sync.git.run(*refs, cwd=repo_path)
+        return after.stdout != before.stdout
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer one JSON-lines request."""
+        try:
+            request = json.loads(await reader.readline())
+            response = self._respond(request)
+        except (ValueError, TypeError, KeyError) as e:
+            response = {"ok": False, "error": f"Invalid request: {e}"}
+
+        writer.write(json.dumps(response).encode() + b"\n")
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    def _respond(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the response to a request.
+
+        Args:
+            request: Request object with a ``command`` key
+
+        Returns:
+            Response object
+        """
+        command = request["command"]
+
+        if command == "ping":
+            return {"ok": True, "pid": os.getpid(), "repos": len(self._workers)}
+
+        if command == "stop":
+            assert self._stopping is not None
+            self._stopping.set()
+            return {"ok": True}
+
+        if command in ("status", "branches"):
+            if self._as_of is None:
+                return {"ok": False, "error": "pkm daemon has not finished its first scan"}
+            systems = request.get("systems") or list(self._layout)
+            missing = [system for system in systems if system not in self._layout]
+            if missing:
+                return {"ok": False, "error": f"Unknown systems: {', '.join(missing)}"}
+            source = self._status if command == "status" else self._branches
+            return {
+                "ok": True,
+                "as_of": self._as_of,
+                "systems": {
+                    system: [source[repo_path] for _, repo_path in self._layout[system]]
+                    for system in systems
+                },
+            }
+
+        if command == "schedule":
+            return {
+                "ok": True,
+                "repos": [
+                    {"path": path, **entry}
+                    for path, entry in sorted(self._schedule.items())
+                    if Path(path) in self._workers
+                ],
+            }
+
+        return {"ok": False, "error": f"Unknown command: {command}"}
+
+
+def query_daemon(
+    socket_path: Path, command: str, timeout: float = 2.0, **params: object
+) -> Optional[Dict[str, Any]]:
+    """Send one request to a running daemon.
+
+    Args:
+        socket_path: Unix socket path of the daemon
+        command: Command name (ping, status, branches, schedule, stop)
+        timeout: Seconds to wait for the daemon
+        **params: Additional request fields (e.g. ``systems``)
+
+    Returns:
+        Response object, or None if no daemon answered or the request failed
+    """
+    if not socket_path.exists():
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(str(socket_path))
+            client.sendall(json.dumps({"command": command, **params}).encode() + b"\n")
+            data = b""
+            while not data.endswith(b"\n"):
+                chunk = client.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+        response: Dict[str, Any] = json.loads(data)
+    except (OSError, ValueError) as e:
+        logger.debug(f"pkm daemon not available on {socket_path}: {e}")
+        return None
+
+    if not response.get("ok"):
+        logger.debug(f"pkm daemon refused {command}: {response.get('error')}")
+        return None
+    return response
@@ -0,0 +1,290 @@
+"""Asynchronous git subprocess driver."""
+
+import asyncio
+import logging
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class GitCommandError(Exception):
+    """Exception raised when a git command exits with a non-zero status."""
+
+    def __init__(self, args: Tuple[str, ...], returncode: int, stderr: str):
+        """Initialize git command error.
+
+        Args:
+            args: Arguments passed to git
+            returncode: Exit status of the git process
+            stderr: Captured standard error output
+        """
+        self.command = ("git",) + tuple(args)
+        self.returncode = returncode
+        self.stderr = stderr
+        super().__init__(f"'{' '.join(self.command)}' exited with {returncode}: {stderr.strip()}")
+
+
+@dataclass
+class GitResult:
+    """Result of a completed git command."""
+
+    returncode: int
+    stdout: str
+    stderr: str
+
+
+@dataclass
+class StatusSummary:
+    """Working tree summary parsed from ``git status --porcelain=v2 --branch``."""
+
+    branch: Optional[str] = None
+    commit: Optional[str] = None
+    upstream: Optional[str] = None
+    ahead: Optional[int] = None
+    behind: Optional[int] = None
+    changed: int = 0
+    untracked: int = 0
+
+
+def parse_porcelain_v2(output: str) -> StatusSummary:
+    """Parse the output of ``git status --porcelain=v2 --branch``.
+
+    Args:
+        output: Command output
+
+    Returns:
+        Parsed status summary (``branch`` is None if HEAD is detached, ``commit`` is None
+        before the first commit)
+    """
+    summary = StatusSummary()
+
+    for line in output.splitlines():
+        if line.startswith("# branch.oid "):
+            oid = line[len("# branch.oid "):]
+            summary.commit = None if oid == "(initial)" else oid
+        elif line.startswith("# branch.head "):
+            head = line[len("# branch.head "):]
+            summary.branch = None if head == "(detached)" else head
+        elif line.startswith("# branch.upstream "):
+            summary.upstream = line[len("# branch.upstream "):]
+        elif line.startswith("# branch.ab "):
+            ahead, behind = line[len("# branch.ab "):].split()
+            summary.ahead = int(ahead.lstrip("+"))
+            summary.behind = int(behind.lstrip("-"))
+        elif line.startswith(("1 ", "2 ", "u ")):
+            summary.changed += 1
+        elif line.startswith("? "):
+            summary.untracked += 1
+
+    return summary
+
+
+async def _stream_lines(stream: asyncio.StreamReader, callback: Callable[[str], None]) -> bytes:
+    """Read a stream to the end, passing each ``\\r`` or ``\\n`` terminated line to a callback.
+
+    Git redraws progress in place with carriage returns, so both end a line.
+
+    Args:
+        stream: Stream to read
+        callback: Called with each decoded line
+
+    Returns:
+        Everything read from the stream
+    """
+    data = bytearray()
+    pending = b""
+
+    while True:
+        chunk = await stream.read(4096)
+        if not chunk:
+            break
+        data += chunk
+        *lines, pending = re.split(rb"[\r\n]", pending + chunk)
+        for line in lines:
+            if line:
+                callback(line.decode("utf-8", errors="replace"))
+
+    if pending:
+        callback(pending.decode("utf-8", errors="replace"))
+    return bytes(data)
+
+
+class AsyncGit:
+    """Run git commands as asyncio subprocesses with bounded concurrency.
+
+    One driver can be shared by many coroutines; at most ``concurrency`` git processes
+    run at the same time. The semaphore is created lazily per event loop, so the same
+    driver can be reused across separate ``asyncio.run`` calls.
+    """
+
+    def __init__(self, concurrency: int = 8, ssh_command: Optional[str] = None):
+        """Initialize the driver.
+
+        Args:
+            concurrency: Maximum number of concurrent git processes
+            ssh_command: Custom SSH command passed to git as GIT_SSH_COMMAND
+        """
+        self.concurrency = concurrency
+        self.ssh_command = ssh_command
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the concurrency semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    def environment(self) -> Dict[str, str]:
+        """Build the environment for git processes.
+
+        Returns:
+            Environment with prompts disabled and a stable locale for parsing output
+        """
+        env = dict(os.environ)
+        env["GIT_TERMINAL_PROMPT"] = "0"
+        env["LC_ALL"] = "C"
+        if self.ssh_command:
+            env["GIT_SSH_COMMAND"] = self.ssh_command
+        return env
+
+    async def run(
+        self,
+        *args: str,
+        cwd: Optional[Path] = None,
+        check: bool = True,
+        progress: Optional[Callable[[str], None]] = None,
+    ) -> GitResult:
+        """Run a git command and capture its output.
+
+        Args:
+            *args: Arguments passed to git
+            cwd: Working directory for the command
+            check: Raise GitCommandError if git exits with a non-zero status
+            progress: Called with each line of standard error as it arrives (pass
+                ``--progress`` in ``args`` for git to report progress when not on a terminal)
+
+        Returns:
+            GitResult with exit status and decoded output
+
+        Raises:
+            GitCommandError: If ``check`` is set and the command fails
+        """
+        async with self._get_semaphore():
+            logger.debug(f"Running git {' '.join(args)} in {cwd or Path.cwd()}")
+            process = await asyncio.create_subprocess_exec(
+                "git",
+                *args,
+                cwd=cwd,
+                env=self.environment(),
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            if progress is None:
+                stdout, stderr = await process.communicate()
+            else:
+                assert process.stdout is not None
+                assert process.stderr is not None
+                stdout, stderr = await asyncio.gather(
+                    process.stdout.read(), _stream_lines(process.stderr, progress)
+                )
+                await process.wait()
+
+        result = GitResult(
+            returncode=process.returncode if process.returncode is not None else -1,
+            stdout=stdout.decode("utf-8", errors="replace"),
+            stderr=stderr.decode("utf-8", errors="replace"),
+        )
+        if check and result.returncode != 0:
+            raise GitCommandError(args, result.returncode, result.stderr)
+        return result
+
+    async def rev_parse(self, repo_path: Path, ref: str) -> Optional[str]:
+        """Resolve a reference to a commit SHA.
+
+        Args:
+            repo_path: Path to the repository
+            ref: Reference to resolve (e.g. HEAD, origin/main)
+
+        Returns:
+            Full commit SHA, or None if the reference does not exist
+        """
+        result = await self.run(
+            "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}", cwd=repo_path, check=False
+        )
+        if result.returncode != 0:
+            return None
+        return result.stdout.strip() or None
+
+    async def status(
+        self, repo_path: Path, untracked: bool = False, fsmonitor: bool = False
+    ) -> StatusSummary:
+        """Summarize the working tree and branch in a single ``git status`` call.
+
+        Args:
+            repo_path: Path to the repository
+            untracked: Scan for untracked files (walks the whole working tree)
+            fsmonitor: Enable the filesystem monitor and untracked cache for this call
+
+        Returns:
+            Parsed status summary
+
+        Raises:
+            GitCommandError: If git status fails
+        """
+        options: List[str] = []
+        if fsmonitor:
+            options += ["-c", "core.fsmonitor=true", "-c", "core.untrackedCache=true"]
+        result = await self.run(
+            *options,
+            "status",
+            "--porcelain=v2",
+            "--branch",
+            f"--untracked-files={'normal' if untracked else 'no'}",
+            cwd=repo_path,
+        )
+        return parse_porcelain_v2(result.stdout)
+
+    async def ahead_behind(
+        self, repo_path: Path, ref: str, upstream: str
+    ) -> Optional[Tuple[int, int]]:
+        """Count commits on either side of two refs without listing them.
+
+        Args:
+            repo_path: Path to the repository
+            ref: Local reference (e.g. HEAD)
+            upstream: Reference to compare against (e.g. origin/main)
+
+        Returns:
+            Tuple of (commits only in ``ref``, commits only in ``upstream``), or None if
+            either reference does not exist
+        """
+        result = await self.run(
+            "rev-list", "--left-right", "--count", f"{ref}...{upstream}", "--",
+            cwd=repo_path, check=False,
+        )
+        if result.returncode != 0:
+            return None
+        ahead, behind = result.stdout.split()
+        return int(ahead), int(behind)
+
+    async def current_branch(self, repo_path: Path) -> Optional[str]:
+        """Get the checked-out branch name.
+
+        Args:
+            repo_path: Path to the repository
+
+        Returns:
+            Branch name, or None if HEAD is detached
+        """
+        result = await self.run("symbolic-ref", "--quiet", "--short", "HEAD", cwd=repo_path, check=False)
+        if result.returncode != 0:
+            return None
+        return result.stdout.strip() or None
@@ -0,0 +1,316 @@
+"""Per-host scheduling of git network operations."""
+
+import asyncio
+import logging
+import random
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+from pkm_tools.git_driver import GitCommandError
+from pkm_tools.utils import extract_repo_name
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Host name used for repositories reached through the filesystem (file:// URLs, paths)
+LOCAL_HOST = "local"
+
+# stderr of git failures worth retrying: dropped connections, throttling, server errors
+_TRANSIENT_ERRORS = re.compile(
+    r"connection (?:reset|refused|timed out|closed)"
+    r"|operation timed out"
+    r"|could not read from remote repository"
+    r"|the remote end hung up"
+    r"|early eof"
+    r"|unexpected disconnect"
+    r"|kex_exchange_identification|ssh_exchange_identification"
+    r"|too many (?:connections|requests)"
+    r"|rpc failed"
+    r"|returned error: (?:429|5\d\d)"
+    r"|temporary failure in name resolution"
+    r"|could not resolve host",
+    re.IGNORECASE,
+)
+
+# Operations of one kind timed on a host before their latency can signal congestion
+_MIN_LATENCY_SAMPLES = 3
+
+# scp-like SSH syntax: [user@]host:path
+_SCP_URL = re.compile(r"^(?:[^@/]+@)?(?P<host>[^:/]+):(?!//)")
+
+
+def remote_host(repo_url: str) -> str:
+    """Get the host a repository URL connects to.
+
+    Args:
+        repo_url: Git repository URL (``ssh://``, ``https://``, scp-like or local)
+
+    Returns:
+        ``host`` or ``host:port`` (e.g. "mangit.maninvestments.com:7999"), or
+        ``LOCAL_HOST`` for ``file://`` URLs and paths
+    """
+    if "://" in repo_url:
+        parts = urlsplit(repo_url)
+        if parts.scheme == "file" or not parts.hostname:
+            return LOCAL_HOST
+        return f"{parts.hostname}:{parts.port}" if parts.port else parts.hostname
+
+    match = _SCP_URL.match(repo_url)
+    return match["host"] if match else LOCAL_HOST
+
+
+def is_transient(error: GitCommandError) -> bool:
+    """Check whether a failed git command is worth retrying.
+
+    Args:
+        error: Git command failure
+
+    Returns:
+        True if the failure looks like a network or server-side hiccup
+    """
+    return bool(_TRANSIENT_ERRORS.search(error.stderr))
+
+
+class HostLimiter:
+    """Adaptive concurrency limit for one remote host (AIMD).
+
+    Every operation that completes in normal time raises the limit by ``1/limit`` (about one
+    slot per round of operations). A transient failure, or an operation taking more than
+    ``slow_factor`` times the host's average for its kind, halves it. Only operations started
+    after the last decrease can trigger the next one, so one burst of failures halves the
+    limit once.
+
+    Latency is averaged per kind of operation (``ls-remote``, ``fetch``, ``clone``, ...), since
+    a fetch normally takes many times longer than an ``ls-remote`` of the same repository.
+    Every sample feeds the average, so a host that settles at a slower pace becomes the new
+    baseline instead of being treated as congested forever.
+    """
+
+    def __init__(self, host: str, initial: float, maximum: int, slow_factor: float = 3.0):
+        """Initialize the limiter.
+
+        Args:
+            host: Host name (for logging)
+            initial: Starting concurrency limit
+            maximum: Highest concurrency limit
+            slow_factor: Latency, as a multiple of the average, treated as congestion
+        """
+        self.host = host
+        self.maximum = maximum
+        self.limit = min(float(maximum), max(1.0, initial))
+        self.slow_factor = slow_factor
+        self.latency: Dict[str, Tuple[float, int]] = {}
+        self.in_flight = 0
+        self.epoch = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._condition: Optional[asyncio.Condition] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        """Get the slot condition for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._loop = loop
+            self._condition = asyncio.Condition()
+            self.in_flight = 0
+        return self._condition
+
+    async def acquire(self) -> int:
+        """Wait for a free slot.
+
+        Returns:
+            Epoch the operation started in (pass it to ``release``)
+        """
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return self.epoch
+
+    def _is_slow(self, kind: str, latency: float) -> bool:
+        """Check an operation's latency against its kind's average, then record it.
+
+        Args:
+            kind: Kind of operation
+            latency: Seconds the operation took
+
+        Returns:
+            True if the operation took more than ``slow_factor`` times the average
+        """
+        if kind not in self.latency:
+            self.latency[kind] = (latency, 1)
+            return False
+        average, samples = self.latency[kind]
+        self.latency[kind] = (0.8 * average + 0.2 * latency, samples + 1)
+        return samples >= _MIN_LATENCY_SAMPLES and latency > self.slow_factor * average
+
+    async def release(
+        self, epoch: int, latency: float, congested: bool = False, kind: str = "git"
+    ) -> None:
+        """Free a slot and adapt the limit to how the operation went.
+
+        Args:
+            epoch: Epoch returned by ``acquire``
+            latency: Seconds the operation took
+            congested: Whether the operation failed transiently
+            kind: Kind of operation, whose latencies are averaged together
+        """
+        slow = self._is_slow(kind, latency)
+        congested = congested or slow
+
+        if congested and epoch == self.epoch:
+            self.limit = max(1.0, self.limit / 2)
+            self.epoch += 1
+            logger.debug(f"Reduced concurrency for {self.host} to {int(self.limit)}")
+        elif not congested:
+            self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+
+
+class HostScheduler:
+    """Run git network operations with a per-host concurrency limit and retries.
+
+    Operations are grouped by the host of their remote URL. Each host gets its own
+    ``HostLimiter``, so a throttled host slows down without holding back the others;
+    learned limits carry over between runs. Transient failures are retried with
+    exponential backoff and full jitter, without holding a slot while waiting.
+    Repositories reached through the filesystem are not limited.
+    """
+
+    def __init__(
+        self,
+        max_per_host: int = 8,
+        retries: int = 3,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            max_per_host: Highest concurrency limit of any host
+            retries: Retries of a transiently failing operation
+            backoff: Base backoff in seconds (doubled on each retry)
+            max_backoff: Longest backoff in seconds
+        """
+        self.max_per_host = max_per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.limiters: Dict[str, HostLimiter] = {}
+        self.stats: Dict[str, Dict[str, Any]] = {}
+
+    def reset(self) -> None:
+        """Discard the statistics of the previous run (learned limits are kept)."""
+        self.stats = {}
+
+    def _limiter_for(self, host: str) -> HostLimiter:
+        """Get the limiter of a host, starting at half the maximum concurrency."""
+        if host not in self.limiters:
+            self.limiters[host] = HostLimiter(host, self.max_per_host / 2, self.max_per_host)
+        return self.limiters[host]
+
+    def _stats_for(self, host: str) -> Dict[str, Any]:
+        """Get the statistics entry of a host."""
+        if host not in self.stats:
+            self.stats[host] = {
+                "operations": 0,
+                "failed": 0,
+                "retries": 0,
+                "seconds": 0.0,
+                "first_start": None,
+                "last_end": None,
+                "peak_concurrency": 0,
+            }
+        return self.stats[host]
+
+    async def run(
+        self, repo_url: str, operation: Callable[[], Awaitable[T]], kind: str = "git"
+    ) -> T:
+        """Run a network operation against a repository's host.
+
+        Args:
+            repo_url: Remote URL the operation contacts
+            operation: Coroutine function performing the operation (called once per attempt)
+            kind: Kind of operation (e.g. "fetch"), for the host's latency baseline
+
+        Returns:
+            Result of the operation
+
+        Raises:
+            GitCommandError: If the operation fails permanently or runs out of retries
+        """
+        host = remote_host(repo_url)
+        stats = self._stats_for(host)
+        limiter = None if host == LOCAL_HOST else self._limiter_for(host)
+        attempt = 0
+
+        while True:
+            epoch = await limiter.acquire() if limiter else 0
+            start = time.perf_counter()
+            if stats["first_start"] is None:
+                stats["first_start"] = start
+            if limiter:
+                stats["peak_concurrency"] = max(stats["peak_concurrency"], limiter.in_flight)
+
+            error: Optional[GitCommandError] = None
+            try:
+                result = await operation()
+            except GitCommandError as e:
+                error = e
+            finally:
+                latency = time.perf_counter() - start
+                stats["seconds"] += latency
+                stats["last_end"] = time.perf_counter()
+                transient = error is not None and is_transient(error)
+                if limiter:
+                    await limiter.release(epoch, latency, congested=transient, kind=kind)
+
+            if error is None:
+                stats["operations"] += 1
+                return result
+            if not transient or attempt >= self.retries:
+                stats["operations"] += 1
+                stats["failed"] += 1
+                raise error
+
+            attempt += 1
+            stats["retries"] += 1
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+            logger.debug(
+                f"Retrying {extract_repo_name(repo_url)} on {host} in {delay:.1f}s "
+                f"(attempt {attempt + 1}/{self.retries + 1}): {error.stderr.strip()}"
+            )
+            await asyncio.sleep(delay)
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Summarise the operations of the current run per host.
+
+        Returns:
+            Dictionary of host to ``operations``, ``failed``, ``retries``, ``seconds`` (summed
+            over operations), ``busy_seconds`` (first start to last finish), ``throughput``
+            (operations per busy second), ``peak_concurrency`` and ``limit`` (current
+            concurrency limit, None if unlimited)
+        """
+        report = {}
+        for host, stats in sorted(self.stats.items()):
+            busy = (stats["last_end"] or 0.0) - (stats["first_start"] or 0.0)
+            limiter = self.limiters.get(host)
+            peak = stats["peak_concurrency"]
+            report[host] = {
+                "operations": stats["operations"],
+                "failed": stats["failed"],
+                "retries": stats["retries"],
+                "seconds": stats["seconds"],
+                "busy_seconds": busy,
+                "throughput": stats["operations"] / busy if busy > 0 else 0.0,
+                "peak_concurrency": peak or None,
+                "limit": int(limiter.limit) if limiter else None,
+            }
+        return report
+
@@ -0,0 +1,218 @@
+"""Structured repository manifests with per-repository clone and sync options."""
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+from pkm_tools.utils import extract_repo_name
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+# Manifest file names looked up next to repository-list.txt
+MANIFEST_NAMES = ("repositories.yaml", "repositories.toml")
+
+# Start order of repository priorities
+PRIORITIES = ("high", "normal", "low")
+
+
+class RepositorySpec:
+    """One repository of a manifest and the options it is cloned and synced with.
+
+    Specs are created for every repository of every system, so they use ``__slots__``
+    and keep only plain values.
+    """
+
+    __slots__ = ("url", "branch", "depth", "priority", "sparse")
+
+    def __init__(
+        self,
+        url: str,
+        branch: Optional[str] = None,
+        depth: Optional[int] = None,
+        priority: str = "normal",
+        sparse: Tuple[str, ...] = (),
+    ):
+        """Initialize the spec.
+
+        Args:
+            url: Git repository URL
+            branch: Branch to track (None to use the system's or the default branch)
+            depth: Shallow clone depth (None for the system's clone options)
+            priority: Start priority (high, normal or low)
+            sparse: Directories to check out (empty for the whole tree)
+        """
+        self.url = url
+        self.branch = branch
+        self.depth = depth
+        self.priority = priority
+        self.sparse = sparse
+
+    @property
+    def name(self) -> str:
+        """Get the repository name."""
+        return extract_repo_name(self.url)
+
+    @property
+    def rank(self) -> int:
+        """Get the start rank of the priority (lower starts first)."""
+        return PRIORITIES.index(self.priority)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the spec to a dictionary, leaving out options at their defaults.
+
+        Returns:
+            Dictionary accepted by ``from_dict``
+        """
+        data: Dict[str, Any] = {"url": self.url}
+        if self.branch is not None:
+            data["branch"] = self.branch
+        if self.depth is not None:
+            data["depth"] = self.depth
+        if self.priority != "normal":
+            data["priority"] = self.priority
+        if self.sparse:
+            data["sparse"] = list(self.sparse)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RepositorySpec":
+        """Create a spec from a dictionary returned by ``to_dict``.
+
+        Args:
+            data: Spec dictionary
+
+        Returns:
+            Repository spec
+        """
+        return cls(
+            data["url"],
+            data.get("branch"),
+            data.get("depth"),
+            data.get("priority", "normal"),
+            tuple(data.get("sparse", ())),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RepositorySpec):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"RepositorySpec({self.to_dict()!r})"
+
+
+def _parse_spec(item: Any, where: str) -> RepositorySpec:
+    """Validate one manifest entry.
+
+    Args:
+        item: Repository URL or mapping of options
+        where: Location of the entry, for error messages
+
+    Returns:
+        Repository spec
+
+    Raises:
+        ValueError: If the entry is invalid
+    """
+    if isinstance(item, str):
+        return RepositorySpec(item)
+    if not isinstance(item, dict):
+        raise ValueError(f"{where}: expected a URL or a mapping")
+
+    unknown = set(item) - {"url", "branch", "shallow", "depth", "priority", "sparse"}
+    if unknown:
+        raise ValueError(f"{where}: unknown options {', '.join(sorted(unknown))}")
+
+    url = item.get("url")
+    if not isinstance(url, str) or not url:
+        raise ValueError(f"{where}: url is required")
+
+    branch = item.get("branch")
+    if branch is not None and not isinstance(branch, str):
+        raise ValueError(f"{where}: branch must be a string")
+
+    shallow = item.get("shallow", False)
+    depth = item.get("depth")
+    if not isinstance(shallow, bool):
+        raise ValueError(f"{where}: shallow must be true or false")
+    if depth is not None and (isinstance(depth, bool) or not isinstance(depth, int) or depth < 1):
+        raise ValueError(f"{where}: depth must be a positive integer")
+    if shallow and depth is None:
+        depth = 1
+
+    priority = item.get("priority", "normal")
+    if priority not in PRIORITIES:
+        raise ValueError(f"{where}: priority must be one of {', '.join(PRIORITIES)}")
+
+    sparse = item.get("sparse", [])
+    if isinstance(sparse, str):
+        sparse = [sparse]
+    if not isinstance(sparse, list) or not all(isinstance(path, str) and path for path in sparse):
+        raise ValueError(f"{where}: sparse must be a list of directories")
+
+    return RepositorySpec(url, branch, depth, priority, tuple(path.strip("/") for path in sparse))
+
+
+def find_repository_manifest(service_dir: Path) -> Optional[Path]:
+    """Find the structured manifest of a service-repositories directory.
+
+    Args:
+        service_dir: Directory holding repository-list.txt
+
+    Returns:
+        Path to the manifest, or None if there is none
+
+    Raises:
+        ValueError: If both a YAML and a TOML manifest exist
+    """
+    found = [service_dir / name for name in MANIFEST_NAMES if (service_dir / name).exists()]
+    if len(found) > 1:
+        raise ValueError(f"Use only one of {' and '.join(str(path) for path in found)}")
+    return found[0] if found else None
+
+
+def read_repository_manifest(file_path: Path) -> List[RepositorySpec]:
+    """Read a structured repository manifest.
+
+    The manifest is YAML or TOML (by extension) with a ``repositories`` list whose entries
+    are URLs or mappings, for example::
+
+        repositories:
+          - url: ssh://git@mangit.maninvestments.com:7999/ets/tomahawk2.git
+            branch: develop
+            shallow: true
+            priority: high
+            sparse: [src/core, docs]
+          - ssh://git@mangit.maninvestments.com:7999/ets/common.git
+
+    Args:
+        file_path: Path to repositories.yaml or repositories.toml
+
+    Returns:
+        Repository specs in file order
+
+    Raises:
+        ValueError: If the file cannot be parsed or an entry is invalid
+    """
+    try:
+        if file_path.suffix == ".toml":
+            with file_path.open("rb") as f:
+                data = tomllib.load(f)
+        else:
+            with file_path.open() as f:
+                data = yaml.safe_load(f) or {}
+    except (tomllib.TOMLDecodeError, yaml.YAMLError) as e:
+        raise ValueError(f"Invalid repository manifest {file_path}: {e}") from e
+
+    if not isinstance(data, dict) or not isinstance(data.get("repositories", []), list):
+        raise ValueError(f"Repository manifest must have a repositories list: {file_path}")
+
+    return [
+        _parse_spec(item, f"{file_path} entry {index}")
+        for index, item in enumerate(data.get("repositories", []), start=1)
+    ]
@@ -0,0 +1,218 @@
+"""Shared bare mirror cache of service repositories."""
+
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pkm_tools.git_driver import AsyncGit, GitResult
+from pkm_tools.hosts import HostScheduler
+from pkm_tools.progress import git_progress_handler
+from pkm_tools.utils import extract_repo_name
+
+logger = logging.getLogger(__name__)
+
+
+class MirrorCache:
+    """One bare ``--mirror`` repository per remote URL, shared by every working clone.
+
+    Working clones borrow objects from the mirror through git alternates
+    (``--reference``), so a repository listed under several systems, or cloned again
+    after deletion, only stores its objects once. Mirrors never prune unreachable
+    objects, because clones that still borrow from them may need those objects.
+
+    Mirrors are also a local fetch source: ``source_args`` rewrites the remote URL to
+    the mirror for a single git command, so working clones and PR checkouts fetch from
+    disk after one incremental ``remote update`` of the mirror per cycle.
+    """
+
+    def __init__(self, root: Path, git: AsyncGit, hosts: Optional[HostScheduler] = None):
+        """Initialize the mirror cache.
+
+        Args:
+            root: Directory holding the bare mirrors
+            git: Git driver used to create and refresh mirrors
+            hosts: Per-host scheduler for clones and fetches (default: run them directly)
+        """
+        self.root = root
+        self.git = git
+        self.hosts = hosts
+        self._locks: Dict[Path, asyncio.Lock] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def path_for(self, repo_url: str) -> Path:
+        """Get the mirror path for a repository URL.
+
+        The repository name keeps the directory readable; a short hash of the URL keeps
+        same-named repositories from different projects apart.
+
+        Args:
+            repo_url: Git repository URL
+
+        Returns:
+            Path of the bare mirror (which may not exist yet)
+        """
+        digest = hashlib.sha1(repo_url.encode()).hexdigest()[:12]
+        return self.root / f"{extract_repo_name(repo_url)}-{digest}.git"
+
+    def _lock_for(self, path: Path) -> asyncio.Lock:
+        """Get the lock serializing operations on one mirror, for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._locks = {}
+        if path not in self._locks:
+            self._locks[path] = asyncio.Lock()
+        return self._locks[path]
+
+    def exists(self, repo_url: str) -> bool:
+        """Check whether a mirror has been created for a URL.
+
+        Args:
+            repo_url: Git repository URL
+
+        Returns:
+            True if the mirror exists
+        """
+        return self.path_for(repo_url).exists()
+
+    def list_mirrors(self) -> List[Path]:
+        """List the mirrors in the cache.
+
+        Returns:
+            Sorted list of mirror paths
+        """
+        if not self.root.exists():
+            return []
+        return sorted(path for path in self.root.glob("*.git") if path.is_dir())
+
+    def source_args(self, repo_url: str) -> List[str]:
+        """Build git options that redirect fetches of a URL to its mirror.
+
+        The options go before the git subcommand (``git -c ... fetch``). Remote URLs in
+        the working clone are left untouched, so dropping the options fetches from the
+        real remote again.
+
+        Args:
+            repo_url: Git repository URL
+
+        Returns:
+            List of git options (empty if the URL has no mirror)
+        """
+        config = self.source_config(repo_url)
+        return ["-c", config] if config else []
+
+    def source_config(self, repo_url: str) -> Optional[str]:
+        """Build the ``url.<mirror>.insteadOf`` setting that redirects a URL to its mirror.
+
+        Args:
+            repo_url: Git repository URL
+
+        Returns:
+            ``name=value`` configuration string, or None if the URL has no mirror
+        """
+        path = self.path_for(repo_url)
+        if not path.exists():
+            return None
+        return f"url.{path.resolve().as_uri()}.insteadOf={repo_url}"
+
+    async def _network(
+        self, repo_url: str, operation: Callable[[], Awaitable[GitResult]], kind: str
+    ) -> None:
+        """Run a git command contacting a remote, through the per-host scheduler if any."""
+        if self.hosts is None:
+            await operation()
+        else:
+            await self.hosts.run(repo_url, operation, kind)
+
+    async def _create(self, repo_url: str, path: Path) -> None:
+        """Clone a new mirror, moving it into place only once it is complete."""
+        logger.debug(f"Creating mirror for {repo_url}")
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+        if tmp_path.exists():
+            await asyncio.to_thread(shutil.rmtree, tmp_path)
+        try:
+            handler = git_progress_handler()
+            await self._network(
+                repo_url,
+                lambda: self.git.run(
+                    "clone",
+                    "--mirror",
+                    "--progress" if handler else "--quiet",
+                    "--",
+                    repo_url,
+                    str(tmp_path),
+                    progress=handler,
+                ),
+                "mirror-clone",
+            )
+            await self.git.run("config", "gc.pruneExpire", "never", cwd=tmp_path)
+            await self.git.run("config", "gc.reflogExpireUnreachable", "never", cwd=tmp_path)
+            # Working clones may use shallow or partial clones against the mirror
+            await self.git.run("config", "uploadpack.allowFilter", "true", cwd=tmp_path)
+            tmp_path.rename(path)
+        finally:
+            if tmp_path.exists():
+                await asyncio.to_thread(shutil.rmtree, tmp_path)
+
+    async def _ref_snapshot(self, path: Path) -> str:
+        """Read every ref of a mirror, to detect whether an update changed anything."""
+        result = await self.git.run("for-each-ref", "--format=%(objectname) %(refname)", cwd=path)
+        return result.stdout
+
+    async def update(self, repo_url: str) -> Dict[str, Any]:
+        """Create the mirror for a URL, or bring it up to date with ``remote update``.
+
+        Args:
+            repo_url: Git repository URL
+
+        Returns:
+            Dictionary with the mirror ``path``, the ``action`` taken (created, updated)
+            and whether any ref changed (``had_changes``)
+
+        Raises:
+            GitCommandError: If cloning or fetching the mirror fails
+        """
+        path = self.path_for(repo_url)
+
+        async with self._lock_for(path):
+            if not path.exists():
+                await self._create(repo_url, path)
+                return {"path": path, "action": "created", "had_changes": True}
+
+            logger.debug(f"Refreshing mirror for {repo_url}")
+            before = await self._ref_snapshot(path)
+            await self._network(
+                repo_url,
+                lambda: self.git.run("remote", "update", "--prune", cwd=path),
+                "mirror-update",
+            )
+            had_changes = await self._ref_snapshot(path) != before
+            return {"path": path, "action": "updated", "had_changes": had_changes}
+
+    async def ensure(self, repo_url: str, refresh: bool = True) -> Path:
+        """Create the mirror for a URL if missing, otherwise optionally refresh it.
+
+        Args:
+            repo_url: Git repository URL
+            refresh: Fetch new objects into an existing mirror
+
+        Returns:
+            Path of the bare mirror
+
+        Raises:
+            GitCommandError: If cloning or fetching the mirror fails
+        """
+        if refresh:
+            await self.update(repo_url)
+            return self.path_for(repo_url)
+
+        path = self.path_for(repo_url)
+        async with self._lock_for(path):
+            if not path.exists():
+                await self._create(repo_url, path)
+        return path
@@ -0,0 +1,118 @@
+"""Per-phase timing of repository operations."""
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (system, repository name, phase totals) of the operation running in this task
+_current: ContextVar[Optional[Tuple[str, str, Dict[str, float]]]] = ContextVar(
+    "pkm_profile_current", default=None
+)
+
+
+class PhaseProfiler:
+    """Collect timing spans for the phases of repository operations.
+
+    Operations run as concurrent asyncio tasks; ``repository`` marks which repository the
+    current task works on, so ``phase`` spans are attributed without passing the repository
+    around. Spans recorded outside any repository (e.g. the up-front remote probe) belong
+    to the run as a whole.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty profiler."""
+        self.spans: List[Dict[str, Any]] = []
+
+    def reset(self) -> None:
+        """Discard all recorded spans."""
+        self.spans = []
+
+    @contextmanager
+    def repository(self, system: str, repo_name: str) -> Iterator[Dict[str, float]]:
+        """Attribute spans recorded in the enclosed block to a repository.
+
+        Args:
+            system: System name the repository belongs to
+            repo_name: Repository name
+
+        Yields:
+            Dictionary of phase name to total seconds, filled as phases complete
+        """
+        phases: Dict[str, float] = {}
+        token = _current.set((system, repo_name, phases))
+        try:
+            yield phases
+        finally:
+            _current.reset(token)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one phase of the current repository operation.
+
+        Args:
+            name: Phase name (open-repo, default-branch, checkout, fetch, merge, clone, ...)
+        """
+        started_at = time.time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            system, repo_name, phases = _current.get() or (None, None, None)
+            if phases is not None:
+                phases[name] = phases.get(name, 0.0) + duration
+            self.spans.append(
+                {
+                    "system": system,
+                    "repo": repo_name,
+                    "phase": name,
+                    "start": started_at,
+                    "duration": duration,
+                }
+            )
+
+    def run_phases(self) -> Dict[str, float]:
+        """Get the total seconds of each phase recorded outside any repository.
+
+        Returns:
+            Dictionary of phase name to total seconds
+        """
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            if span["repo"] is None:
+                totals[span["phase"]] = totals.get(span["phase"], 0.0) + span["duration"]
+        return totals
+
+    def write_trace(self, path: Path) -> None:
+        """Append the recorded spans to a JSON-lines trace file.
+
+        Args:
+            path: Trace file path (created if missing)
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as trace:
+            for span in self.spans:
+                trace.write(json.dumps(span) + "\n")
+        logger.debug(f"Wrote {len(self.spans)} spans to {path}")
+
+
+def sum_phases(phase_dicts: List[Dict[str, float]]) -> Dict[str, float]:
+    """Add up phase totals, e.g. of every repository of a system.
+
+    Args:
+        phase_dicts: Dictionaries of phase name to seconds
+
+    Returns:
+        Dictionary of phase name to total seconds
+    """
+    totals: Dict[str, float] = {}
+    for phases in phase_dicts:
+        for name, seconds in phases.items():
+            totals[name] = totals.get(name, 0.0) + seconds
+    return totals
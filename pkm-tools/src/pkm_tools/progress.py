@@ -0,0 +1,224 @@
+"""Live progress of concurrent repository operations."""
+
+import asyncio
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from rich.console import Console
+from rich.progress import BarColumn, Progress, SpinnerColumn, TaskID, TextColumn
+
+# Matches git's progress lines, e.g.
+# "Receiving objects:  45% (450/1000), 1.20 MiB | 2.40 MiB/s"
+# "remote: Counting objects: 100% (3/3), done."
+_PROGRESS_LINE = re.compile(
+    r"^(?:remote: )?(?P<phase>[A-Za-z][A-Za-z ]*):\s+"
+    r"(?:(?P<percent>\d+)% \((?P<done>\d+)/(?P<total>\d+)\)|(?P<count>\d+))"
+    r"(?:, (?P<size>[\d.]+ [KMGT]?i?B))?"
+    r"(?: \| (?P<rate>[\d.]+ [KMGT]?i?B/s))?"
+)
+
+# (event stream, key) of the operation running in this task
+_current: ContextVar[Optional[Tuple["ProgressStream", int]]] = ContextVar(
+    "pkm_progress_current", default=None
+)
+
+
+def parse_git_progress(line: str) -> Optional[Dict[str, Any]]:
+    """Parse one line of ``git --progress`` output.
+
+    Args:
+        line: Progress line (a ``\\r`` or ``\\n`` terminated segment of stderr)
+
+    Returns:
+        Dictionary with ``phase`` and, when present, ``percent``, ``done``, ``total``,
+        ``size`` and ``rate``; None if the line is not a progress line
+    """
+    match = _PROGRESS_LINE.match(line.strip())
+    if not match:
+        return None
+
+    info = {"phase": match["phase"].strip()}
+    if match["percent"] is not None:
+        info["percent"] = int(match["percent"])
+        info["done"] = int(match["done"])
+        info["total"] = int(match["total"])
+    else:
+        info["done"] = int(match["count"])
+    if match["size"]:
+        info["size"] = match["size"]
+    if match["rate"]:
+        info["rate"] = match["rate"]
+    return info
+
+
+def strip_git_progress(stderr: str) -> str:
+    """Remove progress lines from the standard error of a ``git --progress`` command.
+
+    Args:
+        stderr: Captured standard error
+
+    Returns:
+        Remaining lines (errors, warnings and hints), newline separated
+    """
+    lines = re.split(r"[\r\n]", stderr)
+    return "\n".join(line for line in lines if line and parse_git_progress(line) is None)
+
+
+def git_progress_handler() -> Optional[Callable[[str], None]]:
+    """Get a git stderr line handler reporting to the operation running in this task.
+
+    Returns:
+        Callable taking one progress line, or None if no live display is active
+    """
+    current = _current.get()
+    if current is None:
+        return None
+    stream, key = current
+
+    def handle(line: str) -> None:
+        info = parse_git_progress(line)
+        if info is not None:
+            stream.emit("update", key, info)
+
+    return handle
+
+
+class ProgressStream:
+    """Non-blocking stream of progress events rendered as a live multi-row display.
+
+    Workers only append events to an unbounded queue; a separate renderer coroutine
+    consumes them, coalesces bursts and updates the display. Rendering therefore never
+    holds up the worker pool, however fast git reports progress. Operations with a
+    negative key (e.g. an up-front probe) are shown but not counted as repositories.
+    """
+
+    def __init__(self, description: str, total: int):
+        """Initialize the stream.
+
+        Args:
+            description: Operation description (e.g. "Syncing")
+            total: Number of repositories in the run
+        """
+        self.description = description
+        self.total = total
+        self._queue: asyncio.Queue[Optional[Tuple[str, int, Dict[str, Any]]]] = asyncio.Queue()
+
+    def emit(self, kind: str, key: int, info: Optional[Dict[str, Any]] = None) -> None:
+        """Queue an event without waiting.
+
+        Args:
+            kind: Event kind (start, update, finish)
+            key: Key identifying the operation
+            info: Event details (the label for ``start``, parsed progress for ``update``)
+        """
+        self._queue.put_nowait((kind, key, info or {}))
+
+    @contextmanager
+    def operation(self, key: int, label: str) -> Iterator[None]:
+        """Report the enclosed block as one in-flight operation.
+
+        Git commands started in the block with ``git_progress_handler`` feed its row.
+
+        Args:
+            key: Key identifying the operation
+            label: Row label (e.g. the repository name)
+        """
+        self.emit("start", key, {"label": label})
+        token = _current.set((self, key))
+        try:
+            yield
+        finally:
+            _current.reset(token)
+            self.emit("finish", key)
+
+    def close(self) -> None:
+        """Tell the renderer that no more events will follow."""
+        self._queue.put_nowait(None)
+
+    async def render(self, progress: Progress, refresh_interval: float = 0.1) -> None:
+        """Consume events and update the display until the stream is closed.
+
+        Args:
+            progress: Rich progress display to draw on
+            refresh_interval: Minimum seconds between batches of display updates
+        """
+        overall = progress.add_task(
+            f"{self.description} 0/{self.total} repositories", total=self.total or None, detail=""
+        )
+        rows: Dict[int, TaskID] = {}
+        finished = 0
+        closed = False
+
+        while not closed:
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            # Only the latest progress line of each operation in a batch is drawn
+            latest: Dict[int, Dict[str, Any]] = {}
+            for event in batch:
+                if event is None:
+                    closed = True
+                    continue
+                kind, key, info = event
+                if kind == "start":
+                    rows[key] = progress.add_task(f"  {info['label']}", total=None, detail="")
+                elif kind == "update":
+                    latest[key] = info
+                elif kind == "finish":
+                    latest.pop(key, None)
+                    if key in rows:
+                        progress.remove_task(rows.pop(key))
+                    if key >= 0:
+                        finished += 1
+
+            for key, info in latest.items():
+                if key in rows:
+                    progress.update(rows[key], **_row_update(info))
+
+            progress.update(
+                overall,
+                completed=finished,
+                description=f"{self.description} {finished}/{self.total} repositories",
+            )
+            if not closed:
+                await asyncio.sleep(refresh_interval)
+
+
+def _row_update(info: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the display update for one parsed progress line."""
+    detail = info["phase"].lower()
+    if "total" in info:
+        detail += f" {info['done']}/{info['total']}"
+    else:
+        detail += f" {info['done']}"
+    if "size" in info:
+        detail += f", {info['size']}"
+    if "rate" in info:
+        detail += f" at {info['rate']}"
+
+    update = {"detail": detail}
+    if "percent" in info:
+        update["total"] = 100
+        update["completed"] = info["percent"]
+    return update
+
+
+def create_progress_display(console: Console) -> Progress:
+    """Create the live multi-row display used for repository operations.
+
+    Args:
+        console: Rich console to draw on
+
+    Returns:
+        Rich progress display
+    """
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(bar_width=20),
+        TextColumn("[dim]{task.fields[detail]}"),
+        console=console,
+    )
@@ -0,0 +1,304 @@
+"""Cached index of the repositories configured across all systems."""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import yaml
+
+from pkm_tools.config import PKMConfig, SystemManifest
+from pkm_tools.manifest import (
+    MANIFEST_NAMES,
+    RepositorySpec,
+    find_repository_manifest,
+    read_repository_manifest,
+)
+from pkm_tools.utils import extract_repo_name, read_repository_list
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of the cache file changes
+_CACHE_VERSION = 3
+
+
+def repo_project(repo_url: str) -> Optional[str]:
+    """Extract the Bitbucket project key from a repository URL.
+
+    Args:
+        repo_url: Git repository URL
+
+    Returns:
+        Lower-case project key (the path component before the repository), or None if
+        the URL has no such component
+
+    Examples:
+        >>> repo_project("ssh://git@mangit.maninvestments.com:7999/ets/tomahawk2.git")
+        'ets'
+        >>> repo_project("https://mangit.maninvestments.com/scm/ETS/tomahawk2.git")
+        'ets'
+    """
+    if "://" in repo_url:
+        path = urlsplit(repo_url).path
+    else:
+        path = repo_url.partition(":")[2] if ":" in repo_url else repo_url
+    parts = [part for part in path.split("/") if part]
+    return parts[-2].lower() if len(parts) >= 2 else None
+
+
+def _stamp(path: Path) -> Optional[List[int]]:
+    """Get the modification time and size of a path (None if it does not exist)."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class RepositoryRegistry:
+    """Index mapping systems to their repositories and repositories back to their systems.
+
+    Systems are discovered from the directories under ``systems/``. Every
+    ``repository-list.txt``, structured repository manifest and ``system.yaml`` is parsed
+    once and the result is cached on disk, keyed by the modification times of the systems
+    directory, each system directory and each of those files. Later lookups (in this process or the next) only stat those
+    paths, at most once per ``check_interval``; any change rebuilds the index.
+
+    Repositories can be looked up by name, URL or Bitbucket project and slug.
+    """
+
+    def __init__(self, config: PKMConfig, persist: bool = True, check_interval: float = 5.0):
+        """Initialize the registry.
+
+        Args:
+            config: PKM configuration
+            persist: Cache the index in ``config.registry_file`` (otherwise it is kept in
+                memory only)
+            check_interval: Seconds a loaded index is used before its sources are checked
+                for changes again
+        """
+        self.config = config
+        self.cache_file = config.registry_file if persist else None
+        self.check_interval = check_interval
+        self._data: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._systems: Dict[str, Dict[str, Any]] = {}
+        self._manifests: Dict[str, SystemManifest] = {}
+        self._specs: Dict[Tuple[str, str], RepositorySpec] = {}
+        self._by_name: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_url: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_slug: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+
+    def _is_fresh(self, data: Dict[str, Any]) -> bool:
+        """Check whether no source of a cached index changed since it was built."""
+        stamps = data.get("stamps")
+        if data.get("version") != _CACHE_VERSION or not isinstance(stamps, dict):
+            return False
+        return all(_stamp(Path(path)) == stamp for path, stamp in stamps.items())
+
+    def _build(self) -> Dict[str, Any]:
+        """Parse every system's repository list into a new index."""
+        systems_dir = self.config.systems_dir
+        stamps = {str(systems_dir): _stamp(systems_dir)}
+        systems = []
+
+        for name in self.config.list_systems():
+            system_dir = systems_dir / name
+            service_dir = system_dir / "service-repositories"
+            list_file = service_dir / "repository-list.txt"
+            manifest_files = [service_dir / name for name in MANIFEST_NAMES]
+            for path in (system_dir, system_dir / "system.yaml", service_dir, list_file):
+                stamps[str(path)] = _stamp(path)
+            for path in manifest_files:
+                stamps[str(path)] = _stamp(path)
+
+            entry: Dict[str, Any] = {
+                "name": name,
+                "service_dir": str(service_dir),
+                "repos": [],
+                "manifest": {},
+                "specs": [],
+                "error": None,
+            }
+            try:
+                manifest = self.config.get_system_manifest(name)
+                entry["manifest"] = manifest.model_dump(mode="json", exclude_defaults=True)
+                manifest_file = find_repository_manifest(service_dir)
+                specs = read_repository_manifest(manifest_file) if manifest_file else []
+                # Listing repositories in a manifest makes repository-list.txt optional
+                repos = []
+                if list_file.exists() or not (manifest.repositories or specs):
+                    repos = read_repository_list(self.config.get_repository_list_file(name))
+                entry["repos"] = list(
+                    dict.fromkeys(repos + manifest.repositories + [spec.url for spec in specs])
+                )
+                # Plain URLs need no spec; their options are all defaults
+                entry["specs"] = [spec.to_dict() for spec in specs if len(spec.to_dict()) > 1]
+            except (ValueError, OSError, yaml.YAMLError) as e:
+                entry["error"] = str(e)
+            systems.append(entry)
+
+        logger.debug(f"Indexed the repositories of {len(systems)} systems")
+        return {"version": _CACHE_VERSION, "stamps": stamps, "systems": systems}
+
+    def _read_cache(self) -> Optional[Dict[str, Any]]:
+        """Load the cached index, ignoring missing, unreadable or malformed files."""
+        if self.cache_file is None:
+            return None
+        try:
+            data = json.loads(self.cache_file.read_text())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or not isinstance(data.get("systems"), list):
+            return None
+        return data
+
+    def _write_cache(self, data: Dict[str, Any]) -> None:
+        """Store the index atomically, so concurrent readers never see partial files."""
+        if self.cache_file is None:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_file.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as temp:
+                json.dump(data, temp)
+            Path(temp_path).replace(self.cache_file)
+        except OSError as e:
+            logger.debug(f"Failed to write repository registry {self.cache_file}: {e}")
+
+    def _load(self) -> None:
+        """Make sure the in-memory index matches the repository lists on disk."""
+        now = time.monotonic()
+        if self._data is not None and (
+            now - self._checked_at < self.check_interval or self._is_fresh(self._data)
+        ):
+            self._checked_at = now
+            return
+
+        data = self._read_cache()
+        if data is None or not self._is_fresh(data):
+            data = self._build()
+            self._write_cache(data)
+
+        self._data = data
+        self._checked_at = now
+        self._systems = {}
+        self._manifests = {}
+        self._specs = {}
+        self._by_name = {}
+        self._by_url = {}
+        self._by_slug = {}
+        for system in data["systems"]:
+            self._systems[system["name"]] = system
+            for spec_data in system["specs"]:
+                spec = RepositorySpec.from_dict(spec_data)
+                self._specs[(system["name"], spec.url)] = spec
+            for repo_url in system["repos"]:
+                name = extract_repo_name(repo_url)
+                entry = {
+                    "system": system["name"],
+                    "name": name,
+                    "url": repo_url,
+                    "project": repo_project(repo_url),
+                    "path": Path(system["service_dir"]) / name,
+                }
+                self._by_name.setdefault(name, []).append(entry)
+                self._by_url.setdefault(repo_url, []).append(entry)
+                if entry["project"]:
+                    self._by_slug.setdefault((entry["project"], name.lower()), []).append(entry)
+
+    def systems(self) -> List[str]:
+        """List all systems.
+
+        Returns:
+            System names
+        """
+        self._load()
+        return list(self._systems)
+
+    def repositories(self, system: str) -> List[str]:
+        """Get the repository URLs of a system.
+
+        Args:
+            system: System name (thk, man-oms, GCP)
+
+        Returns:
+            Repository URLs in list order
+
+        Raises:
+            ValueError: If the system or its repository list does not exist
+        """
+        return list(self._system(system)["repos"])
+
+    def manifest(self, system: str) -> SystemManifest:
+        """Get the settings of a system's ``system.yaml``.
+
+        Args:
+            system: System name (thk, man-oms, GCP)
+
+        Returns:
+            System manifest (all defaults if the system has no ``system.yaml``)
+
+        Raises:
+            ValueError: If the system does not exist or its configuration is invalid
+        """
+        entry = self._system(system)
+        if system not in self._manifests:
+            self._manifests[system] = SystemManifest(**entry["manifest"])
+        return self._manifests[system]
+
+    def spec(self, system: str, repo_url: str) -> RepositorySpec:
+        """Get the per-repository options of a repository.
+
+        Args:
+            system: System name (thk, man-oms, GCP)
+            repo_url: Git repository URL
+
+        Returns:
+            Repository spec from the system's structured manifest (all defaults if the
+            repository has no options there)
+        """
+        self._load()
+        return self._specs.get((system, repo_url)) or RepositorySpec(repo_url)
+
+    def _system(self, system: str) -> Dict[str, Any]:
+        """Get the index entry of a system, raising its configuration error if it has one."""
+        self._load()
+        entry = self._systems.get(system)
+        if entry is None:
+            # Raises the configuration's error for the missing system directory
+            self.config.get_system_dir(system)
+            raise ValueError(f"Unknown system: {system}")
+        if entry["error"]:
+            raise ValueError(entry["error"])
+        return entry
+
+    def find(self, name: str) -> List[Dict[str, Any]]:
+        """Find the repositories with a name or URL.
+
+        Args:
+            name: Repository name (e.g. "tomahawk2") or URL
+
+        Returns:
+            Entries with ``system``, ``name``, ``url``, ``project`` and local ``path``, one
+            per system listing the repository
+        """
+        self._load()
+        return list(self._by_url.get(name) or self._by_name.get(name, []))
+
+    def find_slug(self, project: str, slug: str) -> List[Dict[str, Any]]:
+        """Find the repositories of a Bitbucket project key and repository slug.
+
+        Args:
+            project: Project key (e.g. "ETS"; case-insensitive)
+            slug: Repository slug
+
+        Returns:
+            Entries as returned by ``find``
+        """
+        self._load()
+        return list(self._by_slug.get((project.lower(), slug.lower()), []))
@@ -1,23 +1,39 @@
 """Repository synchronization logic."""
 
-import json
+import asyncio
+import contextlib
 import logging
 import os
 import re
+import shutil
+import time
 from pathlib import Path
-from typing import List, Optional, Tuple
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+from urllib.parse import urlsplit
 
-import git
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
 
-from pkm_tools.config import PKMConfig
-from pkm_tools.utils import extract_repo_name, read_repository_list
+from pkm_tools.bitbucket import BitbucketClient, BitbucketError
+from pkm_tools.config import CloneOptions, PKMConfig
+from pkm_tools.git_driver import AsyncGit, GitCommandError, GitResult
+from pkm_tools.hosts import HostScheduler
+from pkm_tools.manifest import PRIORITIES
+from pkm_tools.mirror import MirrorCache
+from pkm_tools.profiling import PhaseProfiler, sum_phases
+from pkm_tools.progress import (
+    ProgressStream,
+    create_progress_display,
+    git_progress_handler,
+    strip_git_progress,
+)
+from pkm_tools.registry import RepositoryRegistry
+from pkm_tools.ssh import SSHMultiplexer
+from pkm_tools.state import SyncStateStore
+from pkm_tools.utils import default_jobs, extract_repo_name
 
 logger = logging.getLogger(__name__)
-console = Console()
+# Live progress goes to stderr so stdout carries only results
+console = Console(stderr=True)
 
 
 class RepositorySyncError(Exception):
@@ -26,219 +42,961 @@ class RepositorySyncError(Exception):
     pass
 
 
+def _lookup_head(
+    remote_heads: Optional[Dict[Path, Dict[str, Any]]], target_dir: Path, repo_name: str
+) -> Optional[Dict[str, Any]]:
+    """Look up a probed remote head for a repository.
+
+    Args:
+        remote_heads: Heads collected by ``RepositorySync._probe_remote_heads``
+        target_dir: Directory where repositories are stored
+        repo_name: Repository name
+
+    Returns:
+        Probed head, or None if the repository was not probed or its remote is unknown
+    """
+    if not remote_heads:
+        return None
+    head = remote_heads.get(target_dir / repo_name)
+    if head is None or head["remote"] is None:
+        return None
+    return head
+
+
+# Planned actions, in the order they are reported
+PLAN_ACTIONS = ("clone", "fast-forward", "merge", "skip", "conflict")
+
+# Start rank of each planned action: missing repositories first, untouched ones last
+_PLAN_START_RANKS = {"clone": 0, "fast-forward": 1, "merge": 1, "skip": 2, "conflict": 2}
+
+
 class RepositorySync:
     """Handle repository synchronization operations."""
 
-    def __init__(self, config: PKMConfig):
+    def __init__(self, config: PKMConfig, registry: Optional[RepositoryRegistry] = None):
         """Initialize repository sync.
 
         Args:
             config: PKM configuration
+            registry: Repository registry of ``config`` (created if not given)
         """
         self.config = config
-
-    def _get_default_branch(self, repo: git.Repo) -> str:
+        self.ssh = (
+            SSHMultiplexer(
+                config.ssh_control_dir, config.git_ssh_command, config.ssh_control_persist
+            )
+            if config.ssh_multiplex
+            else None
+        )
+        ssh_command = self.ssh.command if self.ssh else config.git_ssh_command
+        self.git = AsyncGit(concurrency=default_jobs(), ssh_command=ssh_command)
+        self.state = SyncStateStore(config.state_file)
+        self.hosts = HostScheduler(
+            max_per_host=config.host_concurrency,
+            retries=config.network_retries,
+            backoff=config.retry_backoff,
+        )
+        self.mirrors = MirrorCache(config.mirror_dir, self.git, self.hosts)
+        self.profiler = PhaseProfiler()
+        self.registry = registry if registry is not None else RepositoryRegistry(config)
+        # Called with (system, result dictionary) as soon as each repository is done
+        self.on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None
+        self._bitbucket: Dict[str, BitbucketClient] = {}
+
+    async def _get_default_branch(self, repo_path: Path, remember: bool = True) -> str:
         """Get the default branch of a repository.
 
+        The branch is read from the sync state store when known; otherwise it is detected
+        from the remote refs and cached for later runs. If the remote refs do not tell, the
+        checked-out branch is used for this run only, since it may be a feature branch.
+
         Args:
-            repo: Git repository object
+            repo_path: Path to the repository
+            remember: Cache a detected branch in the state store (off for dry runs)
 
         Returns:
             Name of the default branch
         """
+        with self.profiler.phase("default-branch"):
+            cached = self.state.get_default_branch(repo_path)
+            if cached:
+                return cached
+
+            detected = await self._detect_default_branch(repo_path)
+            if detected:
+                if remember:
+                    self.state.update(repo_path, default_branch=detected)
+                return detected
+
+            # Last resort: use current branch (not cached)
+            try:
+                current = await self.git.current_branch(repo_path)
+            except (GitCommandError, OSError):
+                current = None
+            if current:
+                return current
+
+        # If all else fails, default to main
+        return "main"
+
+    async def _detect_default_branch(self, repo_path: Path) -> Optional[str]:
+        """Detect the default branch of a repository from its refs.
+
+        Args:
+            repo_path: Path to the repository
+
+        Returns:
+            Name of the default branch, or None if the remote refs do not identify it
+        """
         try:
             # Try to get the default branch from remote HEAD
-            for ref in repo.remotes.origin.refs:
-                if ref.name == "origin/HEAD":
-                    # Extract branch name from origin/HEAD -> origin/master format
-                    return ref.ref.name.replace("origin/", "")
+            result = await self.git.run(
+                "symbolic-ref", "--quiet", "refs/remotes/origin/HEAD", cwd=repo_path, check=False
+            )
+            if result.returncode == 0 and result.stdout.strip():
+                # Extract branch name from refs/remotes/origin/master format
+                return result.stdout.strip().replace("refs/remotes/origin/", "")
 
             # Fallback: try common branch names
             for branch_name in ["main", "master", "develop"]:
-                try:
-                    repo.git.rev_parse("--verify", f"origin/{branch_name}")
+                if await self.git.rev_parse(repo_path, f"origin/{branch_name}"):
                     return branch_name
-                except git.GitCommandError:
-                    continue
 
-            # Last resort: use current branch
-            return repo.active_branch.name
+            return None
         except Exception:
-            # If all else fails, default to main
-            return "main"
+            return None
 
-    def sync_system(self, system: str, branch: str | None = None) -> dict:
-        """Sync all repositories for a system.
+    async def _read_local_head(self, repo_path: Path, branch: str) -> Optional[str]:
+        """Read the commit of a local branch, avoiding a git process when possible.
+
+        Loose refs are read straight from ``.git/refs/heads``; packed or otherwise
+        unusual refs fall back to ``git rev-parse``.
 
         Args:
-            system: System name (thk, man-oms, GCP)
-            branch: Branch to sync (default: None, which auto-detects the default branch)
+            repo_path: Path to the repository
+            branch: Local branch name
 
         Returns:
-            Dictionary with sync results
+            Commit SHA, or None if the branch does not exist
         """
-        logger.info(f"Syncing repositories for system: {system}")
+        ref_file = repo_path / ".git" / "refs" / "heads" / branch
+        try:
+            sha = ref_file.read_text().strip()
+        except OSError:
+            sha = ""
+        if len(sha) == 40:
+            return sha
+        return await self.git.rev_parse(repo_path, f"refs/heads/{branch}")
+
+    def get_system_repositories(self, system: str) -> Tuple[List[str], Path]:
+        """Get configured repository URLs and target directory for a system.
 
+        Args:
+            system: System name (thk, man-oms, GCP)
+
+        Returns:
+            Tuple of (repository URLs, service-repositories directory)
+
+        Raises:
+            RepositorySyncError: If the system is not configured correctly
+        """
         try:
-            repo_list_file = self.config.get_repository_list_file(system)
+            repos = self.registry.repositories(system)
             service_repos_dir = self.config.get_service_repositories_dir(system)
         except ValueError as e:
             raise RepositorySyncError(str(e)) from e
 
-        repos = read_repository_list(repo_list_file)
-
         if not repos:
-            logger.warning(f"No repositories found in {repo_list_file}")
-            return {"system": system, "synced": 0, "failed": 0, "repos": []}
+            logger.warning(f"No repositories found for system {system}")
+
+        return repos, service_repos_dir
+
+    def _repo_branch(self, system: str, repo_url: str, branch: str | None) -> str | None:
+        """Get the branch to use for one repository.
+
+        Args:
+            system: System name the repository belongs to
+            repo_url: Git repository URL
+            branch: Branch requested for the whole run (None to auto-detect)
 
-        results = {"system": system, "synced": 0, "failed": 0, "repos": []}
+        Returns:
+            The requested branch, else the branch set for the repository in the system's
+            repository manifest or ``system.yaml``, else None (auto-detect)
+        """
+        if branch is not None:
+            return branch
+        return self.registry.spec(system, repo_url).branch or self.registry.manifest(
+            system
+        ).branches.get(extract_repo_name(repo_url))
+
+    def _clone_options(
+        self, system: str, repo_url: str, overrides: Optional[CloneOptions]
+    ) -> CloneOptions:
+        """Get the clone options of one repository.
 
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            for repo_url in repos:
-                repo_name = extract_repo_name(repo_url)
-                task = progress.add_task(f"Syncing {repo_name}...", total=None)
+        The system's options are overridden by the repository's manifest entry, which is
+        overridden by the options given for this run.
+
+        Args:
+            system: System name the repository belongs to
+            repo_url: Git repository URL
+            overrides: Clone options given for this run
+
+        Returns:
+            Merged clone options
+        """
+        options = self.config.get_clone_options(system, self.registry.manifest(system))
+        spec = self.registry.spec(system, repo_url)
+        return options.merged(CloneOptions(depth=spec.depth)).merged(overrides)
+
+    def _repo_priority(self, system: str, repo_url: str, _target_dir: Path) -> int:
+        """Get the start rank of a repository (manifest priority; lower starts first).
+
+        Args:
+            system: System name the repository belongs to
+            repo_url: Git repository URL
+            _target_dir: Directory where repositories are stored
+
+        Returns:
+            Rank of the repository's priority
+        """
+        return self.registry.spec(system, repo_url).rank
+
+    def _run_repositories(
+        self,
+        work: List[Tuple[str, str, Path]],
+        operation: Callable[[str, str, Path], Awaitable[Dict[str, Any]]],
+        description: str,
+        jobs: int | None = None,
+        prepare: Optional[Callable[[List[Tuple[str, str, Path]]], Awaitable[None]]] = None,
+        priority: Optional[Callable[[str, str, Path], Any]] = None,
+    ) -> Tuple[List[Dict[str, Any]], float, float]:
+        """Run a per-repository operation over many repositories on one event loop.
+
+        Each result dictionary gains the operation's ``duration`` and its per-phase timings
+        (``phases``); every span is also kept in ``self.profiler`` until the next run. Each
+        result is passed to ``on_result`` as soon as its repository is done. Systems whose
+        ``system.yaml`` sets a ``concurrency`` never run more operations at once than that.
+
+        Args:
+            work: List of (system, repository URL, target directory) tuples
+            operation: Coroutine function returning the result dictionary for one repository
+            description: Progress description prefix (e.g. "Syncing")
+            jobs: Maximum number of concurrent operations (default: CPU count)
+            prepare: Coroutine function run once over all of ``work`` before any operation
+            priority: Sort key of a work item; operations start in ascending key order
+                (default: each repository's manifest priority, then the order of ``work``)
+
+        Returns:
+            Tuple of (result dictionaries in the order of ``work``, wall-clock seconds,
+            serial seconds summed over every repository)
+        """
+        max_workers = max(1, jobs or default_jobs())
+        self.git.concurrency = max_workers
+        self.profiler.reset()
+        self.hosts.reset()
+        durations = [0.0] * len(work)
+
+        with create_progress_display(console) as progress:
+
+            async def run_all() -> List[Dict[str, Any]]:
+                # Workers only queue events; the renderer task draws them
+                stream = ProgressStream(description, len(work))
+                renderer = asyncio.create_task(stream.render(progress))
+
+                slots = asyncio.Semaphore(max_workers)
+                system_slots = {}
+                for system in {system for system, _, _ in work}:
+                    limit = self.registry.manifest(system).concurrency
+                    if limit is not None and limit < max_workers:
+                        system_slots[system] = asyncio.Semaphore(limit)
+
+                async def run(index: int) -> Dict[str, Any]:
+                    system, repo_url, _ = work[index]
+                    repo_name = extract_repo_name(repo_url)
+                    # The system's limit is taken first, so its queued work holds no slot
+                    async with system_slots.get(system) or contextlib.nullcontext(), slots:
+                        start = time.perf_counter()
+                        try:
+                            with (
+                                stream.operation(index, repo_name),
+                                self.profiler.repository(system, repo_name) as phases,
+                            ):
+                                result = await operation(*work[index])
+                        finally:
+                            durations[index] = time.perf_counter() - start
+                        result["duration"] = durations[index]
+                        result["phases"] = phases
+                        if self.on_result is not None:
+                            self.on_result(system, result)
+                        return result
 
                 try:
-                    sync_info = self._sync_repository(repo_url, service_repos_dir, branch)
-                    results["synced"] += 1
-                    results["repos"].append({
-                        "name": repo_name,
-                        "status": "success",
-                        "url": repo_url,
-                        "had_changes": sync_info.get("had_changes", False),
-                        "action": sync_info.get("action", "synced")
-                    })
-                    logger.info(f"Successfully synced: {repo_name}")
-                except Exception as e:
-                    results["failed"] += 1
-                    results["repos"].append(
-                        {"name": repo_name, "status": "failed", "url": repo_url, "error": str(e)}
-                    )
-                    logger.error(f"Failed to sync {repo_name}: {e}")
+                    if self.ssh is not None:
+                        with self.profiler.phase("ssh-connect"):
+                            await self.ssh.connect([repo_url for _, repo_url, _ in work])
+                    if prepare is not None:
+                        with stream.operation(-1, f"Preparing {len(work)} repositories"):
+                            await prepare(work)
+                    # Workers take the semaphore in the order their tasks start
+                    order = list(range(len(work)))
+                    order.sort(key=lambda index: (priority or self._repo_priority)(*work[index]))
+                    results: List[Dict[str, Any]] = [{}] * len(work)
+                    for index, result in zip(
+                        order,
+                        await asyncio.gather(*(run(index) for index in order)),
+                        strict=True,
+                    ):
+                        results[index] = result
+                    return results
                 finally:
-                    progress.remove_task(task)
+                    if self.ssh is not None:
+                        await self.ssh.disconnect()
+                    stream.close()
+                    await renderer
+
+            start = time.perf_counter()
+            repo_results = asyncio.run(run_all())
+            elapsed = time.perf_counter() - start
+
+        return repo_results, elapsed, sum(durations)
+
+    def _group_results(
+        self,
+        systems: List[str],
+        work: List[Tuple[str, str, Path]],
+        repo_results: List[Dict[str, Any]],
+        counter: str,
+    ) -> List[Dict[str, Any]]:
+        """Group per-repository results into per-system result dictionaries.
 
-        return results
+        Args:
+            systems: System names, in display order
+            work: List of (system, repository URL, target directory) tuples
+            repo_results: Result dictionaries in the order of ``work``
+            counter: Name of the success counter key (synced, cloned, updated)
 
-    def clone_system(self, system: str, branch: str = "main") -> dict:
-        """Clone all repositories for a system.
+        Returns:
+            List of per-system result dictionaries
+        """
+        grouped: Dict[str, Dict[str, Any]] = {
+            system: {"system": system, counter: 0, "failed": 0, "repos": []} for system in systems
+        }
+
+        for (system, _, _), repo_result in zip(work, repo_results, strict=True):
+            system_result = grouped[system]
+            if repo_result["status"] == "success":
+                system_result[counter] += 1
+            else:
+                system_result["failed"] += 1
+            system_result["repos"].append(repo_result)
+
+        for system_result in grouped.values():
+            system_result["phases"] = sum_phases(
+                [repo_result.get("phases", {}) for repo_result in system_result["repos"]]
+            )
+
+        return [grouped[system] for system in systems]
+
+    def _record_state(
+        self, repo_url: str, target_dir: Path, info: Dict[str, Any], duration: float
+    ) -> None:
+        """Record a successful repository operation in the sync state store.
 
         Args:
-            system: System name (thk, man-oms, GCP)
-            branch: Branch to clone (default: main)
+            repo_url: Git repository URL
+            target_dir: Directory where repositories are stored
+            info: Information dictionary returned by the repository operation
+            duration: Operation duration in seconds
+        """
+        fields = {"branch": info.get("branch"), "local_sha": info.get("commit")}
+        if info.get("remote_commit"):
+            fields["remote_sha"] = info["remote_commit"]
+        self.state.record_result(
+            target_dir / extract_repo_name(repo_url),
+            repo_url,
+            info.get("action", "synced"),
+            duration,
+            **fields,
+        )
+
+    async def _sync_entry(
+        self,
+        repo_url: str,
+        target_dir: Path,
+        branch: str | None,
+        fetch_first: bool = False,
+        remote_heads: Optional[Dict[Path, Dict[str, Any]]] = None,
+        use_mirror: bool = False,
+        sparse: Tuple[str, ...] = (),
+    ) -> Dict[str, Any]:
+        """Sync one repository and build its result dictionary.
+
+        Args:
+            repo_url: Git repository URL
+            target_dir: Directory where repositories are stored
+            branch: Branch to sync (if None, auto-detect default branch)
+            fetch_first: Use the fetch-first, fast-forward-only strategy
+            remote_heads: Heads collected by ``_probe_remote_heads``, keyed by repository path
+            use_mirror: Fetch from the local mirror instead of the remote
+            sparse: Directories to check out in cone mode (empty for the whole tree)
 
         Returns:
-            Dictionary with clone results
+            Result dictionary for the repository
         """
-        logger.info(f"Cloning repositories for system: {system}")
+        repo_name = extract_repo_name(repo_url)
+        start = time.perf_counter()
+        try:
+            sync_info = await self._sync_repository(
+                repo_url,
+                target_dir,
+                branch,
+                fetch_first,
+                _lookup_head(remote_heads, target_dir, repo_name),
+                use_mirror,
+                sparse,
+            )
+            self._record_state(repo_url, target_dir, sync_info, time.perf_counter() - start)
+            logger.info(f"Successfully synced: {repo_name}")
+            return {
+                "name": repo_name,
+                "status": "success",
+                "url": repo_url,
+                "had_changes": sync_info.get("had_changes", False),
+                "action": sync_info.get("action", "synced")
+            }
+        except Exception as e:
+            self.state.record_result(
+                target_dir / repo_name, repo_url, "sync", time.perf_counter() - start, str(e)
+            )
+            logger.error(f"Failed to sync {repo_name}: {e}")
+            return {"name": repo_name, "status": "failed", "url": repo_url, "error": str(e)}
+
+    async def _clone_entry(
+        self,
+        system: str,
+        repo_url: str,
+        target_dir: Path,
+        branch: str | None,
+        clone_options: Optional[CloneOptions] = None,
+        use_mirror: bool = False,
+    ) -> Dict[str, Any]:
+        """Clone one repository and build its result dictionary.
+
+        Args:
+            system: System name the repository belongs to
+            repo_url: Git repository URL
+            target_dir: Directory where repositories are stored
+            branch: Branch to clone (if None, the system's branch for the repository, else
+                main)
+            clone_options: Clone options overriding the system's configuration
+            use_mirror: Clone from the local mirror instead of the remote
 
+        Returns:
+            Result dictionary for the repository
+        """
+        repo_name = extract_repo_name(repo_url)
+        start = time.perf_counter()
+        branch = self._repo_branch(system, repo_url, branch) or "main"
         try:
-            repo_list_file = self.config.get_repository_list_file(system)
-            service_repos_dir = self.config.get_service_repositories_dir(system)
-        except ValueError as e:
-            raise RepositorySyncError(str(e)) from e
+            options = self._clone_options(system, repo_url, clone_options)
+            await self._clone_repository(
+                repo_url,
+                target_dir,
+                branch,
+                options,
+                use_mirror,
+                self.registry.spec(system, repo_url).sparse,
+            )
+            self._record_state(
+                repo_url,
+                target_dir,
+                {
+                    "action": "cloned",
+                    "branch": branch,
+                    "commit": await self.git.rev_parse(target_dir / repo_name, "HEAD"),
+                },
+                time.perf_counter() - start,
+            )
+            logger.info(f"Successfully cloned: {repo_name}")
+            return {"name": repo_name, "status": "success", "url": repo_url}
+        except Exception as e:
+            self.state.record_result(
+                target_dir / repo_name, repo_url, "clone", time.perf_counter() - start, str(e)
+            )
+            logger.error(f"Failed to clone {repo_name}: {e}")
+            return {"name": repo_name, "status": "failed", "url": repo_url, "error": str(e)}
+
+    async def _update_entry(
+        self,
+        system: str,
+        repo_url: str,
+        target_dir: Path,
+        branch: str | None,
+        fetch_first: bool = False,
+        remote_heads: Optional[Dict[Path, Dict[str, Any]]] = None,
+        clone_options: Optional[CloneOptions] = None,
+        use_mirror: bool = False,
+    ) -> Dict[str, Any]:
+        """Update one repository and build its result dictionary.
 
-        repos = read_repository_list(repo_list_file)
+        Args:
+            system: System name the repository belongs to
+            repo_url: Git repository URL
+            target_dir: Directory where repositories are stored
+            branch: Branch to update (if None, auto-detect for existing repos)
+            fetch_first: Use the fetch-first, fast-forward-only strategy for existing repos
+            remote_heads: Heads collected by ``_probe_remote_heads``, keyed by repository path
+            clone_options: Clone options overriding the system's configuration
+            use_mirror: Fetch or clone from the local mirror instead of the remote
 
-        if not repos:
-            logger.warning(f"No repositories found in {repo_list_file}")
-            return {"system": system, "cloned": 0, "failed": 0, "repos": []}
+        Returns:
+            Result dictionary for the repository
+        """
+        repo_name = extract_repo_name(repo_url)
+        start = time.perf_counter()
+        try:
+            update_info = await self._update_repository(
+                repo_url,
+                target_dir,
+                self._repo_branch(system, repo_url, branch),
+                fetch_first,
+                _lookup_head(remote_heads, target_dir, repo_name),
+                self._clone_options(system, repo_url, clone_options),
+                use_mirror,
+                self.registry.spec(system, repo_url).sparse,
+            )
+            if update_info.get("action") == "cloned":
+                update_info["commit"] = await self.git.rev_parse(target_dir / repo_name, "HEAD")
+            self._record_state(repo_url, target_dir, update_info, time.perf_counter() - start)
+            logger.info(f"Successfully updated: {repo_name}")
+            return {
+                "name": repo_name,
+                "status": "success",
+                "url": repo_url,
+                "had_changes": update_info.get("had_changes", False),
+                "action": update_info.get("action", "updated")
+            }
+        except Exception as e:
+            self.state.record_result(
+                target_dir / repo_name, repo_url, "update", time.perf_counter() - start, str(e)
+            )
+            logger.error(f"Failed to update {repo_name}: {e}")
+            return {"name": repo_name, "status": "failed", "url": repo_url, "error": str(e)}
 
-        results = {"system": system, "cloned": 0, "failed": 0, "repos": []}
+    async def _mirror_entry(
+        self, repo_url: str, updates: Dict[str, asyncio.Task[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Create or refresh the mirror of one repository and build its result dictionary.
 
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            for repo_url in repos:
-                repo_name = extract_repo_name(repo_url)
-                task = progress.add_task(f"Cloning {repo_name}...", total=None)
+        A URL listed under several systems is fetched once; later entries share the result.
 
-                try:
-                    self._clone_repository(repo_url, service_repos_dir, branch)
-                    results["cloned"] += 1
-                    results["repos"].append({"name": repo_name, "status": "success", "url": repo_url})
-                    logger.info(f"Successfully cloned: {repo_name}")
-                except Exception as e:
-                    results["failed"] += 1
-                    results["repos"].append(
-                        {"name": repo_name, "status": "failed", "url": repo_url, "error": str(e)}
-                    )
-                    logger.error(f"Failed to clone {repo_name}: {e}")
-                finally:
-                    progress.remove_task(task)
+        Args:
+            repo_url: Git repository URL
+            updates: Mirror update tasks of this run, keyed by URL
+
+        Returns:
+            Result dictionary for the repository
+        """
+        repo_name = extract_repo_name(repo_url)
+        if repo_url not in updates:
+            updates[repo_url] = asyncio.ensure_future(self.mirrors.update(repo_url))
+        try:
+            mirror_info = await updates[repo_url]
+            logger.info(f"Successfully {mirror_info['action']} mirror: {repo_name}")
+            return {
+                "name": repo_name,
+                "status": "success",
+                "url": repo_url,
+                "had_changes": mirror_info["had_changes"],
+                "action": mirror_info["action"],
+                "path": str(mirror_info["path"]),
+            }
+        except Exception as e:
+            logger.error(f"Failed to mirror {repo_name}: {e}")
+            return {"name": repo_name, "status": "failed", "url": repo_url, "error": str(e)}
+
+    async def _refresh_mirrors(self, work: List[Tuple[str, str, Path]]) -> None:
+        """Bring the mirror of every distinct URL in ``work`` up to date.
+
+        This is the only network access of a mirror-backed run. A URL whose mirror cannot
+        be refreshed is logged and later fetched from its remote as usual (or from a stale
+        mirror, if one exists).
+
+        Args:
+            work: List of (system, repository URL, target directory) tuples
+        """
+        start = time.perf_counter()
+        urls = sorted({repo_url for _, repo_url, _ in work})
+
+        async def refresh(repo_url: str) -> bool:
+            try:
+                return bool((await self.mirrors.update(repo_url))["had_changes"])
+            except GitCommandError as e:
+                logger.warning(f"Failed to refresh mirror for {extract_repo_name(repo_url)}: {e}")
+                return False
+
+        changed = sum(await asyncio.gather(*(refresh(repo_url) for repo_url in urls)))
+        elapsed = time.perf_counter() - start
+        logger.info(f"Refreshed {len(urls)} mirrors in {elapsed:.2f}s: {changed} changed")
+
+    def _prepare_run(
+        self,
+        branch: str | None,
+        fetch_first: bool,
+        use_mirror: bool,
+        remote_heads: Dict[Path, Dict[str, Any]],
+    ) -> Optional[Callable[[List[Tuple[str, str, Path]]], Awaitable[None]]]:
+        """Build the ``prepare`` step of a run from its options.
+
+        Args:
+            branch: Branch to probe (if None, each repository's default branch)
+            fetch_first: Probe remote heads into ``remote_heads``
+            use_mirror: Refresh the mirrors first, then probe them instead of the remotes
+            remote_heads: Dictionary filled by ``_probe_remote_heads``
+
+        Returns:
+            Coroutine function to run before the operations, or None if nothing to prepare
+        """
+        if not fetch_first and not use_mirror:
+            return None
+
+        async def prepare(work: List[Tuple[str, str, Path]]) -> None:
+            if use_mirror:
+                with self.profiler.phase("mirror"):
+                    await self._refresh_mirrors(work)
+            if fetch_first:
+                with self.profiler.phase("probe"):
+                    await self._probe_remote_heads(work, branch, remote_heads, use_mirror)
+
+        return prepare
+
+    async def network(
+        self,
+        remote: Optional[str],
+        operation: Callable[[], Awaitable[GitResult]],
+        kind: str = "git",
+    ) -> GitResult:
+        """Run a git command that contacts a remote through the per-host scheduler.
+
+        Args:
+            remote: URL the command contacts (None if it reads a local mirror instead)
+            operation: Coroutine function running the command (called once per attempt)
+            kind: Git subcommand (e.g. "fetch"), for the host's latency baseline
+
+        Returns:
+            Result of the command
+
+        Raises:
+            GitCommandError: If the command fails permanently or runs out of retries
+        """
+        if remote is None:
+            return await operation()
+        return await self.hosts.run(remote, operation, kind)
+
+    async def _run_with_progress(
+        self, *args: str, cwd: Optional[Path] = None, remote: Optional[str] = None
+    ) -> None:
+        """Run a git transfer command, feeding its progress to the live display if shown.
+
+        ``--progress`` is inserted after the subcommand (the first argument that is not a
+        ``-c`` option). Progress lines are left out of the error of a failed command.
+
+        Args:
+            *args: Arguments passed to git
+            cwd: Working directory for the command
+            remote: URL the command contacts, for per-host scheduling (None if local)
+
+        Raises:
+            GitCommandError: If the command fails
+        """
+        index = 0
+        while args[index] == "-c":
+            index += 2
+        subcommand = args[index]
+
+        handler = git_progress_handler()
+        if handler is None:
+            await self.network(remote, lambda: self.git.run(*args, cwd=cwd), subcommand)
+            return
+
+        args = (*args[: index + 1], "--progress", *args[index + 1:])
+
+        async def run() -> GitResult:
+            try:
+                return await self.git.run(*args, cwd=cwd, progress=handler)
+            except GitCommandError as e:
+                raise GitCommandError(
+                    e.command[1:], e.returncode, strip_git_progress(e.stderr)
+                ) from None
+
+        await self.network(remote, run, subcommand)
+
+    def source_args(self, repo_url: str, use_mirror: bool) -> List[str]:
+        """Get the git options that select where a repository is fetched from.
+
+        Args:
+            repo_url: Git repository URL
+            use_mirror: Fetch from the local mirror instead of the remote
 
+        Returns:
+            List of git options placed before the subcommand
+        """
+        return self.mirrors.source_args(repo_url) if use_mirror else []
+
+    def _run_systems(
+        self,
+        systems: List[str],
+        operation: Callable[[str, str, Path], Awaitable[Dict[str, Any]]],
+        description: str,
+        counter: str,
+        jobs: int | None = None,
+        prepare: Optional[Callable[[List[Tuple[str, str, Path]]], Awaitable[None]]] = None,
+        priority: Optional[Callable[[str, str, Path], Any]] = None,
+    ) -> Dict[str, Any]:
+        """Run a per-repository operation across one or more systems in a single worker pool.
+
+        Args:
+            systems: System names to process
+            operation: Coroutine function returning the result dictionary for one repository
+            description: Progress description prefix (e.g. "Syncing")
+            counter: Name of the success counter key (synced, cloned, updated)
+            jobs: Maximum number of concurrent operations (default: CPU count)
+            prepare: Coroutine function run once over all repositories before any operation
+            priority: Sort key of a work item; operations start in ascending key order
+
+        Returns:
+            Dictionary with per-system results plus wall-clock and serial timings
+        """
+        work: List[Tuple[str, str, Path]] = []
+        errors = {}
+
+        for system in systems:
+            logger.info(f"Processing system: {system}")
+            try:
+                repos, service_repos_dir = self.get_system_repositories(system)
+            except RepositorySyncError as e:
+                logger.error(f"Failed to load system {system}: {e}")
+                errors[system] = str(e)
+                continue
+            work.extend((system, repo_url, service_repos_dir) for repo_url in repos)
+
+        repo_results, elapsed, serial_elapsed = self._run_repositories(
+            work, operation, description, jobs, prepare, priority
+        )
+        system_results = self._group_results(systems, work, repo_results, counter)
+
+        for system_result in system_results:
+            if system_result["system"] in errors:
+                system_result["error"] = errors[system_result["system"]]
+
+        return {
+            "systems": system_results,
+            "elapsed": elapsed,
+            "serial_elapsed": serial_elapsed,
+            "run_phases": self.profiler.run_phases(),
+            "hosts": self.hosts.report(),
+        }
+
+    def _run_system(
+        self,
+        system: str,
+        operation: Callable[[str, str, Path], Awaitable[Dict[str, Any]]],
+        description: str,
+        counter: str,
+        jobs: int | None = None,
+        prepare: Optional[Callable[[List[Tuple[str, str, Path]]], Awaitable[None]]] = None,
+        priority: Optional[Callable[[str, str, Path], Any]] = None,
+    ) -> Dict[str, Any]:
+        """Run a per-repository operation for a single system.
+
+        Args:
+            system: System name (thk, man-oms, GCP)
+            operation: Coroutine function returning the result dictionary for one repository
+            description: Progress description prefix (e.g. "Syncing")
+            counter: Name of the success counter key (synced, cloned, updated)
+            jobs: Maximum number of concurrent operations (default: CPU count)
+            prepare: Coroutine function run once over all repositories before any operation
+            priority: Sort key of a work item; operations start in ascending key order
+
+        Returns:
+            Dictionary with system results plus wall-clock and serial timings
+
+        Raises:
+            RepositorySyncError: If the system is not configured correctly
+        """
+        repos, service_repos_dir = self.get_system_repositories(system)
+        work = [(system, repo_url, service_repos_dir) for repo_url in repos]
+
+        repo_results, elapsed, serial_elapsed = self._run_repositories(
+            work, operation, description, jobs, prepare, priority
+        )
+        results = self._group_results([system], work, repo_results, counter)[0]
+        results["elapsed"] = elapsed
+        results["serial_elapsed"] = serial_elapsed
+        results["run_phases"] = self.profiler.run_phases()
+        results["hosts"] = self.hosts.report()
         return results
 
-    def update_system(self, system: str, branch: str | None = None) -> dict:
-        """Update all repositories for a system (clone if doesn't exist, sync if it does).
+    def sync_system(
+        self,
+        system: str,
+        branch: str | None = None,
+        jobs: int | None = None,
+        fetch_first: bool = False,
+        use_mirror: bool | None = None,
+    ) -> Dict[str, Any]:
+        """Sync all repositories for a system.
 
         Args:
             system: System name (thk, man-oms, GCP)
-            branch: Branch to update (default: None, which auto-detects the default branch)
+            branch: Branch to sync (default: None, which auto-detects the default branch)
+            jobs: Maximum number of concurrent syncs (default: CPU count)
+            fetch_first: Probe every remote head up front, skip repositories whose remote
+                head matches the local branch and only fast-forward the others
+            use_mirror: Refresh the local mirrors once, then fetch from them instead of
+                the remotes (default: configuration)
 
         Returns:
-            Dictionary with update results
+            Dictionary with sync results
         """
-        logger.info(f"Updating repositories for system: {system}")
+        logger.info(f"Syncing repositories for system: {system}")
 
-        try:
-            repo_list_file = self.config.get_repository_list_file(system)
-            service_repos_dir = self.config.get_service_repositories_dir(system)
-        except ValueError as e:
-            raise RepositorySyncError(str(e)) from e
+        use_mirror = self.config.use_mirror if use_mirror is None else use_mirror
+        remote_heads: Dict[Path, Dict[str, Any]] = {}
+        return self._run_system(
+            system,
+            lambda system, repo_url, target_dir: self._sync_entry(
+                repo_url,
+                target_dir,
+                self._repo_branch(system, repo_url, branch),
+                fetch_first,
+                remote_heads,
+                use_mirror,
+                self.registry.spec(system, repo_url).sparse,
+            ),
+            "Syncing",
+            "synced",
+            jobs,
+            self._prepare_run(branch, fetch_first, use_mirror, remote_heads),
+        )
+
+    def clone_system(
+        self,
+        system: str,
+        branch: str | None = None,
+        jobs: int | None = None,
+        clone_options: Optional[CloneOptions] = None,
+        use_mirror: bool | None = None,
+    ) -> Dict[str, Any]:
+        """Clone all repositories for a system.
 
-        repos = read_repository_list(repo_list_file)
+        Args:
+            system: System name (thk, man-oms, GCP)
+            branch: Branch to clone (default: each repository's branch in ``system.yaml``,
+                else main)
+            jobs: Maximum number of concurrent clones (default: CPU count)
+            clone_options: Clone options overriding the system's configuration
+            use_mirror: Refresh the local mirrors once, then clone from them instead of
+                the remotes (default: configuration)
 
-        if not repos:
-            logger.warning(f"No repositories found in {repo_list_file}")
-            return {"system": system, "updated": 0, "failed": 0, "repos": []}
+        Returns:
+            Dictionary with clone results
+        """
+        logger.info(f"Cloning repositories for system: {system}")
 
-        results = {"system": system, "updated": 0, "failed": 0, "repos": []}
+        use_mirror = self.config.use_mirror if use_mirror is None else use_mirror
+        return self._run_system(
+            system,
+            lambda system, repo_url, target_dir: self._clone_entry(
+                system, repo_url, target_dir, branch, clone_options, use_mirror
+            ),
+            "Cloning",
+            "cloned",
+            jobs,
+            self._prepare_run(branch, False, use_mirror, {}),
+        )
+
+    def update_system(
+        self,
+        system: str,
+        branch: str | None = None,
+        jobs: int | None = None,
+        fetch_first: bool = False,
+        clone_options: Optional[CloneOptions] = None,
+        use_mirror: bool | None = None,
+    ) -> Dict[str, Any]:
+        """Update all repositories for a system (clone if doesn't exist, sync if it does).
 
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            for repo_url in repos:
-                repo_name = extract_repo_name(repo_url)
-                task = progress.add_task(f"Updating {repo_name}...", total=None)
+        The update is planned first (see ``plan_update``): missing repositories are cloned
+        first, the slowest expected updates start next, and conflicting repositories (detached,
+        diverged or dirty on another branch) are reported as failures without being touched.
 
-                try:
-                    update_info = self._update_repository(repo_url, service_repos_dir, branch)
-                    results["updated"] += 1
-                    results["repos"].append({
-                        "name": repo_name,
-                        "status": "success",
-                        "url": repo_url,
-                        "had_changes": update_info.get("had_changes", False),
-                        "action": update_info.get("action", "updated")
-                    })
-                    logger.info(f"Successfully updated: {repo_name}")
-                except Exception as e:
-                    results["failed"] += 1
-                    results["repos"].append(
-                        {"name": repo_name, "status": "failed", "url": repo_url, "error": str(e)}
-                    )
-                    logger.error(f"Failed to update {repo_name}: {e}")
-                finally:
-                    progress.remove_task(task)
+        Args:
+            system: System name (thk, man-oms, GCP)
+            branch: Branch to update (default: None, which auto-detects the default branch)
+            jobs: Maximum number of concurrent updates (default: CPU count)
+            fetch_first: Probe every remote head up front, skip repositories whose remote
+                head matches the local branch and only fast-forward the others
+            clone_options: Clone options for missing repositories, overriding the system's
+                configuration
+            use_mirror: Refresh the local mirrors once, then fetch and clone from them
+                instead of the remotes (default: configuration)
 
-        return results
+        Returns:
+            Dictionary with update results
+        """
+        logger.info(f"Updating repositories for system: {system}")
+
+        operation, prepare, priority = self._planned_update(
+            [system], branch, fetch_first, clone_options, use_mirror
+        )
+        return self._run_system(system, operation, "Updating", "updated", jobs, prepare, priority)
 
-    def _sync_repository(self, repo_url: str, target_dir: Path, branch: str | None = None) -> dict:
+    def mirror_system(self, system: str, jobs: int | None = None) -> Dict[str, Any]:
+        """Create or refresh the local mirror of every repository of a system.
+
+        Args:
+            system: System name (thk, man-oms, GCP)
+            jobs: Maximum number of concurrent mirror updates (default: CPU count)
+
+        Returns:
+            Dictionary with mirror results
+        """
+        logger.info(f"Mirroring repositories for system: {system}")
+
+        updates: Dict[str, asyncio.Task[Dict[str, Any]]] = {}
+        return self._run_system(
+            system,
+            lambda _, repo_url, __: self._mirror_entry(repo_url, updates),
+            "Mirroring",
+            "mirrored",
+            jobs,
+        )
+
+    async def _sync_repository(
+        self,
+        repo_url: str,
+        target_dir: Path,
+        branch: str | None = None,
+        fetch_first: bool = False,
+        remote_head: Optional[Dict[str, Any]] = None,
+        use_mirror: bool = False,
+        sparse: Tuple[str, ...] = (),
+    ) -> Dict[str, Any]:
         """Sync a single repository (only if it already exists).
 
+        The sparse checkout is brought in line with ``sparse`` first, so the merge only
+        checks out (and a partial clone only downloads) files of the listed directories.
+
         Args:
             repo_url: Git repository URL
             target_dir: Directory where repositories are stored
             branch: Branch to sync (if None, auto-detect default branch)
+            fetch_first: Check the remote head before fetching and only fast-forward
+            remote_head: Probed ``{"branch", "remote"}`` head for this repository, if known
+            use_mirror: Fetch from the local mirror instead of the remote
+            sparse: Directories to check out in cone mode (empty for the whole tree)
 
         Returns:
             Dictionary with sync information including whether changes were pulled
@@ -254,46 +1012,288 @@ class RepositorySync:
                 f"Repository {repo_name} does not exist. Use 'clone' command to clone it first."
             )
 
+        source = self.source_args(repo_url, use_mirror)
+        remote = None if source else repo_url
+
         try:
+            await self._apply_sparse_checkout(repo_path, sparse, source, remote)
+
+            if fetch_first:
+                if remote_head is not None:
+                    if remote_head["local"] == remote_head["remote"]:
+                        logger.debug(f"{repo_name} matches probed remote head, skipping")
+                        return {
+                            "had_changes": False,
+                            "action": "synced",
+                            "branch": remote_head["branch"],
+                            "commit": remote_head["local"],
+                            "remote_commit": remote_head["remote"],
+                        }
+                    return await self._fast_forward_repository(
+                        repo_path, remote_head["branch"], remote_head["remote"], source, remote
+                    )
+                if branch is None:
+                    branch = await self._get_default_branch(repo_path)
+                    logger.debug(f"Auto-detected default branch: {branch}")
+                return await self._fast_forward_repository(
+                    repo_path, branch, source=source, remote=remote
+                )
+
             # Repository exists, pull latest changes
             logger.debug(f"Updating existing repository: {repo_name}")
-            repo = git.Repo(repo_path)
 
             # Store the current commit before pulling
-            current_commit = repo.head.commit.hexsha
+            with self.profiler.phase("open-repo"):
+                current_commit = await self.git.rev_parse(repo_path, "HEAD")
+                current_branch = await self.git.current_branch(repo_path)
 
             # Auto-detect default branch if not specified
             if branch is None:
-                branch = self._get_default_branch(repo)
+                branch = await self._get_default_branch(repo_path)
                 logger.debug(f"Auto-detected default branch: {branch}")
 
             # Ensure we're on the correct branch
-            if repo.active_branch.name != branch:
+            if current_branch != branch:
                 logger.debug(f"Checking out branch: {branch}")
-                repo.git.checkout(branch)
-
-            # Pull latest changes
-            origin = repo.remotes.origin
-            pull_info = origin.pull(branch)
+                with self.profiler.phase("checkout"):
+                    await self.git.run("checkout", branch, cwd=repo_path)
+
+            # Pull latest changes: fetch, then pull from the local repository so the
+            # merge (or rebase, per pull.rebase) is timed separately from the network
+            with self.profiler.phase("fetch"):
+                await self._run_with_progress(
+                    *source,
+                    "fetch",
+                    "origin",
+                    f"+refs/heads/{branch}:refs/remotes/origin/{branch}",
+                    cwd=repo_path,
+                    remote=remote,
+                )
+            with self.profiler.phase("merge"):
+                # A partial clone fetches the blobs it checks out from the same source
+                await self.git.run(
+                    *source,
+                    "pull",
+                    "--quiet",
+                    ".",
+                    f"refs/remotes/origin/{branch}",
+                    cwd=repo_path,
+                )
 
             # Check if changes were pulled
-            new_commit = repo.head.commit.hexsha
+            new_commit = await self.git.rev_parse(repo_path, "HEAD")
             had_changes = current_commit != new_commit
 
-            return {"had_changes": had_changes, "action": "synced"}
+            return {"had_changes": had_changes, "action": "synced", "branch": branch, "commit": new_commit}
 
-        except git.GitCommandError as e:
+        except RepositorySyncError:
+            raise
+        except GitCommandError as e:
             raise RepositorySyncError(f"Git operation failed for {repo_name}: {e}") from e
         except Exception as e:
             raise RepositorySyncError(f"Unexpected error syncing {repo_name}: {e}") from e
 
-    def _clone_repository(self, repo_url: str, target_dir: Path, branch: str) -> None:
+    async def _probe_remote_heads(
+        self,
+        work: List[Tuple[str, str, Path]],
+        branch: str | None,
+        remote_heads: Dict[Path, Dict[str, Any]],
+        use_mirror: bool = False,
+        remember: bool = True,
+    ) -> None:
+        """Read remote heads for every existing repository in one concurrent ``ls-remote`` sweep.
+
+        Local branch heads are read first (no network); then each distinct URL is probed once
+        for all branches tracked from it. Repositories whose remote head already matches the
+        local branch can then be reported up to date without fetching.
+
+        Args:
+            work: List of (system, repository URL, target directory) tuples
+            branch: Branch to probe (if None, each repository's configured or default branch)
+            remote_heads: Dictionary filled with ``{"url", "branch", "local", "remote"}``
+                entries keyed by repository path
+            use_mirror: Probe the local mirrors instead of the remotes
+            remember: Cache detected default branches in the state store (off for dry runs)
+        """
+        start = time.perf_counter()
+
+        async def read_local(system: str, repo_url: str, repo_path: Path) -> None:
+            repo_branch = self._repo_branch(system, repo_url, branch)
+            if not repo_branch:
+                # Attributed to the repository, not to the run's probe phase
+                with self.profiler.repository(system, repo_path.name):
+                    repo_branch = await self._get_default_branch(repo_path, remember)
+            remote_heads[repo_path] = {
+                "url": repo_url,
+                "branch": repo_branch,
+                "local": await self._read_local_head(repo_path, repo_branch),
+                "remote": None,
+            }
+
+        await asyncio.gather(
+            *(
+                read_local(system, repo_url, target_dir / extract_repo_name(repo_url))
+                for system, repo_url, target_dir in work
+                if (target_dir / extract_repo_name(repo_url)).exists()
+            )
+        )
+
+        branches_by_url: Dict[str, Set[str]] = {}
+        for head in remote_heads.values():
+            branches_by_url.setdefault(head["url"], set()).add(head["branch"])
+
+        remote_shas: Dict[Tuple[str, str], str] = {}
+
+        async def ls_remote(repo_url: str, url_branches: Set[str]) -> None:
+            source = self.source_args(repo_url, use_mirror)
+            try:
+                result = await self.network(
+                    None if source else repo_url,
+                    lambda: self.git.run(
+                        *source,
+                        "ls-remote",
+                        repo_url,
+                        *(f"refs/heads/{name}" for name in sorted(url_branches)),
+                    ),
+                    "ls-remote",
+                )
+            except GitCommandError as e:
+                logger.debug(f"ls-remote failed for {repo_url}: {e.stderr.strip()}")
+                return
+            for line in result.stdout.splitlines():
+                sha, _, ref = line.partition("\t")
+                remote_shas[(repo_url, ref.replace("refs/heads/", "", 1))] = sha
+
+        await asyncio.gather(
+            *(ls_remote(repo_url, url_branches) for repo_url, url_branches in branches_by_url.items())
+        )
+
+        for head in remote_heads.values():
+            head["remote"] = remote_shas.get((head["url"], head["branch"]))
+
+        changed = sum(1 for head in remote_heads.values() if head["remote"] != head["local"])
+        logger.info(
+            f"Probed {len(branches_by_url)} remotes in {time.perf_counter() - start:.2f}s: "
+            f"{changed} of {len(remote_heads)} repositories need a fetch"
+        )
+
+    async def _fast_forward_repository(
+        self,
+        repo_path: Path,
+        branch: str,
+        remote_commit: Optional[str] = None,
+        source: Optional[List[str]] = None,
+        remote: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Bring a local branch up to date without merging or checking out.
+
+        The remote head is read with ``ls-remote`` first; when it matches the local branch
+        nothing else runs. Otherwise only the tracked ref is fetched and the local branch is
+        fast-forwarded (``merge --ff-only`` if it is checked out, ``update-ref`` if not).
+
+        Args:
+            repo_path: Path to the repository
+            branch: Branch to bring up to date
+            remote_commit: Remote head already probed for ``branch`` (skips ``ls-remote``)
+            source: Git options selecting the fetch source (see ``source_args``)
+            remote: URL contacted by ``ls-remote`` and ``fetch``, for per-host scheduling
+                (None when fetching from a local mirror)
+
+        Returns:
+            Dictionary with sync information including whether changes were pulled
+
+        Raises:
+            RepositorySyncError: If the branch is missing on the remote or has diverged
+        """
+        source = source or []
+        with self.profiler.phase("open-repo"):
+            local_commit = await self.git.rev_parse(repo_path, f"refs/heads/{branch}")
+
+        if remote_commit is None:
+            with self.profiler.phase("ls-remote"):
+                ls_remote = await self.network(
+                    remote,
+                    lambda: self.git.run(
+                        *source, "ls-remote", "origin", f"refs/heads/{branch}", cwd=repo_path
+                    ),
+                    "ls-remote",
+                )
+            remote_commit = ls_remote.stdout.split("\t", 1)[0].strip() or None
+        if remote_commit is None:
+            raise RepositorySyncError(f"Branch {branch} not found on origin")
+
+        synced = {
+            "action": "synced",
+            "branch": branch,
+            "commit": remote_commit,
+            "remote_commit": remote_commit,
+        }
+
+        if remote_commit == local_commit:
+            logger.debug(f"{repo_path.name} is up to date with origin/{branch}, skipping fetch")
+            return {"had_changes": False, **synced}
+
+        with self.profiler.phase("fetch"):
+            await self._run_with_progress(
+                *source,
+                "fetch",
+                "--no-tags",
+                "origin",
+                f"+refs/heads/{branch}:refs/remotes/origin/{branch}",
+                cwd=repo_path,
+                remote=remote,
+            )
+
+        with self.profiler.phase("merge"):
+            if local_commit is None:
+                logger.debug(f"Creating local branch {branch} from origin/{branch}")
+                await self.git.run("branch", "--track", branch, f"origin/{branch}", cwd=repo_path)
+                return {"had_changes": True, **synced}
+
+            is_ancestor = await self.git.run(
+                "merge-base", "--is-ancestor", local_commit, remote_commit,
+                cwd=repo_path, check=False,
+            )
+            if is_ancestor.returncode != 0:
+                raise RepositorySyncError(
+                    f"Branch {branch} has diverged from origin/{branch}; cannot fast-forward"
+                )
+
+            if await self.git.current_branch(repo_path) == branch:
+                # A partial clone fetches the blobs it checks out from the same source
+                await self.git.run(
+                    *source, "merge", "--ff-only", "--quiet", remote_commit, cwd=repo_path
+                )
+            else:
+                await self.git.run(
+                    "update-ref", f"refs/heads/{branch}", remote_commit, local_commit, cwd=repo_path
+                )
+
+        return {"had_changes": True, **synced}
+
+    async def _clone_repository(
+        self,
+        repo_url: str,
+        target_dir: Path,
+        branch: str,
+        options: Optional[CloneOptions] = None,
+        use_mirror: bool = False,
+        sparse: Tuple[str, ...] = (),
+    ) -> None:
         """Clone a single repository (only if it doesn't already exist).
 
+        With ``sparse`` directories the clone is also partial (``--filter=blob:none``
+        unless another filter is set), so only the blobs of those directories and of the
+        top-level files are ever downloaded.
+
         Args:
             repo_url: Git repository URL
             target_dir: Directory where repositories are stored
             branch: Branch to clone
+            options: Shallow, partial or single-branch clone options
+            use_mirror: Clone from the local mirror (the remote URL is still recorded
+                as ``origin``)
+            sparse: Directories to check out in cone mode (empty for the whole tree)
 
         Raises:
             RepositorySyncError: If clone fails or repository already exists
@@ -309,27 +1309,148 @@ class RepositorySync:
         try:
             # Repository doesn't exist, clone it
             logger.debug(f"Cloning new repository: {repo_name}")
-            git.Repo.clone_from(
-                repo_url,
-                repo_path,
-                branch=branch,
-                env={"GIT_SSH_COMMAND": self.config.git_ssh_command}
-                if self.config.git_ssh_command
-                else None,
-            )
+            clone_args = options.git_args() if options else []
+            if sparse:
+                # Check out only the top-level files until the cone is set below
+                clone_args.append("--sparse")
+                if not (options and options.filter):
+                    clone_args.append("--filter=blob:none")
+            if options and options.reference:
+                # A mirror-backed run has already refreshed the mirror
+                with self.profiler.phase("mirror"):
+                    clone_args += await self._reference_args(
+                        repo_url, options, refresh=not use_mirror
+                    )
+            source = self.source_args(repo_url, use_mirror)
+            with self.profiler.phase("clone"):
+                await self._run_with_progress(
+                    *source,
+                    "clone",
+                    "--branch",
+                    branch,
+                    *clone_args,
+                    "--",
+                    repo_url,
+                    str(repo_path),
+                    remote=None if source else repo_url,
+                )
+            if sparse:
+                await self._apply_sparse_checkout(
+                    repo_path, sparse, source, None if source else repo_url
+                )
 
-        except git.GitCommandError as e:
+        except GitCommandError as e:
             raise RepositorySyncError(f"Git operation failed for {repo_name}: {e}") from e
         except Exception as e:
             raise RepositorySyncError(f"Unexpected error cloning {repo_name}: {e}") from e
 
-    def _update_repository(self, repo_url: str, target_dir: Path, branch: str | None = None) -> dict:
+    async def _reference_args(
+        self, repo_url: str, options: CloneOptions, refresh: bool = True
+    ) -> List[str]:
+        """Build ``git clone`` arguments that borrow objects from the shared mirror cache.
+
+        Args:
+            repo_url: Git repository URL
+            options: Clone options (``dissociate`` is honoured)
+            refresh: Fetch new objects into an existing mirror first
+
+        Returns:
+            List of command-line arguments (empty if the mirror is unavailable)
+        """
+        try:
+            mirror_path = await self.mirrors.ensure(repo_url, refresh)
+        except GitCommandError as e:
+            logger.warning(
+                f"Mirror unavailable for {extract_repo_name(repo_url)}, cloning without it: {e}"
+            )
+            return []
+
+        args = ["--reference-if-able", str(mirror_path)]
+        if options.dissociate:
+            args.append("--dissociate")
+        return args
+
+    async def _apply_sparse_checkout(
+        self,
+        repo_path: Path,
+        sparse: Tuple[str, ...],
+        source: Optional[List[str]] = None,
+        remote: Optional[str] = None,
+    ) -> bool:
+        """Make the cone-mode sparse checkout of a repository match its manifest.
+
+        Repositories without sparse directories and without a sparse-checkout file are left
+        alone without running git. A sparse checkout set up by hand (not marked with
+        ``pkm.sparseCheckout``) is only replaced when the manifest lists directories.
+
+        Args:
+            repo_path: Path to the repository
+            sparse: Directories to check out (empty for the whole tree)
+            source: Git options selecting where missing blobs are fetched from
+            remote: URL missing blobs are fetched from, for per-host scheduling (None if local)
+
+        Returns:
+            True if the checked-out directories changed
+
+        Raises:
+            GitCommandError: If a git command fails
+        """
+        if not sparse and not (repo_path / ".git" / "info" / "sparse-checkout").exists():
+            return False
+
+        source = source or []
+        with self.profiler.phase("sparse"):
+            if not sparse:
+                marked = await self.git.run(
+                    "config", "--bool", "pkm.sparseCheckout", cwd=repo_path, check=False
+                )
+                if marked.stdout.strip() != "true":
+                    return False
+                # Widening a partial clone fetches the blobs of the whole tree
+                await self.network(
+                    remote,
+                    lambda: self.git.run(*source, "sparse-checkout", "disable", cwd=repo_path),
+                    "sparse-checkout",
+                )
+                await self.git.run("config", "--unset", "pkm.sparseCheckout", cwd=repo_path)
+                return True
+
+            current = await self.git.run("sparse-checkout", "list", cwd=repo_path, check=False)
+            if current.returncode == 0 and set(current.stdout.split()) == set(sparse):
+                return False
+            # Only the blobs of newly included directories are fetched
+            await self.network(
+                remote,
+                lambda: self.git.run(
+                    *source, "sparse-checkout", "set", "--cone", "--", *sparse, cwd=repo_path
+                ),
+                "sparse-checkout",
+            )
+            await self.git.run("config", "pkm.sparseCheckout", "true", cwd=repo_path)
+            return True
+
+    async def _update_repository(
+        self,
+        repo_url: str,
+        target_dir: Path,
+        branch: str | None = None,
+        fetch_first: bool = False,
+        remote_head: Optional[Dict[str, Any]] = None,
+        clone_options: Optional[CloneOptions] = None,
+        use_mirror: bool = False,
+        sparse: Tuple[str, ...] = (),
+    ) -> Dict[str, Any]:
         """Update a repository (clone if doesn't exist, sync if it does).
 
         Args:
             repo_url: Git repository URL
             target_dir: Directory where repositories are stored
             branch: Branch to clone/sync (if None, auto-detect for existing repos)
+            fetch_first: Use the fetch-first, fast-forward-only strategy for existing repos
+            remote_head: Probed ``{"branch", "remote"}`` head for this repository, if known
+            clone_options: Shallow, partial or single-branch options used if it is cloned
+            use_mirror: Fetch or clone from the local mirror instead of the remote
+            sparse: Directories to check out in cone mode (empty for the whole tree)
 
         Returns:
             Dictionary with update information including action taken and whether changes occurred
@@ -340,131 +1461,648 @@ class RepositorySync:
         repo_name = extract_repo_name(repo_url)
         repo_path = target_dir / repo_name
 
-        if repo_path.exists():
-            # Repository exists, sync it
-            logger.debug(f"Repository {repo_name} exists, syncing...")
-            return self._sync_repository(repo_url, target_dir, branch)
-        else:
-            # Repository doesn't exist, clone it
-            logger.debug(f"Repository {repo_name} doesn't exist, cloning...")
-            # For cloning, we need a branch - use auto-detection logic if not specified
-            if branch is None:
-                # Check if we can determine the default branch from remote
-                # For now, we'll use 'main' as fallback for cloning
-                # Once cloned, sync operations will auto-detect
-                branch = "main"
-                logger.debug(f"No branch specified for clone, trying: {branch}")
-                try:
-                    self._clone_repository(repo_url, target_dir, branch)
-                except RepositorySyncError as e:
-                    # If 'main' doesn't work, try 'master'
-                    if "branch" in str(e).lower() or "pathspec" in str(e).lower():
-                        logger.debug(f"Branch {branch} failed, trying 'master'")
-                        branch = "master"
-                        # Clean up failed clone attempt if directory was created
-                        if repo_path.exists():
-                            import shutil
-                            shutil.rmtree(repo_path)
-                        self._clone_repository(repo_url, target_dir, branch)
-                    else:
-                        raise
-            else:
-                self._clone_repository(repo_url, target_dir, branch)
+        if repo_path.exists():
+            # Repository exists, sync it
+            logger.debug(f"Repository {repo_name} exists, syncing...")
+            return await self._sync_repository(
+                repo_url, target_dir, branch, fetch_first, remote_head, use_mirror, sparse
+            )
+        else:
+            # Repository doesn't exist, clone it
+            logger.debug(f"Repository {repo_name} doesn't exist, cloning...")
+            # For cloning, we need a branch - use auto-detection logic if not specified
+            if branch is None:
+                # Check if we can determine the default branch from remote
+                # For now, we'll use 'main' as fallback for cloning
+                # Once cloned, sync operations will auto-detect
+                branch = "main"
+                logger.debug(f"No branch specified for clone, trying: {branch}")
+                try:
+                    await self._clone_repository(
+                        repo_url, target_dir, branch, clone_options, use_mirror, sparse
+                    )
+                except RepositorySyncError as e:
+                    # If 'main' doesn't work, try 'master'
+                    if "branch" in str(e).lower() or "pathspec" in str(e).lower():
+                        logger.debug(f"Branch {branch} failed, trying 'master'")
+                        branch = "master"
+                        # Clean up failed clone attempt if directory was created
+                        if repo_path.exists():
+                            await asyncio.to_thread(shutil.rmtree, repo_path)
+                        await self._clone_repository(
+                            repo_url, target_dir, branch, clone_options, use_mirror, sparse
+                        )
+                    else:
+                        raise
+            else:
+                await self._clone_repository(
+                    repo_url, target_dir, branch, clone_options, use_mirror, sparse
+                )
+
+            return {"had_changes": True, "action": "cloned", "branch": branch}
+
+    async def _plan_repository(
+        self,
+        system: str,
+        repo_url: str,
+        target_dir: Path,
+        branch: str | None,
+        remote_head: Optional[Dict[str, Any]],
+        recorded: Dict[str, Dict[str, Any]],
+        fetch_first: bool,
+        dry_run: bool,
+    ) -> Dict[str, Any]:
+        """Decide what an update will do to one repository, using local checks only.
+
+        A branch that diverged from ``origin`` is merged, as ``update`` always did, unless
+        ``fetch_first`` allows fast-forwards only; then it is a conflict.
+
+        Args:
+            system: System name the repository belongs to
+            repo_url: Git repository URL
+            target_dir: Directory where repositories are stored
+            branch: Branch to update (if None, each repository's default branch)
+            remote_head: Probed ``{"branch", "local", "remote"}`` head, if known
+            recorded: Sync state entries keyed by repository path
+            fetch_first: The update only fast-forwards
+            dry_run: Leave the state store untouched (no default branch is cached)
+
+        Returns:
+            Plan entry with the ``action`` (clone, fast-forward, merge, skip, conflict), the
+            ``branch``, the manifest ``priority``, a ``reason`` and the ``expected_duration``
+            of the last run (or None)
+        """
+        repo_name = extract_repo_name(repo_url)
+        repo_path = target_dir / repo_name
+        entry = {
+            "system": system,
+            "name": repo_name,
+            "url": repo_url,
+            "path": repo_path,
+            "branch": branch,
+            "priority": self.registry.spec(system, repo_url).priority,
+            "expected_duration": recorded.get(str(repo_path), {}).get("last_duration"),
+        }
+
+        if not repo_path.exists():
+            return {**entry, "action": "clone", "reason": "not cloned yet"}
+
+        try:
+            summary = await self.git.status(repo_path)
+            if summary.branch is None:
+                return {**entry, "action": "conflict", "reason": "HEAD is detached"}
+
+            entry["branch"] = branch or await self._get_default_branch(
+                repo_path, remember=not dry_run
+            )
+            if summary.branch != entry["branch"] and summary.changed:
+                return {
+                    **entry,
+                    "action": "conflict",
+                    "reason": f"uncommitted changes on {summary.branch}",
+                }
+
+            # Compared with the last fetched state of the remote branch
+            counts = await self.git.ahead_behind(
+                repo_path, f"refs/heads/{entry['branch']}", f"refs/remotes/origin/{entry['branch']}"
+            )
+            if counts is not None and counts[0] and counts[1]:
+                return {
+                    **entry,
+                    "action": "conflict" if fetch_first else "merge",
+                    "reason": f"diverged from origin ({counts[0]} ahead, {counts[1]} behind)",
+                }
+        except (GitCommandError, RepositorySyncError) as e:
+            return {**entry, "action": "conflict", "reason": str(e)}
+
+        if remote_head is not None and remote_head["remote"] == remote_head["local"]:
+            return {**entry, "action": "skip", "reason": "matches remote head"}
+        return {**entry, "action": "fast-forward", "reason": ""}
+
+    async def _plan_entries(
+        self,
+        work: List[Tuple[str, str, Path]],
+        branch: str | None,
+        fetch_first: bool,
+        use_mirror: bool,
+        remote_heads: Dict[Path, Dict[str, Any]],
+        dry_run: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Classify every repository of an update concurrently.
+
+        With ``use_mirror`` the mirrors are refreshed first, so the ``fetch_first`` probe
+        reads them instead of the remotes. A dry run changes nothing: the probe reads the
+        mirrors as last refreshed and no default branch is cached.
+
+        Spans recorded while classifying a repository are attributed to it, so the run's
+        ``plan`` phase is the only run-level time spent classifying.
+
+        Args:
+            work: List of (system, repository URL, target directory) tuples
+            branch: Branch to update (if None, each repository's default branch)
+            fetch_first: Probe every remote head so unchanged repositories are planned as skips
+            use_mirror: Refresh the local mirrors, then probe them instead of the remotes
+            remote_heads: Dictionary filled by ``_probe_remote_heads``
+            dry_run: Plan without refreshing mirrors or writing the state store
+
+        Returns:
+            Plan entries in the order of ``work``
+        """
+        recorded: Dict[str, Dict[str, Any]] = {}
+        for directory in {target_dir for _, _, target_dir in work}:
+            recorded.update(
+                {entry["path"]: entry for entry in self.state.get_for_directory(directory)}
+            )
+
+        if use_mirror and not dry_run:
+            with self.profiler.phase("mirror"):
+                await self._refresh_mirrors(work)
+        if fetch_first:
+            with self.profiler.phase("probe"):
+                await self._probe_remote_heads(
+                    work, branch, remote_heads, use_mirror, remember=not dry_run
+                )
+
+        async def plan(system: str, repo_url: str, target_dir: Path) -> Dict[str, Any]:
+            repo_name = extract_repo_name(repo_url)
+            with self.profiler.repository(system, repo_name):
+                return await self._plan_repository(
+                    system,
+                    repo_url,
+                    target_dir,
+                    self._repo_branch(system, repo_url, branch),
+                    _lookup_head(remote_heads, target_dir, repo_name),
+                    recorded,
+                    fetch_first,
+                    dry_run,
+                )
+
+        with self.profiler.phase("plan"):
+            return list(await asyncio.gather(*(plan(*item) for item in work)))
+
+    def _order_plan(
+        self,
+        systems: List[str],
+        entries: List[Dict[str, Any]],
+        errors: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """Number plan entries in start order and group them per system.
+
+        Clones of missing repositories start first, then the longest expected operations
+        (from the durations recorded by earlier runs), so the slowest repositories do not
+        start last; skips and conflicts come at the end. Within each of these groups,
+        repositories start in the order of their manifest priority.
+
+        Args:
+            systems: System names, in display order
+            entries: Plan entries from ``_plan_entries``
+            errors: Load errors keyed by system name
+
+        Returns:
+            Plan with per-system ``repos`` entries and action ``counts``
+        """
+        # Repositories without history are expected to take as long as a typical one
+        known = sorted(
+            entry["expected_duration"]
+            for entry in entries
+            if entry["expected_duration"] is not None
+        )
+        typical = known[len(known) // 2] if known else 0.0
+
+        def start_order(entry: Dict[str, Any]) -> Tuple[int, int, float]:
+            expected = entry["expected_duration"]
+            rank = _PLAN_START_RANKS[entry["action"]]
+            expected = typical if expected is None else expected
+            return rank, PRIORITIES.index(entry["priority"]), -expected
+
+        for order, entry in enumerate(sorted(entries, key=start_order), start=1):
+            entry["order"] = order
+
+        grouped: Dict[str, Dict[str, Any]] = {
+            system: {"system": system, "repos": []} for system in systems
+        }
+        for entry in entries:
+            grouped[entry["system"]]["repos"].append(entry)
+        for system, error in (errors or {}).items():
+            grouped[system]["error"] = error
+
+        counts = dict.fromkeys(PLAN_ACTIONS, 0)
+        for entry in entries:
+            counts[entry["action"]] += 1
+        logger.info(
+            "Update plan: " + ", ".join(f"{count} {action}" for action, count in counts.items())
+        )
+
+        return {"systems": [grouped[system] for system in systems], "counts": counts}
+
+    def plan_update(
+        self,
+        system: str | None = None,
+        branch: str | None = None,
+        fetch_first: bool = False,
+        use_mirror: bool | None = None,
+    ) -> Dict[str, Any]:
+        """Plan an update without changing anything (``pkm update --dry-run``).
+
+        Neither repositories, mirrors nor the sync state store are written.
+
+        Args:
+            system: System name (default: all systems)
+            branch: Branch to update (default: None, which auto-detects the default branch)
+            fetch_first: Probe every remote head so unchanged repositories are planned as skips
+            use_mirror: Probe the local mirrors, as last refreshed, instead of the remotes
+                (default: configuration)
+
+        Returns:
+            Dictionary with per-system plan entries (in repository list order, numbered by
+            start ``order``) and the number of repositories per action
+        """
+        systems = self.registry.systems() if system is None else [system]
+        use_mirror = self.config.use_mirror if use_mirror is None else use_mirror
+
+        work: List[Tuple[str, str, Path]] = []
+        errors = {}
+        for name in systems:
+            try:
+                repos, service_repos_dir = self.get_system_repositories(name)
+            except RepositorySyncError as e:
+                errors[name] = str(e)
+                continue
+            work.extend((name, repo_url, service_repos_dir) for repo_url in repos)
+
+        # Only the probe contacts the remotes
+        ssh = self.ssh if fetch_first and not use_mirror else None
+
+        async def plan_all() -> List[Dict[str, Any]]:
+            if ssh is not None:
+                await ssh.connect([repo_url for _, repo_url, _ in work])
+            try:
+                return await self._plan_entries(
+                    work, branch, fetch_first, use_mirror, {}, dry_run=True
+                )
+            finally:
+                if ssh is not None:
+                    await ssh.disconnect()
+
+        return self._order_plan(systems, asyncio.run(plan_all()), errors)
+
+    async def _planned_update_entry(
+        self,
+        entry: Optional[Dict[str, Any]],
+        system: str,
+        repo_url: str,
+        target_dir: Path,
+        branch: str | None,
+        fetch_first: bool,
+        remote_heads: Dict[Path, Dict[str, Any]],
+        clone_options: Optional[CloneOptions],
+        use_mirror: bool,
+    ) -> Dict[str, Any]:
+        """Carry out the planned update of one repository.
+
+        Conflicts are reported without touching the repository; every other action goes
+        through ``_update_entry`` (a planned skip returns there without running git).
+
+        Args:
+            entry: Plan entry of the repository (None if it was not planned)
+            system: System name the repository belongs to
+            repo_url: Git repository URL
+            target_dir: Directory where repositories are stored
+            branch: Branch to update (if None, auto-detect for existing repos)
+            fetch_first: Use the fetch-first, fast-forward-only strategy for existing repos
+            remote_heads: Heads probed while planning, keyed by repository path
+            clone_options: Clone options overriding the system's configuration
+            use_mirror: Fetch or clone from the local mirror instead of the remote
+
+        Returns:
+            Result dictionary for the repository
+        """
+        if entry is not None and entry["action"] == "conflict":
+            logger.warning(f"Skipping {entry['name']}: {entry['reason']}")
+            return {
+                "name": entry["name"],
+                "status": "failed",
+                "url": repo_url,
+                "action": "conflict",
+                "error": entry["reason"],
+            }
+        return await self._update_entry(
+            system,
+            repo_url,
+            target_dir,
+            branch,
+            fetch_first,
+            remote_heads,
+            clone_options,
+            use_mirror,
+        )
+
+    def _planned_update(
+        self,
+        systems: List[str],
+        branch: str | None,
+        fetch_first: bool,
+        clone_options: Optional[CloneOptions],
+        use_mirror: bool | None,
+    ) -> Tuple[
+        Callable[[str, str, Path], Awaitable[Dict[str, Any]]],
+        Callable[[List[Tuple[str, str, Path]]], Awaitable[None]],
+        Callable[[str, str, Path], int],
+    ]:
+        """Build a run that plans an update of several systems, then carries it out.
+
+        The plan is made in the run's ``prepare`` step, so the mirror refresh and the
+        ``fetch_first`` probe share the run's SSH connections, scheduler statistics and
+        profile. The start priority is only read after ``prepare`` has finished.
+
+        Args:
+            systems: System names
+            branch: Branch to update (if None, auto-detect for existing repos)
+            fetch_first: Probe every remote head while planning and only fast-forward
+            clone_options: Clone options for missing repositories
+            use_mirror: Refresh the local mirrors once, then probe, fetch and clone from them
+
+        Returns:
+            Tuple of (per-repository operation, prepare step, start priority) for
+            ``_run_system`` or ``_run_systems``
+        """
+        use_mirror = self.config.use_mirror if use_mirror is None else use_mirror
+        remote_heads: Dict[Path, Dict[str, Any]] = {}
+        entries: Dict[Path, Dict[str, Any]] = {}
+
+        async def prepare(work: List[Tuple[str, str, Path]]) -> None:
+            planned_entries = await self._plan_entries(
+                work, branch, fetch_first, use_mirror, remote_heads
+            )
+            self._order_plan(systems, planned_entries)
+            entries.update((entry["path"], entry) for entry in planned_entries)
+
+        def planned(repo_url: str, target_dir: Path) -> Optional[Dict[str, Any]]:
+            return entries.get(target_dir / extract_repo_name(repo_url))
 
-            return {"had_changes": True, "action": "cloned"}
+        def operation(system: str, repo_url: str, target_dir: Path) -> Awaitable[Dict[str, Any]]:
+            return self._planned_update_entry(
+                planned(repo_url, target_dir),
+                system,
+                repo_url,
+                target_dir,
+                branch,
+                fetch_first,
+                remote_heads,
+                clone_options,
+                use_mirror,
+            )
+
+        def priority(_system: str, repo_url: str, target_dir: Path) -> int:
+            entry = planned(repo_url, target_dir)
+            return entry["order"] if entry is not None else len(entries) + 1
+
+        return operation, prepare, priority
 
-    def sync_all_systems(self, branch: str | None = None) -> dict:
+    def sync_all_systems(
+        self,
+        branch: str | None = None,
+        jobs: int | None = None,
+        fetch_first: bool = False,
+        use_mirror: bool | None = None,
+    ) -> Dict[str, Any]:
         """Sync repositories for all systems.
 
+        Repositories from every system share one worker pool, so a slow system does not
+        hold up the others.
+
         Args:
             branch: Branch to sync (default: None, which auto-detects the default branch)
+            jobs: Maximum number of concurrent syncs (default: CPU count)
+            fetch_first: Probe every remote head up front, skip repositories whose remote
+                head matches the local branch and only fast-forward the others
+            use_mirror: Refresh the local mirrors once, then fetch from them instead of
+                the remotes (default: configuration)
 
         Returns:
             Dictionary with sync results for all systems
         """
-        systems = self.config.list_systems()
+        systems = self.registry.systems()
 
         if not systems:
             logger.warning("No systems found")
             return {"systems": []}
 
-        results = {"systems": []}
-
-        for system in systems:
-            logger.info(f"Processing system: {system}")
-            try:
-                system_result = self.sync_system(system, branch)
-                results["systems"].append(system_result)
-            except RepositorySyncError as e:
-                logger.error(f"Failed to sync system {system}: {e}")
-                results["systems"].append(
-                    {"system": system, "synced": 0, "failed": 0, "repos": [], "error": str(e)}
-                )
-
-        return results
-
-    def clone_all_systems(self, branch: str = "main") -> dict:
+        use_mirror = self.config.use_mirror if use_mirror is None else use_mirror
+        remote_heads: Dict[Path, Dict[str, Any]] = {}
+        return self._run_systems(
+            systems,
+            lambda system, repo_url, target_dir: self._sync_entry(
+                repo_url,
+                target_dir,
+                self._repo_branch(system, repo_url, branch),
+                fetch_first,
+                remote_heads,
+                use_mirror,
+                self.registry.spec(system, repo_url).sparse,
+            ),
+            "Syncing",
+            "synced",
+            jobs,
+            self._prepare_run(branch, fetch_first, use_mirror, remote_heads),
+        )
+
+    def clone_all_systems(
+        self,
+        branch: str | None = None,
+        jobs: int | None = None,
+        clone_options: Optional[CloneOptions] = None,
+        use_mirror: bool | None = None,
+    ) -> Dict[str, Any]:
         """Clone repositories for all systems.
 
         Args:
-            branch: Branch to clone (default: main)
+            branch: Branch to clone (default: each repository's branch in ``system.yaml``,
+                else main)
+            jobs: Maximum number of concurrent clones (default: CPU count)
+            clone_options: Clone options overriding each system's configuration
+            use_mirror: Refresh the local mirrors once, then clone from them instead of
+                the remotes (default: configuration)
 
         Returns:
             Dictionary with clone results for all systems
         """
-        systems = self.config.list_systems()
+        systems = self.registry.systems()
 
         if not systems:
             logger.warning("No systems found")
             return {"systems": []}
 
-        results = {"systems": []}
-
-        for system in systems:
-            logger.info(f"Processing system: {system}")
-            try:
-                system_result = self.clone_system(system, branch)
-                results["systems"].append(system_result)
-            except RepositorySyncError as e:
-                logger.error(f"Failed to clone system {system}: {e}")
-                results["systems"].append(
-                    {"system": system, "cloned": 0, "failed": 0, "repos": [], "error": str(e)}
-                )
-
-        return results
-
-    def update_all_systems(self, branch: str | None = None) -> dict:
+        use_mirror = self.config.use_mirror if use_mirror is None else use_mirror
+        return self._run_systems(
+            systems,
+            lambda system, repo_url, target_dir: self._clone_entry(
+                system, repo_url, target_dir, branch, clone_options, use_mirror
+            ),
+            "Cloning",
+            "cloned",
+            jobs,
+            self._prepare_run(branch, False, use_mirror, {}),
+        )
+
+    def update_all_systems(
+        self,
+        branch: str | None = None,
+        jobs: int | None = None,
+        fetch_first: bool = False,
+        clone_options: Optional[CloneOptions] = None,
+        use_mirror: bool | None = None,
+    ) -> Dict[str, Any]:
         """Update repositories for all systems (clone if doesn't exist, sync if it does).
 
+        The update is planned first (see ``plan_update``): missing repositories are cloned
+        first, the slowest expected updates start next, and conflicting repositories (detached,
+        diverged or dirty on another branch) are reported as failures without being touched.
+
         Args:
             branch: Branch to update (default: None, which auto-detects the default branch)
+            jobs: Maximum number of concurrent updates (default: CPU count)
+            fetch_first: Probe every remote head up front, skip repositories whose remote
+                head matches the local branch and only fast-forward the others
+            clone_options: Clone options for missing repositories, overriding the system's
+                configuration
+            use_mirror: Refresh the local mirrors once, then fetch and clone from them
+                instead of the remotes (default: configuration)
 
         Returns:
             Dictionary with update results for all systems
         """
-        systems = self.config.list_systems()
+        systems = self.registry.systems()
+
+        if not systems:
+            logger.warning("No systems found")
+            return {"systems": []}
+
+        operation, prepare, priority = self._planned_update(
+            systems, branch, fetch_first, clone_options, use_mirror
+        )
+        return self._run_systems(systems, operation, "Updating", "updated", jobs, prepare, priority)
+
+    def mirror_all_systems(self, jobs: int | None = None) -> Dict[str, Any]:
+        """Create or refresh the local mirror of every repository of every system.
+
+        Each distinct URL is fetched once, however many systems list it.
+
+        Args:
+            jobs: Maximum number of concurrent mirror updates (default: CPU count)
+
+        Returns:
+            Dictionary with mirror results for all systems
+        """
+        systems = self.registry.systems()
 
         if not systems:
             logger.warning("No systems found")
             return {"systems": []}
 
-        results = {"systems": []}
+        updates: Dict[str, asyncio.Task[Dict[str, Any]]] = {}
+        return self._run_systems(
+            systems,
+            lambda _, repo_url, __: self._mirror_entry(repo_url, updates),
+            "Mirroring",
+            "mirrored",
+            jobs,
+        )
+
+    def _gather_repositories(
+        self, system: str, inspect: Callable[[str, Path], Awaitable[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """Inspect every repository of a system concurrently on one event loop.
+
+        Args:
+            system: System name (thk, man-oms, GCP)
+            inspect: Coroutine function returning the information dictionary for one repository
+
+        Returns:
+            List of information dictionaries, in repository list order
+
+        Raises:
+            RepositorySyncError: If the system is not configured correctly
+        """
+        return self._gather_systems([system], inspect)[system]
+
+    def _gather_systems(
+        self, systems: List[str], inspect: Callable[[str, Path], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Inspect every repository of several systems concurrently on one event loop.
+
+        Each information dictionary is passed to ``on_result`` as soon as it is ready.
 
+        Args:
+            systems: System names
+            inspect: Coroutine function returning the information dictionary for one repository
+
+        Returns:
+            Dictionary of system name to information dictionaries, in repository list order
+
+        Raises:
+            RepositorySyncError: If a system is not configured correctly
+        """
+        work: List[Tuple[str, str, Path]] = []
         for system in systems:
-            logger.info(f"Processing system: {system}")
-            try:
-                system_result = self.update_system(system, branch)
-                results["systems"].append(system_result)
-            except RepositorySyncError as e:
-                logger.error(f"Failed to update system {system}: {e}")
-                results["systems"].append(
-                    {"system": system, "updated": 0, "failed": 0, "repos": [], "error": str(e)}
-                )
+            repos, service_repos_dir = self.get_system_repositories(system)
+            work.extend((system, repo_url, service_repos_dir) for repo_url in repos)
+
+        async def inspect_one(system: str, repo_url: str, target_dir: Path) -> Dict[str, Any]:
+            info = await inspect(repo_url, target_dir)
+            if self.on_result is not None:
+                self.on_result(system, info)
+            return info
+
+        async def gather_all() -> List[Dict[str, Any]]:
+            return list(await asyncio.gather(*(inspect_one(*entry) for entry in work)))
 
+        results: Dict[str, List[Dict[str, Any]]] = {system: [] for system in systems}
+        for (system, _, _), info in zip(work, asyncio.run(gather_all()), strict=True):
+            results[system].append(info)
         return results
 
-    def get_repository_status(self, system: str) -> List[dict]:
-        """Get status of all repositories for a system.
+    async def repository_status(
+        self, repo_url: str, target_dir: Path, untracked: bool = False, fsmonitor: bool = False
+    ) -> Dict[str, Any]:
+        """Get the status of a single repository with one ``git status`` call.
+
+        Args:
+            repo_url: Git repository URL
+            target_dir: Directory where repositories are stored
+            untracked: Scan for untracked files
+            fsmonitor: Use the filesystem monitor and untracked cache
+
+        Returns:
+            Repository status dictionary
+        """
+        repo_name = extract_repo_name(repo_url)
+        repo_path = target_dir / repo_name
+
+        status = {"name": repo_name, "url": repo_url, "exists": repo_path.exists()}
+
+        if repo_path.exists():
+            try:
+                summary = await self.git.status(repo_path, untracked, fsmonitor)
+                if summary.branch is None:
+                    raise RepositorySyncError("HEAD is detached")
+                status["branch"] = summary.branch
+                status["dirty"] = summary.changed > 0
+                if untracked:
+                    status["untracked"] = summary.untracked > 0
+                status["commit"] = summary.commit[:8] if summary.commit else "-"
+                if summary.upstream is not None and summary.ahead is not None:
+                    status["ahead"] = summary.ahead
+                    status["behind"] = summary.behind
+            except Exception as e:
+                status["error"] = str(e)
+
+        return status
+
+    def get_cached_repository_status(self, system: str) -> List[Dict[str, Any]]:
+        """Get the last recorded sync state of all repositories for a system.
+
+        Answered from the sync state store only; no repository is opened.
 
         Args:
             system: System name (thk, man-oms, GCP)
@@ -472,85 +2110,116 @@ class RepositorySync:
         Returns:
             List of repository status dictionaries
         """
-        try:
-            repo_list_file = self.config.get_repository_list_file(system)
-            service_repos_dir = self.config.get_service_repositories_dir(system)
-        except ValueError as e:
-            raise RepositorySyncError(str(e)) from e
-
-        repos = read_repository_list(repo_list_file)
+        repos, service_repos_dir = self.get_system_repositories(system)
+        recorded = {entry["path"]: entry for entry in self.state.get_for_directory(service_repos_dir)}
         statuses = []
 
         for repo_url in repos:
             repo_name = extract_repo_name(repo_url)
             repo_path = service_repos_dir / repo_name
+            entry = recorded.get(str(repo_path), {})
 
             status = {"name": repo_name, "url": repo_url, "exists": repo_path.exists()}
-
-            if repo_path.exists():
-                try:
-                    repo = git.Repo(repo_path)
-                    status["branch"] = repo.active_branch.name
-                    status["dirty"] = repo.is_dirty()
-                    status["untracked"] = len(repo.untracked_files) > 0
-                    status["commit"] = repo.head.commit.hexsha[:8]
-                except Exception as e:
-                    status["error"] = str(e)
-
+            if entry.get("branch"):
+                status["branch"] = entry["branch"]
+            if entry.get("local_sha"):
+                status["commit"] = entry["local_sha"][:8]
+            for key in ("last_action", "last_duration", "last_error", "last_synced_at"):
+                if entry.get(key) is not None:
+                    status[key] = entry[key]
             statuses.append(status)
 
         return statuses
 
-    def get_branches(self, system: str) -> List[dict]:
-        """Get branch information for all repositories in a system.
+    def get_repository_status(
+        self, system: str, untracked: bool = False, fsmonitor: bool | None = None
+    ) -> List[Dict[str, Any]]:
+        """Get status of all repositories for a system.
 
         Args:
             system: System name (thk, man-oms, GCP)
+            untracked: Scan for untracked files (slow on large working trees)
+            fsmonitor: Use the filesystem monitor and untracked cache (default: configuration)
 
         Returns:
-            List of dictionaries with repository name and branch information
+            List of repository status dictionaries
         """
-        try:
-            repo_list_file = self.config.get_repository_list_file(system)
-            service_repos_dir = self.config.get_service_repositories_dir(system)
-        except ValueError as e:
-            raise RepositorySyncError(str(e)) from e
+        return self.get_all_repository_status([system], untracked, fsmonitor)[system]
 
-        repos = read_repository_list(repo_list_file)
-        branches = []
+    def get_all_repository_status(
+        self, systems: List[str], untracked: bool = False, fsmonitor: bool | None = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Get status of all repositories for several systems in one concurrent pass.
 
-        for repo_url in repos:
-            repo_name = extract_repo_name(repo_url)
-            repo_path = service_repos_dir / repo_name
+        Args:
+            systems: System names
+            untracked: Scan for untracked files (slow on large working trees)
+            fsmonitor: Use the filesystem monitor and untracked cache (default: configuration)
+
+        Returns:
+            Dictionary of system name to repository status dictionaries
+        """
+        fsmonitor = self.config.status_fsmonitor if fsmonitor is None else fsmonitor
+        return self._gather_systems(
+            systems,
+            lambda repo_url, target_dir: self.repository_status(
+                repo_url, target_dir, untracked, fsmonitor
+            ),
+        )
 
-            branch_info = {"name": repo_name, "exists": repo_path.exists()}
+    async def repository_branch(self, repo_url: str, target_dir: Path) -> Dict[str, Any]:
+        """Get branch information for a single repository.
 
-            if repo_path.exists():
-                try:
-                    repo = git.Repo(repo_path)
-                    branch_info["branch"] = repo.active_branch.name
+        Args:
+            repo_url: Git repository URL
+            target_dir: Directory where repositories are stored
+
+        Returns:
+            Dictionary with repository name and branch information
+        """
+        repo_name = extract_repo_name(repo_url)
+        repo_path = target_dir / repo_name
+
+        branch_info = {"name": repo_name, "exists": repo_path.exists()}
+
+        if repo_path.exists():
+            try:
+                branch = await self.git.current_branch(repo_path)
+                if branch is None:
+                    raise RepositorySyncError("HEAD is detached")
+                branch_info["branch"] = branch
+
+                # Check if branch is ahead/behind remote
+                counts = await self.git.ahead_behind(repo_path, "HEAD", f"origin/{branch}")
+                if counts is not None:
+                    branch_info["ahead"], branch_info["behind"] = counts
+
+            except Exception as e:
+                branch_info["error"] = str(e)
 
-                    # Check if branch is ahead/behind remote
-                    try:
-                        remote_branch = f"origin/{repo.active_branch.name}"
-                        local_commit = repo.head.commit
-                        remote_commit = repo.commit(remote_branch)
+        return branch_info
 
-                        ahead = list(repo.iter_commits(f"{remote_branch}..HEAD"))
-                        behind = list(repo.iter_commits(f"HEAD..{remote_branch}"))
+    def get_branches(self, system: str) -> List[Dict[str, Any]]:
+        """Get branch information for all repositories in a system.
+
+        Args:
+            system: System name (thk, man-oms, GCP)
 
-                        branch_info["ahead"] = len(ahead)
-                        branch_info["behind"] = len(behind)
-                    except Exception:
-                        # If we can't determine ahead/behind, just skip it
-                        pass
+        Returns:
+            List of dictionaries with repository name and branch information
+        """
+        return self._gather_repositories(system, self.repository_branch)
 
-                except Exception as e:
-                    branch_info["error"] = str(e)
+    def get_all_branches(self, systems: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Get current branch information for several systems in one concurrent pass.
 
-            branches.append(branch_info)
+        Args:
+            systems: System names
 
-        return branches
+        Returns:
+            Dictionary of system name to branch information dictionaries
+        """
+        return self._gather_systems(systems, self.repository_branch)
 
     def parse_pr_url(self, pr_url: str) -> Tuple[str, str, str]:
         """Parse BitBucket pull request URL.
@@ -565,7 +2234,7 @@ class RepositorySync:
             ValueError: If URL format is invalid
         """
         # Match BitBucket Server PR URL format
-        pattern = r"https://[^/]+/projects/([^/]+)/repos/([^/]+)/pull-requests/(\d+)"
+        pattern = r"https?://[^/]+/projects/([^/]+)/repos/([^/]+)/pull-requests/(\d+)"
         match = re.match(pattern, pr_url)
 
         if not match:
@@ -573,91 +2242,141 @@ class RepositorySync:
 
         return match.group(1), match.group(2), match.group(3)
 
-    def get_pr_info(self, pr_url: str) -> dict:
-        """Get pull request information from BitBucket API.
+    def _bitbucket_client(self, server_url: str) -> BitbucketClient:
+        """Get the API client of a Bitbucket server, shared by every request to it.
 
         Args:
-            pr_url: BitBucket PR URL
+            server_url: Server URL (scheme and host of a PR URL)
 
         Returns:
-            Dictionary with PR information including source branch
+            Bitbucket client with pooled connections and the on-disk response cache
 
         Raises:
-            RepositorySyncError: If API call fails or token is missing
+            RepositorySyncError: If the token is missing
         """
-        token = os.environ.get("BITBUCKET_TOKEN")
-        if not token:
-            raise RepositorySyncError(
-                "BITBUCKET_TOKEN environment variable not set. "
-                "Please set it to your BitBucket personal access token."
+        if server_url not in self._bitbucket:
+            token = os.environ.get("BITBUCKET_TOKEN")
+            if not token:
+                raise RepositorySyncError(
+                    "BITBUCKET_TOKEN environment variable not set. "
+                    "Please set it to your BitBucket personal access token."
+                )
+            self._bitbucket[server_url] = BitbucketClient(
+                server_url,
+                token,
+                cache_dir=self.config.bitbucket_cache_dir,
+                ttl=self.config.bitbucket_cache_ttl,
+                timeout=self.config.bitbucket_timeout,
+                pool_size=self.config.bitbucket_connections,
             )
+        return self._bitbucket[server_url]
 
-        try:
-            project_key, repo_slug, pr_id = self.parse_pr_url(pr_url)
-        except ValueError as e:
-            raise RepositorySyncError(str(e)) from e
+    def get_pr_infos(
+        self, pr_urls: List[str], refresh: bool = False
+    ) -> List[Union[Dict[str, Any], RepositorySyncError]]:
+        """Get information about several pull requests from the BitBucket API concurrently.
 
-        # BitBucket Server REST API endpoint
-        api_url = f"https://mangit.maninvestments.com/rest/api/1.0/projects/{project_key}/repos/{repo_slug}/pull-requests/{pr_id}"
+        Responses are cached on disk for ``PKM_BITBUCKET_CACHE_TTL`` seconds and then
+        revalidated with their ``ETag``; requests to one server share keep-alive connections.
 
-        logger.debug(f"Fetching PR info from: {api_url}")
+        Args:
+            pr_urls: BitBucket PR URLs
+            refresh: Revalidate cached responses with the server even if they are fresh
 
-        try:
-            # Create request with authorization header
-            request = Request(api_url)
-            request.add_header("Authorization", f"Bearer {token}")
-            request.add_header("Accept", "application/json")
+        Returns:
+            PR information dictionary (project, repo, pr_id, title, source_branch,
+            target_branch, author), or the ``RepositorySyncError`` it failed with, per URL
 
-            # Make the request
-            with urlopen(request, timeout=10) as response:
-                response_data = response.read()
-                pr_data = json.loads(response_data)
+        Raises:
+            RepositorySyncError: If the token is missing
+        """
+        results: Dict[int, Union[Dict[str, Any], RepositorySyncError]] = {}
+        requests: Dict[str, List[Tuple[int, str, Tuple[str, str, str]]]] = {}
+        for index, pr_url in enumerate(pr_urls):
+            try:
+                pr_key = self.parse_pr_url(pr_url)
+            except ValueError as e:
+                results[index] = RepositorySyncError(str(e))
+                continue
+            parts = urlsplit(pr_url)
+            server_url = f"{parts.scheme}://{parts.netloc}"
+            path = BitbucketClient.pull_request_path(*pr_key)
+            requests.setdefault(server_url, []).append((index, path, pr_key))
+
+        for server_url, server_requests in requests.items():
+            client = self._bitbucket_client(server_url)
+            logger.debug(f"Fetching {len(server_requests)} PRs from {server_url}")
+            responses = client.get_many(
+                [path for _, path, _ in server_requests], 0 if refresh else None
+            )
+            for (index, _, (project_key, repo_slug, pr_id)), pr_data in zip(
+                server_requests, responses, strict=True
+            ):
+                if isinstance(pr_data, BitbucketError):
+                    results[index] = RepositorySyncError(
+                        f"Failed to fetch PR information: {pr_data}"
+                    )
+                    continue
+                try:
+                    results[index] = {
+                        "project": project_key,
+                        "repo": repo_slug,
+                        "pr_id": pr_id,
+                        "title": pr_data.get("title", ""),
+                        "source_branch": pr_data["fromRef"]["displayId"],
+                        "target_branch": pr_data["toRef"]["displayId"],
+                        "author": pr_data["author"]["user"]["displayName"],
+                    }
+                except (KeyError, TypeError, AttributeError) as e:
+                    results[index] = RepositorySyncError(f"Failed to parse PR response: {e}")
+
+        return [results[index] for index in range(len(pr_urls))]
+
+    def get_pr_info(self, pr_url: str) -> Dict[str, Any]:
+        """Get pull request information from BitBucket API.
 
-            return {
-                "project": project_key,
-                "repo": repo_slug,
-                "pr_id": pr_id,
-                "title": pr_data.get("title", ""),
-                "source_branch": pr_data["fromRef"]["displayId"],
-                "target_branch": pr_data["toRef"]["displayId"],
-                "author": pr_data["author"]["user"]["displayName"],
-            }
+        Args:
+            pr_url: BitBucket PR URL
 
-        except (HTTPError, URLError) as e:
-            raise RepositorySyncError(f"Failed to fetch PR information: {e}") from e
-        except (KeyError, ValueError) as e:
-            raise RepositorySyncError(f"Failed to parse PR response: {e}") from e
+        Returns:
+            Dictionary with PR information including source branch
 
-    def find_repository_system(self, repo_name: str) -> Optional[str]:
+        Raises:
+            RepositorySyncError: If API call fails or token is missing
+        """
+        pr_info = self.get_pr_infos([pr_url])[0]
+        if isinstance(pr_info, RepositorySyncError):
+            raise pr_info
+        return pr_info
+
+    def find_repository_system(
+        self, repo_name: str, project: Optional[str] = None
+    ) -> Optional[str]:
         """Find which system contains a repository.
 
         Args:
-            repo_name: Repository name
+            repo_name: Repository name (or URL)
+            project: Bitbucket project key; if given, a repository with this project and
+                slug is preferred over one that merely has the same name
 
         Returns:
             System name if found, None otherwise
         """
-        systems = self.config.list_systems()
+        entries = self.registry.find_slug(project, repo_name) if project else []
+        entries = entries or self.registry.find(repo_name)
+        return entries[0]["system"] if entries else None
 
-        for system in systems:
-            try:
-                repo_list_file = self.config.get_repository_list_file(system)
-                repos = read_repository_list(repo_list_file)
-
-                for repo_url in repos:
-                    if extract_repo_name(repo_url) == repo_name:
-                        return system
-            except ValueError:
-                # System doesn't have repository list, skip
-                continue
-
-        return None
-
-    def checkout_pr_branch(self, pr_url: str) -> dict:
+    def checkout_pr_branch(
+        self, pr_url: str, use_mirror: bool | None = None, worktree: bool = False
+    ) -> Dict[str, Any]:
         """Checkout the branch from a pull request URL.
 
         Args:
             pr_url: BitBucket PR URL
+            use_mirror: Refresh the repository's local mirror, then fetch from it instead
+                of the remote (default: configuration)
+            worktree: Check the PR out into its own worktree instead of the repository's
+                working tree
 
         Returns:
             Dictionary with checkout information
@@ -665,67 +2384,274 @@ class RepositorySync:
         Raises:
             RepositorySyncError: If checkout fails
         """
-        # Get PR information
-        pr_info = self.get_pr_info(pr_url)
-        repo_name = pr_info["repo"]
-        branch_name = pr_info["source_branch"]
+        result = self.checkout_pr_branches([pr_url], use_mirror, worktree=worktree)[0]
+        if result["status"] != "success":
+            raise RepositorySyncError(result["error"])
+        return {key: value for key, value in result.items() if key not in ("url", "status")}
+
+    def checkout_pr_branches(
+        self,
+        pr_urls: List[str],
+        use_mirror: bool | None = None,
+        refresh: bool = False,
+        worktree: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Checkout the branches of several pull requests concurrently.
+
+        PR information is resolved over shared API connections (and the response cache),
+        then every PR is fetched and checked out on one event loop. Each fetch transfers
+        only the PR's source ref, not every branch of the remote. PRs of different
+        repositories proceed in parallel; PRs of the same repository take turns.
 
-        logger.info(f"PR #{pr_info['pr_id']}: {pr_info['title']}")
-        logger.info(f"Repository: {repo_name}, Branch: {branch_name}")
+        Args:
+            pr_urls: BitBucket PR URLs
+            use_mirror: Refresh each repository's local mirror once, then fetch from it
+                instead of the remote (default: configuration)
+            refresh: Revalidate cached PR information with the server even if it is fresh
+            worktree: Check each PR out into its own worktree (see ``_checkout_pr_worktree``)
+                instead of switching the branch of the repository's working tree
+
+        Returns:
+            Per URL in order, the checkout information with ``status`` "success" or a
+            dictionary with ``status`` "failed" and the ``error``
+
+        Raises:
+            RepositorySyncError: If the token is missing
+        """
+        use_mirror = self.config.use_mirror if use_mirror is None else use_mirror
+        results: List[Dict[str, Any]] = [{}] * len(pr_urls)
+        pending: List[Tuple[int, Dict[str, Any], str, Path]] = []
+
+        pr_infos = self.get_pr_infos(pr_urls, refresh)
+        for index, (pr_url, pr_info) in enumerate(zip(pr_urls, pr_infos, strict=True)):
+            try:
+                if isinstance(pr_info, RepositorySyncError):
+                    raise pr_info
+                logger.info(f"PR #{pr_info['pr_id']}: {pr_info['title']}")
+                system, repo_path = self._locate_pr_repository(
+                    pr_info["project"], pr_info["repo"]
+                )
+                pending.append((index, pr_info, system, repo_path))
+            except RepositorySyncError as e:
+                logger.error(f"Failed to checkout {pr_url}: {e}")
+                results[index] = {"url": pr_url, "status": "failed", "error": str(e)}
+
+        async def checkout_all() -> None:
+            repo_paths = sorted({repo_path for _, _, _, repo_path in pending})
+            origin_urls = await asyncio.gather(*map(self._origin_url, repo_paths))
+            urls = dict(zip(repo_paths, origin_urls, strict=True))
+            remote_urls = sorted({url for url in urls.values() if url})
+            locks = {repo_path: asyncio.Lock() for repo_path in repo_paths}
+
+            async def refresh_mirror(repo_url: str) -> None:
+                try:
+                    await self.mirrors.update(repo_url)
+                except GitCommandError as e:
+                    logger.warning(
+                        f"Failed to refresh mirror for {extract_repo_name(repo_url)}: {e}"
+                    )
+
+            async def checkout(
+                index: int, pr_info: Dict[str, Any], system: str, repo_path: Path
+            ) -> None:
+                try:
+                    async with locks[repo_path]:
+                        result = await self._checkout_pr(
+                            pr_info, system, repo_path, urls[repo_path], use_mirror, worktree
+                        )
+                    results[index] = {"url": pr_urls[index], "status": "success", **result}
+                except RepositorySyncError as e:
+                    logger.error(f"Failed to checkout {pr_urls[index]}: {e}")
+                    results[index] = {"url": pr_urls[index], "status": "failed", "error": str(e)}
+
+            if self.ssh is not None:
+                await self.ssh.connect(remote_urls)
+            try:
+                if use_mirror:
+                    await asyncio.gather(*map(refresh_mirror, remote_urls))
+                await asyncio.gather(*(checkout(*entry) for entry in pending))
+            finally:
+                if self.ssh is not None:
+                    await self.ssh.disconnect()
+
+        if pending:
+            asyncio.run(checkout_all())
+        return results
+
+    def _locate_pr_repository(self, project: str, repo_name: str) -> Tuple[str, Path]:
+        """Find the system and local clone of a pull request's repository.
+
+        Args:
+            project: Bitbucket project key of the PR
+            repo_name: Repository name (the PR's repository slug)
 
-        # Find which system has this repository
-        system = self.find_repository_system(repo_name)
+        Returns:
+            Tuple of (system name, repository path)
+
+        Raises:
+            RepositorySyncError: If no system lists the repository or it is not cloned yet
+        """
+        system = self.find_repository_system(repo_name, project)
         if not system:
             raise RepositorySyncError(
                 f"Repository '{repo_name}' not found in any system. "
-                f"Available systems: {', '.join(self.config.list_systems())}"
+                f"Available systems: {', '.join(self.registry.systems())}"
             )
+        logger.info(f"Found repository {repo_name} in system: {system}")
 
-        logger.info(f"Found repository in system: {system}")
-
-        # Get repository path
-        service_repos_dir = self.config.get_service_repositories_dir(system)
-        repo_path = service_repos_dir / repo_name
-
+        repo_path = self.config.get_service_repositories_dir(system) / repo_name
         if not repo_path.exists():
             raise RepositorySyncError(
                 f"Repository '{repo_name}' not cloned yet. "
                 f"Please run 'pkm update --system {system}' first."
             )
+        return system, repo_path
 
-        # Checkout the branch
+    async def _origin_url(self, repo_path: Path) -> Optional[str]:
+        """Read the URL of a repository's origin remote (None if it has none)."""
         try:
-            repo = git.Repo(repo_path)
-
-            # Fetch latest from remote
-            logger.debug("Fetching from remote...")
-            origin = repo.remotes.origin
-            origin.fetch()
-
-            # Check if branch exists locally
-            local_branch_exists = branch_name in [b.name for b in repo.branches]
-
-            if local_branch_exists:
-                logger.debug(f"Checking out existing local branch: {branch_name}")
-                repo.git.checkout(branch_name)
-                # Pull latest changes
-                logger.debug("Pulling latest changes...")
-                origin.pull(branch_name)
-            else:
-                # Create and checkout new branch tracking remote
-                logger.debug(f"Creating new local branch tracking origin/{branch_name}")
-                repo.git.checkout("-b", branch_name, f"origin/{branch_name}")
+            result = await self.git.run("remote", "get-url", "origin", cwd=repo_path)
+        except (GitCommandError, OSError):
+            return None
+        return result.stdout.strip()
 
-            return {
-                "system": system,
-                "repo": repo_name,
-                "branch": branch_name,
-                "pr_id": pr_info["pr_id"],
-                "pr_title": pr_info["title"],
-                "author": pr_info["author"],
-            }
+    async def _fetch_pr_ref(
+        self, repo_path: Path, repo_url: Optional[str], pr_info: Dict[str, Any], use_mirror: bool
+    ) -> str:
+        """Fetch only the source commit of a pull request.
+
+        Bitbucket publishes every PR's source as ``refs/pull-requests/<id>/from`` (which
+        also covers PRs from forks). Servers without these refs fall back to the source
+        branch itself.
+
+        Args:
+            repo_path: Path to the repository
+            repo_url: URL of the repository's origin remote
+            pr_info: PR information from ``get_pr_infos``
+            use_mirror: Fetch from the local mirror instead of the remote
+
+        Returns:
+            Remote-tracking ref the PR's source commit was fetched into
+
+        Raises:
+            GitCommandError: If the fetch fails
+        """
+        source = self.source_args(repo_url, use_mirror) if repo_url else []
+        remote = None if source else repo_url
+
+        async def fetch(refspec: str) -> None:
+            await self.network(
+                remote,
+                lambda: self.git.run(
+                    *source, "fetch", "--quiet", "--no-tags", "origin", refspec, cwd=repo_path
+                ),
+                "fetch",
+            )
+
+        pr_ref = f"refs/remotes/origin/pull-requests/{pr_info['pr_id']}"
+        try:
+            await fetch(f"+refs/pull-requests/{pr_info['pr_id']}/from:{pr_ref}")
+            return pr_ref
+        except GitCommandError as e:
+            if "couldn't find remote ref" not in e.stderr:
+                raise
+
+        branch_ref = f"refs/remotes/origin/{pr_info['source_branch']}"
+        await fetch(f"+refs/heads/{pr_info['source_branch']}:{branch_ref}")
+        return branch_ref
+
+    async def _checkout_pr_worktree(
+        self, system: str, repo_path: Path, pr_id: str, ref: str
+    ) -> Path:
+        """Check a pull request out into its own worktree, leaving the main one untouched.
+
+        Worktrees live at ``.pkm/worktrees/<system>/<repo>/pr-<id>`` on a local ``pr/<id>``
+        branch. An existing worktree is reset to the PR's latest commit, so it follows
+        rebased and force-pushed PRs; it must not have uncommitted changes.
+
+        Args:
+            system: System the repository belongs to
+            repo_path: Path to the repository
+            pr_id: Pull request ID
+            ref: Ref of the PR's fetched source commit
+
+        Returns:
+            Path to the worktree
+
+        Raises:
+            RepositorySyncError: If the existing worktree has uncommitted changes
+            GitCommandError: If the worktree cannot be created or reset
+        """
+        path = self.config.worktrees_dir / system / repo_path.name / f"pr-{pr_id}"
+        if (path / ".git").exists():
+            if (await self.git.status(path)).changed:
+                raise RepositorySyncError(f"Worktree {path} has uncommitted changes")
+            await self.git.run("checkout", "--quiet", "-B", f"pr/{pr_id}", ref, cwd=path)
+            return path
+
+        # Forget worktrees whose directories were deleted by hand
+        await self.git.run("worktree", "prune", cwd=repo_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        await self.git.run(
+            "worktree", "add", "--quiet", "-B", f"pr/{pr_id}", str(path), ref, cwd=repo_path
+        )
+        return path
+
+    async def _checkout_pr(
+        self,
+        pr_info: Dict[str, Any],
+        system: str,
+        repo_path: Path,
+        repo_url: Optional[str],
+        use_mirror: bool,
+        worktree: bool,
+    ) -> Dict[str, Any]:
+        """Fetch and checkout the source of a resolved pull request.
+
+        Args:
+            pr_info: PR information from ``get_pr_infos``
+            system: System the repository belongs to
+            repo_path: Path to the repository
+            repo_url: URL of the repository's origin remote
+            use_mirror: Fetch from the local mirror instead of the remote
+            worktree: Check the PR out into its own worktree
 
-        except git.GitCommandError as e:
+        Returns:
+            Dictionary with checkout information
+
+        Raises:
+            RepositorySyncError: If checkout fails
+        """
+        repo_name = pr_info["repo"]
+        branch_name = pr_info["source_branch"]
+        logger.info(f"Repository: {repo_name}, Branch: {branch_name}")
+
+        try:
+            ref = await self._fetch_pr_ref(repo_path, repo_url, pr_info, use_mirror)
+
+            if worktree:
+                path = await self._checkout_pr_worktree(system, repo_path, pr_info["pr_id"], ref)
+            else:
+                path = repo_path
+                if await self.git.rev_parse(repo_path, f"refs/heads/{branch_name}"):
+                    logger.debug(f"Checking out existing local branch: {branch_name}")
+                    await self.git.run("checkout", "--quiet", branch_name, cwd=repo_path)
+                    await self.git.run("merge", "--quiet", ref, cwd=repo_path)
+                else:
+                    logger.debug(f"Creating new local branch at {ref}")
+                    await self.git.run(
+                        "checkout", "--quiet", "-b", branch_name, ref, cwd=repo_path
+                    )
+        except (GitCommandError, OSError) as e:
             raise RepositorySyncError(f"Git operation failed: {e}") from e
-        except Exception as e:
-            raise RepositorySyncError(f"Unexpected error during checkout: {e}") from e
+
+        return {
+            "system": system,
+            "repo": repo_name,
+            "branch": branch_name,
+            "path": str(path),
+            "worktree": worktree,
+            "pr_id": pr_info["pr_id"],
+            "pr_title": pr_info["title"],
+            "author": pr_info["author"],
+        }
@@ -0,0 +1,152 @@
+"""SSH connection multiplexing for git operations."""
+
+import asyncio
+import logging
+import os
+import re
+import shlex
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# scp-like SSH syntax: [user@]host:path
+_SCP_URL = re.compile(r"^(?:(?P<user>[^@/]+)@)?(?P<host>[^:/]+):(?!//)")
+
+# Unix socket paths are limited to about 104 bytes; %C expands to 40 hex characters
+_MAX_CONTROL_DIR = 60
+
+# Seconds to wait for a master connection to authenticate
+_CONNECT_TIMEOUT = 15
+
+
+def ssh_target(repo_url: str) -> Optional[Tuple[Optional[str], str, Optional[int]]]:
+    """Get the SSH endpoint of a repository URL.
+
+    Args:
+        repo_url: Git repository URL
+
+    Returns:
+        Tuple of (user, host, port), or None if the URL does not use SSH
+    """
+    if "://" in repo_url:
+        parts = urlsplit(repo_url)
+        if parts.scheme not in ("ssh", "git+ssh", "ssh+git") or not parts.hostname:
+            return None
+        return parts.username, parts.hostname, parts.port
+
+    match = _SCP_URL.match(repo_url)
+    if not match:
+        return None
+    return match["user"], match["host"], None
+
+
+class SSHMultiplexer:
+    """Share one SSH connection per host between all git commands of a batch run.
+
+    Every git command gets ``ControlMaster=auto`` options through ``GIT_SSH_COMMAND``, so
+    commands to the same host reuse an open master connection instead of paying for a
+    fresh handshake. ``connect`` opens the masters up front, before the repositories race
+    each other for them, and ``disconnect`` closes the ones it opened. ``ControlPersist``
+    keeps a master alive between commands and ends it if pkm exits without cleaning up.
+    """
+
+    def __init__(self, control_dir: Path, ssh_command: Optional[str] = None, persist: int = 60):
+        """Initialize the multiplexer.
+
+        Args:
+            control_dir: Directory for the control sockets
+            ssh_command: Base SSH command (default: ``ssh``)
+            persist: Seconds an idle master connection stays open
+        """
+        if len(str(control_dir)) > _MAX_CONTROL_DIR:
+            control_dir = Path(tempfile.gettempdir()) / f"pkm-ssh-{os.getuid()}"
+        self.control_dir = control_dir
+        self.base_command = shlex.split(ssh_command) if ssh_command else ["ssh"]
+        self.persist = persist
+        self._started: Set[Tuple[Optional[str], str, Optional[int]]] = set()
+
+    def options(self) -> List[str]:
+        """Build the SSH options enabling connection sharing.
+
+        Returns:
+            List of ``-o`` options
+        """
+        return [
+            "-o", "ControlMaster=auto",
+            "-o", f"ControlPath={self.control_dir / '%C'}",
+            "-o", f"ControlPersist={self.persist}",
+        ]
+
+    @property
+    def command(self) -> str:
+        """Get the ``GIT_SSH_COMMAND`` sharing connections through the control sockets."""
+        return shlex.join(self.base_command + self.options())
+
+    def _target_args(self, target: Tuple[Optional[str], str, Optional[int]]) -> List[str]:
+        """Build the SSH arguments addressing one endpoint."""
+        user, host, port = target
+        args = []
+        if port:
+            args += ["-p", str(port)]
+        if user:
+            args += ["-l", user]
+        return args + [host]
+
+    async def _ssh(self, *args: str) -> int:
+        """Run the SSH client with connection sharing options and return its exit status."""
+        process = await asyncio.create_subprocess_exec(
+            *self.base_command,
+            *self.options(),
+            "-o", "BatchMode=yes",
+            *args,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        try:
+            return await asyncio.wait_for(process.wait(), _CONNECT_TIMEOUT)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return -1
+
+    async def connect(self, repo_urls: List[str]) -> int:
+        """Open a master connection to every SSH host of a run.
+
+        Hosts that cannot be reached are skipped; git then connects on its own and reports
+        the error for each repository.
+
+        Args:
+            repo_urls: Repository URLs of the run
+
+        Returns:
+            Number of hosts with a master connection
+        """
+        targets = {target for target in map(ssh_target, repo_urls) if target is not None}
+        if not targets:
+            return 0
+        self.control_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+        async def open_master(target: Tuple[Optional[str], str, Optional[int]]) -> bool:
+            if await self._ssh("-O", "check", *self._target_args(target)) == 0:
+                return True
+            # -f returns once authenticated, leaving the master in the background
+            if await self._ssh("-f", "-N", *self._target_args(target)) != 0:
+                logger.debug(f"Could not open an SSH master connection to {target[1]}")
+                return False
+            self._started.add(target)
+            return True
+
+        connected = sum(await asyncio.gather(*(open_master(target) for target in targets)))
+        logger.debug(f"SSH master connections open for {connected} of {len(targets)} hosts")
+        return connected
+
+    async def disconnect(self) -> None:
+        """Close the master connections opened by ``connect``."""
+        started, self._started = self._started, set()
+        await asyncio.gather(
+            *(self._ssh("-O", "exit", *self._target_args(target)) for target in started)
+        )
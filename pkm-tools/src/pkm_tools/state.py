@@ -0,0 +1,232 @@
+"""Persistent sync state for repositories managed by PKM tools."""
+
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS repositories (
+    path TEXT PRIMARY KEY,
+    target_dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    url TEXT,
+    default_branch TEXT,
+    branch TEXT,
+    local_sha TEXT,
+    remote_sha TEXT,
+    last_action TEXT,
+    last_duration REAL,
+    last_error TEXT,
+    last_synced_at REAL
+);
+CREATE INDEX IF NOT EXISTS repositories_target_dir ON repositories (target_dir);
+CREATE TABLE IF NOT EXISTS fetch_schedule (
+    path TEXT PRIMARY KEY,
+    interval REAL NOT NULL,
+    next_fetch_at REAL NOT NULL,
+    last_fetched_at REAL,
+    last_changed_at REAL
+);
+"""
+
+_COLUMNS = (
+    "path",
+    "target_dir",
+    "name",
+    "url",
+    "default_branch",
+    "branch",
+    "local_sha",
+    "remote_sha",
+    "last_action",
+    "last_duration",
+    "last_error",
+    "last_synced_at",
+)
+
+
+class SyncStateStore:
+    """SQLite store of per-repository sync state.
+
+    Rows are keyed by the repository's local path, so the same URL checked out under two
+    systems has two independent entries. The database is opened lazily on first use.
+    """
+
+    def __init__(self, db_path: Path):
+        """Initialize the state store.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Get the database connection, creating the database if needed."""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def get(self, repo_path: Path) -> Optional[Dict[str, Any]]:
+        """Get the stored state of a repository.
+
+        Args:
+            repo_path: Local path of the repository
+
+        Returns:
+            State dictionary, or None if the repository has never been recorded
+        """
+        row = self.conn.execute(
+            "SELECT * FROM repositories WHERE path = ?", (str(repo_path),)
+        ).fetchone()
+        return dict(row) if row is not None else None
+
+    def get_for_directory(self, target_dir: Path) -> List[Dict[str, Any]]:
+        """Get the stored state of every repository in a directory.
+
+        Args:
+            target_dir: Directory where repositories are stored
+
+        Returns:
+            List of state dictionaries
+        """
+        rows = self.conn.execute(
+            "SELECT * FROM repositories WHERE target_dir = ? ORDER BY name", (str(target_dir),)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_default_branch(self, repo_path: Path) -> Optional[str]:
+        """Get the cached default branch of a repository.
+
+        Args:
+            repo_path: Local path of the repository
+
+        Returns:
+            Default branch name, or None if not cached
+        """
+        row = self.conn.execute(
+            "SELECT default_branch FROM repositories WHERE path = ?", (str(repo_path),)
+        ).fetchone()
+        return row["default_branch"] if row is not None else None
+
+    def update(self, repo_path: Path, **fields: object) -> None:
+        """Insert or update the stored state of a repository.
+
+        Only the given fields are changed; other columns keep their previous values.
+
+        Args:
+            repo_path: Local path of the repository
+            **fields: Column values to store (see ``_COLUMNS``)
+
+        Raises:
+            ValueError: If an unknown column is given
+        """
+        unknown = set(fields) - set(_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown sync state fields: {', '.join(sorted(unknown))}")
+
+        fields = {
+            "target_dir": str(repo_path.parent),
+            "name": repo_path.name,
+            **fields,
+        }
+        columns = ", ".join(["path", *fields])
+        placeholders = ", ".join("?" for _ in range(len(fields) + 1))
+        assignments = ", ".join(f"{column} = excluded.{column}" for column in fields)
+
+        with self.conn:
+            self.conn.execute(
+                f"INSERT INTO repositories ({columns}) VALUES ({placeholders}) "
+                f"ON CONFLICT(path) DO UPDATE SET {assignments}",
+                (str(repo_path), *fields.values()),
+            )
+
+    def get_schedule(self) -> Dict[str, Dict[str, Any]]:
+        """Get the daemon's persisted fetch schedule.
+
+        Returns:
+            Dictionary of repository path to ``{"interval", "next_fetch_at",
+            "last_fetched_at", "last_changed_at"}``
+        """
+        rows = self.conn.execute("SELECT * FROM fetch_schedule").fetchall()
+        return {row["path"]: dict(row) for row in rows}
+
+    def save_schedule(
+        self,
+        repo_path: Path,
+        interval: float,
+        next_fetch_at: float,
+        last_fetched_at: Optional[float] = None,
+        last_changed_at: Optional[float] = None,
+    ) -> None:
+        """Persist the fetch schedule of one repository.
+
+        Args:
+            repo_path: Local path of the repository
+            interval: Current fetch interval in seconds
+            next_fetch_at: Unix time of the next fetch
+            last_fetched_at: Unix time of the last fetch
+            last_changed_at: Unix time of the last fetch that brought new commits
+        """
+        try:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO fetch_schedule "
+                    "(path, interval, next_fetch_at, last_fetched_at, last_changed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (str(repo_path), interval, next_fetch_at, last_fetched_at, last_changed_at),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to save fetch schedule for {repo_path.name}: {e}")
+
+    def record_result(
+        self,
+        repo_path: Path,
+        url: str,
+        action: str,
+        duration: float,
+        error: Optional[str] = None,
+        **fields: object,
+    ) -> None:
+        """Record the outcome of a repository operation.
+
+        A failed operation clears the cached default branch so it is re-detected next time.
+
+        Args:
+            repo_path: Local path of the repository
+            url: Git repository URL
+            action: Operation performed (synced, cloned, ...)
+            duration: Operation duration in seconds
+            error: Error message if the operation failed
+            **fields: Additional columns to store (branch, local_sha, remote_sha, ...)
+        """
+        if error is not None:
+            fields["default_branch"] = None
+
+        try:
+            self.update(
+                repo_path,
+                url=url,
+                last_action=action,
+                last_duration=duration,
+                last_error=error,
+                last_synced_at=time.time(),
+                **fields,
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to record sync state for {repo_path.name}: {e}")
@@ -1,6 +1,7 @@
 """Utility functions for PKM tools."""
 
 import logging
+import os
 from pathlib import Path
 from typing import List
 
@@ -18,6 +19,15 @@ def setup_logging(level: str = "INFO") -> None:
     )
 
 
+def default_jobs() -> int:
+    """Get the default number of concurrent repository operations.
+
+    Returns:
+        Number of CPUs available (at least 1)
+    """
+    return os.cpu_count() or 1
+
+
 def read_repository_list(file_path: Path) -> List[str]:
     """Read repository URLs from a repository-list.txt file.
 
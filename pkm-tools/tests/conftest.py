@@ -0,0 +1,93 @@
+"""Shared fixtures: throwaway git repositories."""
+
+import os
+import subprocess
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+
+from pkm_tools.config import PKMConfig
+from pkm_tools.repo_sync import RepositorySync
+
+GIT_IDENTITY = {
+    "GIT_AUTHOR_NAME": "Test",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test",
+    "GIT_COMMITTER_EMAIL": "test@example.com",
+}
+
+
+def git(cwd: Path, *args: str) -> str:
+    """Run git in a directory and return its standard output."""
+    result = subprocess.run(
+        ["git", *args],
+        cwd=cwd,
+        env={**os.environ, **GIT_IDENTITY},
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip()
+
+
+def commit(repo: Path, name: str, content: str = "content") -> str:
+    """Write a file, commit it and return the new commit SHA."""
+    (repo / name).parent.mkdir(parents=True, exist_ok=True)
+    (repo / name).write_text(content)
+    git(repo, "add", name)
+    git(repo, "commit", "-q", "-m", f"Add {name}")
+    return git(repo, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def origin(tmp_path: Path) -> Path:
+    """Bare repository on branch main with two commits."""
+    work = tmp_path / "origin-work"
+    git(tmp_path, "init", "-q", "-b", "main", str(work))
+    commit(work, "README.md", "readme")
+    commit(work, "src/app.py", "print()")
+    bare = tmp_path / "origin.git"
+    git(tmp_path, "clone", "-q", "--bare", str(work), str(bare))
+    return bare
+
+
+@pytest.fixture
+def clone(tmp_path: Path, origin: Path) -> Path:
+    """Working clone of ``origin``."""
+    path = tmp_path / "clone"
+    git(tmp_path, "clone", "-q", str(origin), str(path))
+    return path
+
+
+def make_system(pkm_root: Path, system: str, repo_urls: List[str]) -> Path:
+    """Create a system with a repository list and return its service-repositories directory."""
+    service_repos_dir = pkm_root / "systems" / system / "service-repositories"
+    service_repos_dir.mkdir(parents=True, exist_ok=True)
+    (service_repos_dir / "repository-list.txt").write_text("".join(f"{url}\n" for url in repo_urls))
+    return service_repos_dir
+
+
+@pytest.fixture
+def pkm_root(tmp_path: Path) -> Path:
+    """Empty PKM root directory."""
+    root = tmp_path / "pkm"
+    (root / "systems").mkdir(parents=True)
+    return root
+
+
+@pytest.fixture
+def config(pkm_root: Path, monkeypatch: pytest.MonkeyPatch) -> PKMConfig:
+    """Configuration for ``pkm_root``, unaffected by the caller's PKM_* environment."""
+    for name in list(os.environ):
+        if name.startswith("PKM_"):
+            monkeypatch.delenv(name)
+    return PKMConfig(pkm_root=pkm_root, ssh_multiplex=False)
+
+
+@pytest.fixture
+def sync(config: PKMConfig) -> Iterator[RepositorySync]:
+    """Repository sync manager for ``config``."""
+    manager = RepositorySync(config)
+    yield manager
+    manager.state.close()
@@ -0,0 +1,169 @@
+"""Tests for the Bitbucket REST client."""
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+
+from pkm_tools.bitbucket import BitbucketClient, BitbucketError
+
+PR_PATH = re.compile(r"/rest/api/1.0/projects/(\w+)/repos/([\w-]+)/pull-requests/(\d+)")
+
+
+class StubBitbucket(ThreadingHTTPServer):
+    """Local Bitbucket stand-in recording every request it answers."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.requests: List[dict] = []
+        self.version = 1
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serve pull requests with an ``ETag`` over keep-alive connections."""
+
+    protocol_version = "HTTP/1.1"
+    server: StubBitbucket
+
+    def do_GET(self) -> None:  # noqa: N802
+        self.server.requests.append(
+            {
+                "path": self.path,
+                "client_port": self.client_address[1],
+                "if_none_match": self.headers.get("If-None-Match"),
+                "authorization": self.headers.get("Authorization"),
+            }
+        )
+        match = PR_PATH.fullmatch(self.path)
+        if not match:
+            self._send(404, b'{"errors": [{"message": "not found"}]}')
+            return
+
+        etag = f'"{match[2]}-{match[3]}-v{self.server.version}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, b"", etag)
+            return
+        body = {
+            "title": f"PR {match[3]} v{self.server.version}",
+            "fromRef": {"displayId": f"feature-{match[3]}"},
+            "toRef": {"displayId": "main"},
+            "author": {"user": {"displayName": "Dev"}},
+        }
+        self._send(200, json.dumps(body).encode(), etag)
+
+    def _send(self, status: int, body: bytes, etag: str | None = None) -> None:
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def server() -> Iterator[StubBitbucket]:
+    """Run the stub server on a free local port."""
+    stub = StubBitbucket()
+    thread = threading.Thread(target=stub.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield stub
+    stub.shutdown()
+    stub.server_close()
+
+
+def pr_path(pr_id: int) -> str:
+    return BitbucketClient.pull_request_path("ETS", "tomahawk2", str(pr_id))
+
+
+def test_reuses_one_connection_for_sequential_requests(server: StubBitbucket) -> None:
+    client = BitbucketClient(server.url, "token")
+
+    for pr_id in range(5):
+        assert client.get_json(pr_path(pr_id))["title"] == f"PR {pr_id} v1"
+
+    assert client.stats["connections"] == 1
+    assert len({request["client_port"] for request in server.requests}) == 1
+    assert server.requests[0]["authorization"] == "Bearer token"
+    client.close()
+
+
+def test_fresh_cache_entry_skips_the_server(server: StubBitbucket, tmp_path: Path) -> None:
+    client = BitbucketClient(server.url, "token", cache_dir=tmp_path, ttl=300)
+
+    first = client.get_json(pr_path(1))
+    second = BitbucketClient(server.url, "token", cache_dir=tmp_path, ttl=300).get_json(pr_path(1))
+
+    assert first == second
+    assert len(server.requests) == 1
+
+
+def test_stale_cache_entry_is_revalidated_with_etag(
+    server: StubBitbucket, tmp_path: Path
+) -> None:
+    client = BitbucketClient(server.url, "token", cache_dir=tmp_path, ttl=0)
+
+    client.get_json(pr_path(1))
+    assert client.get_json(pr_path(1))["title"] == "PR 1 v1"
+
+    assert server.requests[1]["if_none_match"] == '"tomahawk2-1-v1"'
+    assert client.stats["not_modified"] == 1
+
+    # A changed resource fails the precondition and replaces the cached copy
+    server.version = 2
+    assert client.get_json(pr_path(1))["title"] == "PR 1 v2"
+    assert client.stats["not_modified"] == 1
+
+
+@pytest.mark.parametrize("content", ["{}", "[]", '{"fetched_at": "x", "data": 1}', "{trunc"])
+def test_malformed_cache_entry_is_ignored(
+    server: StubBitbucket, tmp_path: Path, content: str
+) -> None:
+    client = BitbucketClient(server.url, "token", cache_dir=tmp_path)
+    cache_file = client._cache_file(pr_path(1))
+    assert cache_file is not None
+    cache_file.write_text(content)
+
+    assert client.get_json(pr_path(1))["title"] == "PR 1 v1"
+    assert server.requests[0]["if_none_match"] is None
+    assert json.loads(cache_file.read_text())["etag"] == '"tomahawk2-1-v1"'
+
+
+def test_error_status_raises(server: StubBitbucket) -> None:
+    client = BitbucketClient(server.url, "token")
+
+    with pytest.raises(BitbucketError, match="HTTP 404"):
+        client.get_json("/rest/api/1.0/unknown")
+
+
+def test_get_many_returns_results_and_errors_in_order(server: StubBitbucket) -> None:
+    client = BitbucketClient(server.url, "token", pool_size=4)
+    paths = [pr_path(pr_id) for pr_id in range(12)] + ["/rest/api/1.0/unknown"]
+
+    results = client.get_many(paths)
+
+    assert [result["title"] for result in results[:-1]] == [f"PR {i} v1" for i in range(12)]
+    assert isinstance(results[-1], BitbucketError)
+    assert client.stats["connections"] <= 4
+
+
+def test_unreachable_server_raises() -> None:
+    stub = StubBitbucket()
+    url = stub.url
+    stub.server_close()
+
+    with pytest.raises(BitbucketError, match="Connection to 127.0.0.1 failed"):
+        BitbucketClient(url, "token", timeout=1).get_json(pr_path(1))
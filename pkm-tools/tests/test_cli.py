@@ -0,0 +1,166 @@
+"""Tests for the command-line interface."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from pkm_tools.cli import main
+from pkm_tools.config import PKMConfig
+from tests.conftest import make_system
+
+# Cumulative seconds ``import pkm_tools.cli`` may take (click itself needs about 40ms)
+IMPORT_BUDGET = 0.15
+
+# Modules only the commands that need them may import
+HEAVY_MODULES = {
+    "pkm_tools.config",
+    "pkm_tools.daemon",
+    "pkm_tools.repo_sync",
+    "pydantic",
+    "pydantic_settings",
+    "rich",
+    "yaml",
+}
+
+# Modules of the sync engine, which commands that only read the registry must not import
+SYNC_MODULES = {"pkm_tools.daemon", "pkm_tools.repo_sync"}
+
+
+def test_import_time_stays_within_budget() -> None:
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "import sys, pkm_tools.cli; print(' '.join(sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert not HEAVY_MODULES & set(result.stdout.split())
+    # Lines read "import time: <self us> | <cumulative us> | <module>"
+    [line] = [line for line in result.stderr.splitlines() if line.endswith("| pkm_tools.cli")]
+    cumulative = int(line.split("|")[1]) / 1e6
+    assert cumulative < IMPORT_BUDGET, f"import pkm_tools.cli took {cumulative:.3f}s"
+
+
+def test_help_does_not_load_configuration(monkeypatch: pytest.MonkeyPatch) -> None:
+    # An invalid root would fail any command that builds the configuration
+    monkeypatch.setenv("PKM_PKM_ROOT", "/nonexistent")
+
+    result = CliRunner().invoke(main, ["sync", "--help"])
+
+    assert result.exit_code == 0
+    assert "Sync repositories" in result.output
+
+
+@pytest.mark.parametrize(
+    "args", [["list-systems"], ["list-repos", "--system", "thk"], ["list-repos", "--system", "nope"]]
+)
+def test_registry_commands_do_not_load_the_sync_engine(pkm_root: Path, args: list) -> None:
+    make_system(pkm_root, "thk", ["git@host:ets/alpha.git"])
+    env = {name: value for name, value in os.environ.items() if not name.startswith("PKM_")}
+    script = (
+        "import sys\n"
+        "from click.testing import CliRunner\n"
+        "from pkm_tools.cli import main\n"
+        "CliRunner().invoke(main, sys.argv[1:])\n"
+        "print(' '.join(sys.modules))\n"
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-c", script, *args],
+        env={**env, "PKM_PKM_ROOT": str(pkm_root)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert "pkm_tools.registry" in result.stdout.split()
+    assert not SYNC_MODULES & set(result.stdout.split())
+
+
+def test_list_repos(pkm_root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    make_system(pkm_root, "thk", ["git@host:ets/alpha.git", "git@host:ets/beta.git"])
+    monkeypatch.setenv("PKM_PKM_ROOT", str(pkm_root))
+
+    result = CliRunner().invoke(main, ["list-repos", "--system", "thk"])
+
+    assert result.exit_code == 0, result.output
+    assert "git@host:ets/alpha.git" in result.output
+    assert "git@host:ets/beta.git" in result.output
+
+
+def test_list_repos_jsonl(pkm_root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    make_system(pkm_root, "thk", ["git@host:ets/alpha.git", "git@host:ets/beta.git"])
+    monkeypatch.setenv("PKM_PKM_ROOT", str(pkm_root))
+
+    result = CliRunner().invoke(main, ["list-repos", "--system", "thk", "--format", "jsonl"])
+
+    assert result.exit_code == 0, result.output
+    assert [json.loads(line) for line in result.stdout.splitlines()] == [
+        {"system": "thk", "name": "alpha", "url": "git@host:ets/alpha.git"},
+        {"system": "thk", "name": "beta", "url": "git@host:ets/beta.git"},
+    ]
+
+
+def test_sync_streams_one_record_per_repository(
+    config: PKMConfig, origin: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    make_system(config.pkm_root, "thk", [str(origin)])
+    monkeypatch.setenv("PKM_PKM_ROOT", str(config.pkm_root))
+    monkeypatch.setenv("PKM_SSH_MULTIPLEX", "false")
+
+    result = CliRunner().invoke(main, ["clone", "--system", "thk", "--format", "jsonl"])
+
+    assert result.exit_code == 0, result.output
+    [record] = [json.loads(line) for line in result.stdout.splitlines()]
+    assert record["system"] == "thk"
+    assert record["name"] == "origin"
+    assert record["status"] == "success"
+
+    result = CliRunner().invoke(main, ["status", "--system", "thk", "--format", "json"])
+
+    assert result.exit_code == 0, result.output
+    [status] = json.loads(result.stdout)["systems"]["thk"]
+    assert status["name"] == "origin"
+    assert status["branch"] == "main"
+
+
+@pytest.mark.parametrize("command", ["status", "branches"])
+def test_daemon_answers_only_when_asked(
+    config: PKMConfig, origin: Path, monkeypatch: pytest.MonkeyPatch, command: str
+) -> None:
+    make_system(config.pkm_root, "thk", [str(origin)])
+    monkeypatch.setenv("PKM_PKM_ROOT", str(config.pkm_root))
+    asked = []
+    monkeypatch.setattr(
+        "pkm_tools.daemon.query_daemon",
+        lambda socket_path, command, **kwargs: asked.append(command),
+    )
+
+    assert CliRunner().invoke(main, [command, "--system", "thk"]).exit_code == 0
+    assert asked == []
+    assert CliRunner().invoke(main, [command, "--system", "thk", "--daemon"]).exit_code == 0
+    assert asked == [command]
+
+
+def test_systems_are_discovered_on_disk(pkm_root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    make_system(pkm_root, "risk", ["git@host:risk/engine.git"])
+    monkeypatch.setenv("PKM_PKM_ROOT", str(pkm_root))
+
+    result = CliRunner().invoke(main, ["list-repos", "--system", "risk", "--format", "jsonl"])
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.stdout)["name"] == "engine"
+
+    result = CliRunner().invoke(main, ["branches", "--system", "thk"])
+    assert result.exit_code == 2
+    assert "'thk' is not one of 'risk', 'all'." in result.output
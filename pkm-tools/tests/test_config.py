@@ -0,0 +1,79 @@
+"""Tests for PKM configuration."""
+
+from pathlib import Path
+
+import pytest
+
+from pkm_tools.config import CloneOptions, PKMConfig
+from tests.conftest import make_system
+
+
+def test_clone_options_git_args() -> None:
+    assert CloneOptions().git_args() == []
+    assert CloneOptions(depth=1, filter="blob:none", single_branch=True).git_args() == [
+        "--depth=1",
+        "--filter=blob:none",
+        "--single-branch",
+    ]
+    assert CloneOptions(single_branch=False).git_args() == ["--no-single-branch"]
+
+
+def test_clone_options_git_args_leave_mirror_options_to_caller() -> None:
+    assert CloneOptions(reference=True, dissociate=True).git_args() == []
+
+
+def test_clone_options_merged_prefers_set_overrides() -> None:
+    base = CloneOptions(depth=5, filter="blob:none", single_branch=True)
+
+    merged = base.merged(CloneOptions(depth=1, single_branch=False))
+
+    assert merged == CloneOptions(depth=1, filter="blob:none", single_branch=False)
+    assert base.merged(None) is base
+    assert base.depth == 5
+
+
+def test_clone_options_reject_invalid_depth() -> None:
+    with pytest.raises(ValueError, match="greater than or equal to 1"):
+        CloneOptions(depth=0)
+
+
+def test_get_clone_options_defaults_to_environment(
+    pkm_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    make_system(pkm_root, "thk", [])
+    monkeypatch.setenv("PKM_CLONE_DEPTH", "3")
+    monkeypatch.setenv("PKM_CLONE_SINGLE_BRANCH", "true")
+
+    options = PKMConfig(pkm_root=pkm_root).get_clone_options("thk")
+
+    assert options == CloneOptions(depth=3, single_branch=True)
+
+
+def test_get_clone_options_system_yaml_overrides_environment(
+    pkm_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    make_system(pkm_root, "thk", [])
+    (pkm_root / "systems" / "thk" / "system.yaml").write_text(
+        "clone:\n  depth: 1\n  filter: blob:none\n"
+    )
+    monkeypatch.setenv("PKM_CLONE_DEPTH", "3")
+    monkeypatch.setenv("PKM_CLONE_SINGLE_BRANCH", "true")
+
+    options = PKMConfig(pkm_root=pkm_root).get_clone_options("thk")
+
+    assert options == CloneOptions(depth=1, filter="blob:none", single_branch=True)
+
+
+def test_system_config_must_be_a_mapping(config: PKMConfig, pkm_root: Path) -> None:
+    make_system(pkm_root, "thk", [])
+    (pkm_root / "systems" / "thk" / "system.yaml").write_text("- depth\n")
+
+    with pytest.raises(ValueError, match="must be a mapping"):
+        config.get_clone_options("thk")
+
+
+def test_missing_system_yaml_is_empty(config: PKMConfig, pkm_root: Path) -> None:
+    make_system(pkm_root, "thk", [])
+
+    assert config.get_system_config("thk") == {}
+    assert config.get_clone_options("thk") == CloneOptions()
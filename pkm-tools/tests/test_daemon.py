@@ -0,0 +1,97 @@
+"""Tests for the background fetch daemon."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from pkm_tools.daemon import SyncDaemon, next_interval
+from pkm_tools.repo_sync import RepositorySync
+from tests.conftest import git, make_system
+
+
+def test_next_interval_adapts_within_bounds() -> None:
+    assert next_interval(100, changed=True, min_interval=60, max_interval=3600) == 60
+    assert next_interval(200, changed=True, min_interval=60, max_interval=3600) == 100
+    assert next_interval(100, changed=False, min_interval=60, max_interval=3600) == 150
+    assert next_interval(3000, changed=False, min_interval=60, max_interval=3600) == 3600
+
+
+@pytest.fixture
+def watched_repo(sync: RepositorySync, pkm_root: Path, origin: Path) -> Path:
+    service_repos_dir = make_system(pkm_root, "thk", [f"file://{origin}"])
+    repo_path = service_repos_dir / "origin"
+    git(pkm_root, "clone", "-q", str(origin), str(repo_path))
+    return repo_path
+
+
+async def _stop(daemon: SyncDaemon) -> None:
+    for worker in daemon._workers.values():
+        worker.cancel()
+    await asyncio.gather(*daemon._workers.values(), return_exceptions=True)
+
+
+def test_rescan_reports_status_and_branches(sync: RepositorySync, watched_repo: Path) -> None:
+    daemon = SyncDaemon(sync, min_interval=3600)
+    assert daemon._respond({"command": "branches", "systems": ["thk"]}) == {
+        "ok": False,
+        "error": "pkm daemon has not finished its first scan",
+    }
+
+    async def scenario() -> None:
+        await daemon._rescan()
+        await _stop(daemon)
+
+    asyncio.run(scenario())
+
+    response = daemon._respond({"command": "branches", "systems": ["thk"]})
+    assert response["ok"]
+    assert response["systems"]["thk"][0]["branch"] == "main"
+    assert daemon._respond({"command": "status"})["systems"]["thk"][0]["dirty"] is False
+    assert daemon._respond({"command": "status", "systems": ["GCP"]}) == {
+        "ok": False,
+        "error": "Unknown systems: GCP",
+    }
+
+
+def test_worker_survives_unexpected_fetch_errors(
+    sync: RepositorySync, watched_repo: Path
+) -> None:
+    daemon = SyncDaemon(sync, min_interval=0.01, max_interval=0.01)
+    fetches = []
+
+    async def failing_fetch(repo_url: str, repo_path: Path) -> bool:
+        fetches.append(repo_path)
+        raise FileNotFoundError(repo_path)
+
+    daemon._fetch = failing_fetch
+
+    async def scenario() -> bool:
+        await daemon._rescan()
+        await asyncio.sleep(0.1)
+        alive = not daemon._workers[watched_repo].done()
+        await _stop(daemon)
+        return alive
+
+    assert asyncio.run(scenario())
+    assert len(fetches) > 1
+
+
+def test_rescan_restarts_finished_workers(sync: RepositorySync, watched_repo: Path) -> None:
+    daemon = SyncDaemon(sync, min_interval=3600)
+    started = []
+
+    async def crashing_watch(repo_url: str, repo_path: Path) -> None:
+        started.append(repo_path)
+        raise RuntimeError("boom")
+
+    daemon._watch = crashing_watch
+
+    async def scenario() -> None:
+        await daemon._rescan()
+        await asyncio.sleep(0)
+        await daemon._rescan()
+        await _stop(daemon)
+
+    asyncio.run(scenario())
+    assert started == [watched_repo, watched_repo]
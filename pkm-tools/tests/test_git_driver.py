@@ -0,0 +1,110 @@
+"""Tests for the asyncio git driver."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from pkm_tools.git_driver import AsyncGit, GitCommandError, parse_porcelain_v2
+from tests.conftest import commit, git
+
+
+def test_parse_porcelain_v2_branch_and_counts() -> None:
+    output = "\n".join(
+        [
+            "# branch.oid 1234abcd",
+            "# branch.head main",
+            "# branch.upstream origin/main",
+            "# branch.ab +2 -3",
+            "1 .M N... 100644 100644 100644 aaa bbb src/app.py",
+            "2 R. N... 100644 100644 100644 aaa bbb R100 new.py\told.py",
+            "u UU N... 100644 100644 100644 100644 aaa bbb ccc conflict.py",
+            "? notes.txt",
+            "? build/",
+        ]
+    )
+
+    summary = parse_porcelain_v2(output)
+
+    assert summary.commit == "1234abcd"
+    assert summary.branch == "main"
+    assert summary.upstream == "origin/main"
+    assert (summary.ahead, summary.behind) == (2, 3)
+    assert summary.changed == 3
+    assert summary.untracked == 2
+
+
+def test_parse_porcelain_v2_detached_initial_without_upstream() -> None:
+    summary = parse_porcelain_v2("# branch.oid (initial)\n# branch.head (detached)\n")
+
+    assert summary.commit is None
+    assert summary.branch is None
+    assert summary.upstream is None
+    assert summary.ahead is None
+    assert (summary.changed, summary.untracked) == (0, 0)
+
+
+def test_rev_parse_and_current_branch(clone: Path) -> None:
+    driver = AsyncGit()
+    head = git(clone, "rev-parse", "HEAD")
+
+    assert asyncio.run(driver.rev_parse(clone, "HEAD")) == head
+    assert asyncio.run(driver.rev_parse(clone, "origin/main")) == head
+    assert asyncio.run(driver.rev_parse(clone, "origin/missing")) is None
+    assert asyncio.run(driver.current_branch(clone)) == "main"
+
+    git(clone, "checkout", "-q", "--detach")
+    assert asyncio.run(driver.current_branch(clone)) is None
+
+
+def test_ahead_behind(clone: Path) -> None:
+    driver = AsyncGit()
+    git(clone, "reset", "-q", "--hard", "HEAD~1")
+    commit(clone, "local.txt")
+    commit(clone, "local2.txt")
+
+    assert asyncio.run(driver.ahead_behind(clone, "HEAD", "origin/main")) == (2, 1)
+    assert asyncio.run(driver.ahead_behind(clone, "HEAD", "origin/missing")) is None
+
+
+def test_status_counts_changes_and_untracked(clone: Path) -> None:
+    driver = AsyncGit()
+    (clone / "README.md").write_text("changed")
+    (clone / "scratch.txt").write_text("new")
+
+    summary = asyncio.run(driver.status(clone))
+    assert summary.branch == "main"
+    assert summary.changed == 1
+    assert summary.untracked == 0
+
+    assert asyncio.run(driver.status(clone, untracked=True)).untracked == 1
+
+
+def test_run_raises_with_stderr(tmp_path: Path) -> None:
+    with pytest.raises(GitCommandError) as error:
+        asyncio.run(AsyncGit().run("rev-parse", "HEAD", cwd=tmp_path))
+
+    assert error.value.returncode != 0
+    assert "not a git repository" in error.value.stderr
+
+
+def test_run_streams_progress_lines(tmp_path: Path, origin: Path) -> None:
+    lines = []
+
+    asyncio.run(
+        AsyncGit().run(
+            "clone", "--progress", str(origin), str(tmp_path / "copy"), progress=lines.append
+        )
+    )
+
+    assert any(line.startswith("Cloning into") for line in lines)
+
+
+def test_semaphore_is_recreated_per_event_loop(clone: Path) -> None:
+    driver = AsyncGit(concurrency=2)
+
+    async def heads() -> list:
+        return await asyncio.gather(*(driver.rev_parse(clone, "HEAD") for _ in range(5)))
+
+    assert len(set(asyncio.run(heads()))) == 1
+    assert len(set(asyncio.run(heads()))) == 1
@@ -0,0 +1,134 @@
+"""Tests for per-host scheduling of git network operations."""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from pkm_tools.git_driver import GitCommandError
+from pkm_tools.hosts import LOCAL_HOST, HostLimiter, HostScheduler, is_transient, remote_host
+
+
+@pytest.mark.parametrize(
+    ("repo_url", "host"),
+    [
+        ("ssh://git@mangit.maninvestments.com:7999/ets/repo.git", "mangit.maninvestments.com:7999"),
+        ("https://github.com/org/repo.git", "github.com"),
+        ("https://bitbucket.example.com:8443/scm/ets/repo.git", "bitbucket.example.com:8443"),
+        ("git@github.com:org/repo.git", "github.com"),
+        ("file:///srv/git/repo.git", LOCAL_HOST),
+        ("/srv/git/repo.git", LOCAL_HOST),
+    ],
+)
+def test_remote_host(repo_url: str, host: str) -> None:
+    assert remote_host(repo_url) == host
+
+
+@pytest.mark.parametrize(
+    ("stderr", "transient"),
+    [
+        ("fatal: the remote end hung up unexpectedly", True),
+        ("ssh: connect to host example.com port 22: Connection timed out", True),
+        ("error: RPC failed; HTTP 502 curl 22 The requested URL returned error: 502", True),
+        ("fatal: unable to access '...': Could not resolve host: example.com", True),
+        ("fatal: repository 'https://example.com/missing.git/' not found", False),
+        ("Permission denied (publickey).", False),
+    ],
+)
+def test_is_transient(stderr: str, transient: bool) -> None:
+    assert is_transient(GitCommandError(["fetch"], 128, stderr)) is transient
+
+
+def release(limiter: HostLimiter, latency: float, kind: str, congested: bool = False) -> None:
+    """Run one operation of the given latency through the limiter."""
+
+    async def run() -> None:
+        epoch = await limiter.acquire()
+        await limiter.release(epoch, latency, congested=congested, kind=kind)
+
+    asyncio.run(run())
+
+
+def test_slow_kind_does_not_count_as_congestion() -> None:
+    limiter = HostLimiter("host", initial=4, maximum=8)
+
+    for _ in range(20):
+        release(limiter, 0.1, "ls-remote")
+    limit = limiter.limit
+    for _ in range(5):
+        release(limiter, 1.0, "fetch")
+
+    assert limiter.limit > limit
+    assert limiter.epoch == 0
+
+
+def test_latency_spike_halves_limit_once_per_epoch() -> None:
+    limiter = HostLimiter("host", initial=8, maximum=8)
+    for _ in range(5):
+        release(limiter, 1.0, "fetch")
+
+    async def burst() -> None:
+        epochs = [await limiter.acquire() for _ in range(2)]
+        for epoch in epochs:
+            await limiter.release(epoch, 100.0, kind="fetch")
+
+    asyncio.run(burst())
+
+    assert limiter.limit == 4
+    assert limiter.epoch == 1
+
+
+def test_first_samples_of_a_kind_never_signal_congestion() -> None:
+    limiter = HostLimiter("host", initial=4, maximum=8)
+
+    release(limiter, 0.1, "clone")
+    release(limiter, 5.0, "clone")
+
+    assert limiter.epoch == 0
+
+
+def test_transient_error_halves_limit() -> None:
+    limiter = HostLimiter("host", initial=4, maximum=8)
+
+    release(limiter, 0.1, "fetch", congested=True)
+
+    assert limiter.limit == 2
+    assert limiter.epoch == 1
+
+
+def test_additive_increase_is_capped() -> None:
+    limiter = HostLimiter("host", initial=2, maximum=3)
+
+    for _ in range(20):
+        release(limiter, 0.1, "fetch")
+
+    assert limiter.limit == 3
+
+
+def test_scheduler_retries_transient_errors() -> None:
+    scheduler = HostScheduler(retries=2, backoff=0.0)
+    attempts: List[int] = []
+
+    async def flaky() -> str:
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise GitCommandError(["fetch"], 128, "fatal: the remote end hung up unexpectedly")
+        return "done"
+
+    assert asyncio.run(scheduler.run("git@github.com:org/repo.git", flaky, "fetch")) == "done"
+    assert len(attempts) == 3
+    assert scheduler.report()["github.com"]["retries"] == 2
+
+
+def test_scheduler_does_not_retry_permanent_errors() -> None:
+    scheduler = HostScheduler(retries=2, backoff=0.0)
+    attempts: List[int] = []
+
+    async def missing() -> str:
+        attempts.append(1)
+        raise GitCommandError(["fetch"], 128, "fatal: repository not found")
+
+    with pytest.raises(GitCommandError):
+        asyncio.run(scheduler.run("git@github.com:org/repo.git", missing, "fetch"))
+    assert len(attempts) == 1
+    assert scheduler.report()["github.com"]["failed"] == 1
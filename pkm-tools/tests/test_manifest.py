@@ -0,0 +1,97 @@
+"""Tests for structured repository manifests."""
+
+from pathlib import Path
+
+import pytest
+
+from pkm_tools.manifest import (
+    RepositorySpec,
+    find_repository_manifest,
+    read_repository_manifest,
+)
+
+TOMAHAWK = "ssh://git@mangit.maninvestments.com:7999/ets/tomahawk2.git"
+COMMON = "ssh://git@mangit.maninvestments.com:7999/lib/common.git"
+
+
+def test_read_yaml_manifest(tmp_path: Path) -> None:
+    manifest = tmp_path / "repositories.yaml"
+    manifest.write_text(
+        "repositories:\n"
+        f"  - url: {TOMAHAWK}\n"
+        "    branch: develop\n"
+        "    shallow: true\n"
+        "    priority: high\n"
+        "    sparse: [src/core/, docs]\n"
+        f"  - {COMMON}\n"
+    )
+
+    specs = read_repository_manifest(manifest)
+
+    assert specs == [
+        RepositorySpec(TOMAHAWK, "develop", 1, "high", ("src/core", "docs")),
+        RepositorySpec(COMMON),
+    ]
+    assert specs[0].name == "tomahawk2"
+    assert specs[0].rank < specs[1].rank
+    assert not hasattr(specs[0], "__dict__")
+
+
+def test_read_toml_manifest(tmp_path: Path) -> None:
+    manifest = tmp_path / "repositories.toml"
+    manifest.write_text(
+        f'[[repositories]]\nurl = "{TOMAHAWK}"\ndepth = 5\npriority = "low"\n'
+        f'[[repositories]]\nurl = "{COMMON}"\nsparse = "include"\n'
+    )
+
+    assert read_repository_manifest(manifest) == [
+        RepositorySpec(TOMAHAWK, depth=5, priority="low"),
+        RepositorySpec(COMMON, sparse=("include",)),
+    ]
+
+
+def test_spec_round_trips_through_dict() -> None:
+    spec = RepositorySpec(TOMAHAWK, "develop", 1, "high", ("src",))
+
+    assert RepositorySpec.from_dict(spec.to_dict()) == spec
+    assert RepositorySpec(COMMON).to_dict() == {"url": COMMON}
+
+
+@pytest.mark.parametrize(
+    ("entry", "error"),
+    [
+        ("- 42", "expected a URL or a mapping"),
+        ("- branch: main", "url is required"),
+        (f"- {{url: {TOMAHAWK}, colour: blue}}", "unknown options colour"),
+        (f"- {{url: {TOMAHAWK}, depth: 0}}", "depth must be a positive integer"),
+        (f"- {{url: {TOMAHAWK}, shallow: yes please}}", "shallow must be true or false"),
+        (f"- {{url: {TOMAHAWK}, priority: urgent}}", "priority must be one of high"),
+        (f"- {{url: {TOMAHAWK}, sparse: [1]}}", "sparse must be a list"),
+    ],
+)
+def test_invalid_entries_raise(tmp_path: Path, entry: str, error: str) -> None:
+    manifest = tmp_path / "repositories.yaml"
+    manifest.write_text(f"repositories:\n  {entry}\n")
+
+    with pytest.raises(ValueError, match=error):
+        read_repository_manifest(manifest)
+
+
+@pytest.mark.parametrize("content", ["[1, 2]", "repositories: {}", "repositories: [unclosed"])
+def test_malformed_manifest_raises(tmp_path: Path, content: str) -> None:
+    manifest = tmp_path / "repositories.yaml"
+    manifest.write_text(content)
+
+    with pytest.raises(ValueError, match="manifest"):
+        read_repository_manifest(manifest)
+
+
+def test_find_repository_manifest(tmp_path: Path) -> None:
+    assert find_repository_manifest(tmp_path) is None
+
+    (tmp_path / "repositories.toml").write_text("")
+    assert find_repository_manifest(tmp_path) == tmp_path / "repositories.toml"
+
+    (tmp_path / "repositories.yaml").write_text("")
+    with pytest.raises(ValueError, match="Use only one of"):
+        find_repository_manifest(tmp_path)
@@ -0,0 +1,86 @@
+"""Tests for the shared bare mirror cache."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from pkm_tools.git_driver import AsyncGit
+from pkm_tools.mirror import MirrorCache
+from tests.conftest import commit, git
+
+
+@pytest.fixture
+def mirrors(tmp_path: Path) -> MirrorCache:
+    return MirrorCache(tmp_path / "mirrors", AsyncGit())
+
+
+def push_commit(tmp_path: Path, origin: Path, name: str) -> str:
+    """Commit a file in the origin's work tree and push it to ``origin``."""
+    work = tmp_path / "origin-work"
+    sha = commit(work, name)
+    git(work, "push", "-q", str(origin), "main")
+    return sha
+
+
+def test_update_creates_then_refreshes_the_mirror(
+    mirrors: MirrorCache, tmp_path: Path, origin: Path
+) -> None:
+    url = f"file://{origin}"
+
+    created = asyncio.run(mirrors.update(url))
+
+    assert created["action"] == "created"
+    assert created["path"] == mirrors.path_for(url)
+    assert mirrors.list_mirrors() == [created["path"]]
+    assert git(created["path"], "rev-parse", "--is-bare-repository") == "true"
+    assert git(created["path"], "config", "gc.pruneExpire") == "never"
+
+    assert asyncio.run(mirrors.update(url))["had_changes"] is False
+    sha = push_commit(tmp_path, origin, "new.txt")
+    updated = asyncio.run(mirrors.update(url))
+
+    assert (updated["action"], updated["had_changes"]) == ("updated", True)
+    assert git(updated["path"], "rev-parse", "refs/heads/main") == sha
+
+
+def test_ensure_refreshes_only_when_asked(
+    mirrors: MirrorCache, tmp_path: Path, origin: Path
+) -> None:
+    url = f"file://{origin}"
+    path = asyncio.run(mirrors.ensure(url, refresh=False))
+    before = git(path, "rev-parse", "refs/heads/main")
+    sha = push_commit(tmp_path, origin, "new.txt")
+
+    assert asyncio.run(mirrors.ensure(url, refresh=False)) == path
+    assert git(path, "rev-parse", "refs/heads/main") == before
+    assert asyncio.run(mirrors.ensure(url)) == path
+    assert git(path, "rev-parse", "refs/heads/main") == sha
+
+
+def test_source_config_redirects_the_url_to_the_mirror(
+    mirrors: MirrorCache, origin: Path
+) -> None:
+    url = f"file://{origin}"
+    assert mirrors.source_args(url) == []
+
+    path = asyncio.run(mirrors.ensure(url))
+
+    assert mirrors.source_args(url) == ["-c", f"url.{path.resolve().as_uri()}.insteadOf={url}"]
+
+
+def test_locks_are_recreated_per_event_loop(mirrors: MirrorCache, origin: Path) -> None:
+    url = f"file://{origin}"
+
+    async def concurrent_updates() -> list:
+        # Contended locks bind to the running loop
+        return await asyncio.gather(mirrors.update(url), mirrors.update(url))
+
+    assert {result["action"] for result in asyncio.run(concurrent_updates())} == {
+        "created",
+        "updated",
+    }
+    assert [result["action"] for result in asyncio.run(concurrent_updates())] == [
+        "updated",
+        "updated",
+    ]
@@ -0,0 +1,68 @@
+"""Tests for per-phase timing."""
+
+import asyncio
+import json
+from pathlib import Path
+
+from pkm_tools.profiling import PhaseProfiler, sum_phases
+
+
+def test_spans_are_attributed_to_the_repository_of_their_task() -> None:
+    profiler = PhaseProfiler()
+
+    async def operation(repo_name: str) -> dict:
+        with profiler.repository("thk", repo_name) as phases:
+            with profiler.phase("fetch"):
+                await asyncio.sleep(0)
+            with profiler.phase("fetch"):
+                await asyncio.sleep(0)
+            with profiler.phase("merge"):
+                await asyncio.sleep(0)
+        return phases
+
+    async def run() -> list:
+        with profiler.phase("probe"):
+            await asyncio.sleep(0)
+        return await asyncio.gather(operation("alpha"), operation("beta"))
+
+    alpha, beta = asyncio.run(run())
+
+    assert set(alpha) == set(beta) == {"fetch", "merge"}
+    spans = {(span["repo"], span["phase"]) for span in profiler.spans}
+    assert spans == {
+        (None, "probe"),
+        ("alpha", "fetch"),
+        ("alpha", "merge"),
+        ("beta", "fetch"),
+        ("beta", "merge"),
+    }
+    assert len(profiler.spans) == 7
+    assert all(span["system"] == "thk" for span in profiler.spans if span["repo"] is not None)
+    assert set(profiler.run_phases()) == {"probe"}
+
+    profiler.reset()
+    assert profiler.spans == []
+    assert profiler.run_phases() == {}
+
+
+def test_write_trace_appends_one_json_span_per_line(tmp_path: Path) -> None:
+    profiler = PhaseProfiler()
+    with profiler.repository("thk", "alpha"), profiler.phase("clone"):
+        pass
+    trace = tmp_path / "traces" / "sync.jsonl"
+
+    profiler.write_trace(trace)
+    profiler.write_trace(trace)
+
+    spans = [json.loads(line) for line in trace.read_text().splitlines()]
+    assert len(spans) == 2
+    assert set(spans[0]) == {"system", "repo", "phase", "start", "duration"}
+    assert (spans[0]["system"], spans[0]["repo"], spans[0]["phase"]) == ("thk", "alpha", "clone")
+    assert spans[0]["duration"] >= 0
+
+
+def test_sum_phases() -> None:
+    assert sum_phases([{"fetch": 1.0, "merge": 0.5}, {"fetch": 2.0}, {}]) == {
+        "fetch": 3.0,
+        "merge": 0.5,
+    }
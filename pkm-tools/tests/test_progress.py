@@ -0,0 +1,39 @@
+"""Tests for git progress parsing."""
+
+from pkm_tools.progress import parse_git_progress, strip_git_progress
+
+
+def test_parse_git_progress_percent_line() -> None:
+    info = parse_git_progress("Receiving objects:  45% (450/1000), 1.20 MiB | 2.40 MiB/s")
+
+    assert info == {
+        "phase": "Receiving objects",
+        "percent": 45,
+        "done": 450,
+        "total": 1000,
+        "size": "1.20 MiB",
+        "rate": "2.40 MiB/s",
+    }
+
+
+def test_parse_git_progress_remote_count_line() -> None:
+    assert parse_git_progress("remote: Enumerating objects: 12, done.") == {
+        "phase": "Enumerating objects",
+        "done": 12,
+    }
+
+
+def test_parse_git_progress_ignores_other_lines() -> None:
+    assert parse_git_progress("fatal: could not read from remote repository.") is None
+    assert parse_git_progress("Cloning into 'repo'...") is None
+
+
+def test_strip_git_progress_keeps_only_messages() -> None:
+    stderr = (
+        "remote: Counting objects:  50% (1/2)\rremote: Counting objects: 100% (2/2), done.\n"
+        "Receiving objects:  10% (1/10)\rReceiving objects: 100% (10/10), done.\n"
+        "error: RPC failed; curl 18 transfer closed\n"
+        "fatal: early EOF\n"
+    )
+
+    assert strip_git_progress(stderr) == "error: RPC failed; curl 18 transfer closed\nfatal: early EOF"
@@ -0,0 +1,161 @@
+"""Tests for the cached repository registry."""
+
+from pathlib import Path
+
+import pytest
+
+from pkm_tools import registry as registry_module
+from pkm_tools.config import PKMConfig
+from pkm_tools.manifest import RepositorySpec
+from pkm_tools.registry import RepositoryRegistry, repo_project
+from tests.conftest import make_system
+
+TOMAHAWK = "ssh://git@mangit.maninvestments.com:7999/ets/tomahawk2.git"
+SHARED = "ssh://git@mangit.maninvestments.com:7999/lib/common.git"
+GCP_APP = "https://mangit.maninvestments.com/scm/GCP/app.git"
+
+
+@pytest.mark.parametrize(
+    ("repo_url", "project"),
+    [
+        (TOMAHAWK, "ets"),
+        (GCP_APP, "gcp"),
+        ("git@github.com:Org/repo.git", "org"),
+        ("repo.git", None),
+    ],
+)
+def test_repo_project(repo_url: str, project: str | None) -> None:
+    assert repo_project(repo_url) == project
+
+
+@pytest.fixture
+def systems(pkm_root: Path) -> Path:
+    make_system(pkm_root, "thk", [TOMAHAWK, SHARED])
+    make_system(pkm_root, "GCP", [GCP_APP, SHARED])
+    (pkm_root / "systems" / "empty").mkdir()
+    return pkm_root
+
+
+def test_lookups(config: PKMConfig, systems: Path) -> None:
+    registry = RepositoryRegistry(config)
+
+    assert sorted(registry.systems()) == ["GCP", "empty", "thk"]
+    assert registry.repositories("thk") == [TOMAHAWK, SHARED]
+
+    [entry] = registry.find("tomahawk2")
+    assert entry["system"] == "thk"
+    assert entry["path"] == systems / "systems" / "thk" / "service-repositories" / "tomahawk2"
+    assert registry.find(TOMAHAWK) == [entry]
+    assert registry.find_slug("ETS", "tomahawk2") == [entry]
+    assert registry.find_slug("GCP", "tomahawk2") == []
+    assert sorted(entry["system"] for entry in registry.find("common")) == ["GCP", "thk"]
+    assert registry.find("missing") == []
+
+
+def test_missing_systems_and_lists_raise(config: PKMConfig, systems: Path) -> None:
+    registry = RepositoryRegistry(config)
+
+    with pytest.raises(ValueError, match="Repository list file does not exist"):
+        registry.repositories("empty")
+    with pytest.raises(ValueError, match="System directory does not exist"):
+        registry.repositories("unknown")
+
+
+def test_cache_is_reused_until_a_list_changes(
+    config: PKMConfig, systems: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    RepositoryRegistry(config).systems()
+    assert config.registry_file.exists()
+
+    def fail(_: Path) -> list:
+        raise AssertionError("repository list parsed again")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(registry_module, "read_repository_list", fail)
+        assert RepositoryRegistry(config).repositories("GCP") == [GCP_APP, SHARED]
+
+    # Appending to a list changes its size and modification time
+    make_system(systems, "GCP", [GCP_APP])
+    make_system(systems, "man-oms", [TOMAHAWK])
+
+    registry = RepositoryRegistry(config)
+    assert registry.repositories("GCP") == [GCP_APP]
+    assert sorted(entry["system"] for entry in registry.find("tomahawk2")) == ["man-oms", "thk"]
+
+
+def test_in_memory_index_follows_changes(config: PKMConfig, systems: Path) -> None:
+    registry = RepositoryRegistry(config, persist=False, check_interval=0)
+    assert registry.find("app")
+
+    make_system(systems, "GCP", [SHARED])
+
+    assert registry.find("app") == []
+    assert not config.registry_file.exists()
+
+
+def test_sources_are_checked_once_per_interval(
+    config: PKMConfig, systems: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    registry = RepositoryRegistry(config, check_interval=60)
+    registry.systems()
+
+    def fail(_: Path) -> None:
+        raise AssertionError("sources checked again")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(registry_module, "_stamp", fail)
+        for _ in range(3):
+            assert registry.repositories("thk") == [TOMAHAWK, SHARED]
+
+
+def test_system_manifest(config: PKMConfig, systems: Path) -> None:
+    (systems / "systems" / "thk" / "system.yaml").write_text(
+        f"repositories:\n  - {GCP_APP}\n  - {SHARED}\n"
+        "concurrency: 2\nbranches:\n  tomahawk2: develop\nclone:\n  depth: 1\n"
+    )
+    # A manifest listing repositories needs no repository-list.txt
+    (systems / "systems" / "empty" / "system.yaml").write_text(f"repositories: [{TOMAHAWK}]\n")
+
+    registry = RepositoryRegistry(config)
+
+    assert registry.repositories("thk") == [TOMAHAWK, SHARED, GCP_APP]
+    assert registry.repositories("empty") == [TOMAHAWK]
+    manifest = RepositoryRegistry(config).manifest("thk")
+    assert manifest.concurrency == 2
+    assert manifest.branches == {"tomahawk2": "develop"}
+    assert config.get_clone_options("thk", manifest).depth == 1
+    assert RepositoryRegistry(config).manifest("GCP").concurrency is None
+
+
+def test_invalid_manifest_fails_its_system_only(config: PKMConfig, systems: Path) -> None:
+    (systems / "systems" / "thk" / "system.yaml").write_text("concurrency: 0\n")
+
+    registry = RepositoryRegistry(config)
+
+    with pytest.raises(ValueError, match="concurrency"):
+        registry.repositories("thk")
+    with pytest.raises(ValueError, match="concurrency"):
+        registry.manifest("thk")
+    assert registry.repositories("GCP") == [GCP_APP, SHARED]
+
+
+def test_repository_manifest_adds_repositories_and_options(
+    config: PKMConfig, systems: Path
+) -> None:
+    service_dir = systems / "systems" / "thk" / "service-repositories"
+    (service_dir / "repositories.yaml").write_text(
+        f"repositories:\n  - {{url: {TOMAHAWK}, shallow: true, priority: high}}\n"
+        f"  - {GCP_APP}\n"
+    )
+    RepositoryRegistry(config).systems()
+
+    registry = RepositoryRegistry(config)
+
+    assert registry.repositories("thk") == [TOMAHAWK, SHARED, GCP_APP]
+    assert registry.spec("thk", TOMAHAWK) == RepositorySpec(TOMAHAWK, depth=1, priority="high")
+    assert registry.spec("thk", GCP_APP) == RepositorySpec(GCP_APP)
+    assert registry.spec("GCP", TOMAHAWK) == RepositorySpec(TOMAHAWK)
+
+    # A manifest alone is enough; repository-list.txt is optional
+    (service_dir / "repository-list.txt").unlink()
+    assert RepositoryRegistry(config).repositories("thk") == [TOMAHAWK, GCP_APP]
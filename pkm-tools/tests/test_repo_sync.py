@@ -0,0 +1,517 @@
+"""Tests for repository sync operations."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from pkm_tools.config import CloneOptions
+from pkm_tools.repo_sync import RepositorySync, RepositorySyncError
+from tests.conftest import GIT_IDENTITY, commit, git, make_system
+
+
+def test_default_branch_from_remote_head_is_cached(sync: RepositorySync, clone: Path) -> None:
+    git(clone, "checkout", "-q", "-b", "feature")
+
+    assert asyncio.run(sync._get_default_branch(clone)) == "main"
+    assert sync.state.get_default_branch(clone) == "main"
+
+
+def test_current_branch_fallback_is_not_cached(sync: RepositorySync, clone: Path) -> None:
+    git(clone, "checkout", "-q", "-b", "feature")
+    git(clone, "symbolic-ref", "--delete", "refs/remotes/origin/HEAD")
+    git(clone, "update-ref", "-d", "refs/remotes/origin/main")
+
+    assert asyncio.run(sync._get_default_branch(clone)) == "feature"
+    assert sync.state.get_default_branch(clone) is None
+
+
+def test_pool_results_follow_the_repository_list(
+    sync: RepositorySync, pkm_root: Path, tmp_path: Path, origin: Path
+) -> None:
+    for name in ("beta", "alpha"):
+        git(tmp_path, "clone", "-q", "--bare", str(origin), str(tmp_path / f"{name}.git"))
+    urls = [str(tmp_path / f"{name}.git") for name in ("beta", "missing", "alpha")]
+    make_system(pkm_root, "thk", urls)
+
+    results = sync.clone_system("thk", jobs=3)
+
+    assert (results["system"], results["cloned"], results["failed"]) == ("thk", 2, 1)
+    # The quickly failing clone does not overtake the others
+    assert [repo["name"] for repo in results["repos"]] == ["beta", "missing", "alpha"]
+    assert [repo["status"] for repo in results["repos"]] == ["success", "failed", "success"]
+    assert results["repos"][1]["error"]
+    assert results["elapsed"] > 0
+    assert results["serial_elapsed"] > 0
+
+
+def push_commit(tmp_path: Path, origin: Path, name: str) -> str:
+    """Commit a file in the origin's work tree and push it to ``origin``."""
+    work = tmp_path / "origin-work"
+    sha = commit(work, name)
+    git(work, "push", "-q", str(origin), "main")
+    return sha
+
+
+def record_git(sync: RepositorySync, monkeypatch: pytest.MonkeyPatch) -> list:
+    """Record the arguments and working directory of every git command ``sync`` runs."""
+    commands = []
+    run = sync.git.run
+
+    def record(*args: str, **kwargs: object) -> object:
+        commands.append((args, kwargs.get("cwd")))
+        return run(*args, **kwargs)
+
+    monkeypatch.setattr(sync.git, "run", record)
+    return commands
+
+
+def test_fast_forward_skips_the_fetch_when_up_to_date(
+    sync: RepositorySync, clone: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    commands = record_git(sync, monkeypatch)
+
+    result = asyncio.run(sync._fast_forward_repository(clone, "main"))
+
+    assert result["had_changes"] is False
+    assert not [args for args, _ in commands if "fetch" in args]
+
+
+def test_fast_forward_merges_the_checked_out_branch(
+    sync: RepositorySync, clone: Path, tmp_path: Path, origin: Path
+) -> None:
+    sha = push_commit(tmp_path, origin, "new.txt")
+
+    result = asyncio.run(sync._fast_forward_repository(clone, "main"))
+
+    assert result["had_changes"] is True
+    assert git(clone, "rev-parse", "HEAD") == sha
+    assert (clone / "new.txt").exists()
+    assert git(clone, "status", "--porcelain") == ""
+
+
+def test_fast_forward_moves_a_branch_that_is_not_checked_out(
+    sync: RepositorySync, clone: Path, tmp_path: Path, origin: Path
+) -> None:
+    git(clone, "checkout", "-q", "-b", "feature")
+    sha = push_commit(tmp_path, origin, "new.txt")
+
+    asyncio.run(sync._fast_forward_repository(clone, "main"))
+
+    assert git(clone, "rev-parse", "refs/heads/main") == sha
+    assert git(clone, "branch", "--show-current") == "feature"
+    assert not (clone / "new.txt").exists()
+
+
+def test_fast_forward_refuses_a_diverged_branch(
+    sync: RepositorySync, clone: Path, tmp_path: Path, origin: Path
+) -> None:
+    local = commit(clone, "local.txt")
+    push_commit(tmp_path, origin, "upstream.txt")
+
+    with pytest.raises(RepositorySyncError, match="has diverged"):
+        asyncio.run(sync._fast_forward_repository(clone, "main"))
+    assert git(clone, "rev-parse", "HEAD") == local
+
+
+def test_probe_skips_the_fetch_for_unchanged_repositories(
+    sync: RepositorySync,
+    pkm_root: Path,
+    tmp_path: Path,
+    origin: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    other = tmp_path / "other.git"
+    git(tmp_path, "clone", "-q", "--bare", str(origin), str(other))
+    repos_dir = make_system(pkm_root, "thk", [str(origin), str(other)])
+    for url in (origin, other):
+        git(repos_dir, "clone", "-q", str(url))
+    sha = push_commit(tmp_path, origin, "new.txt")
+    commands = record_git(sync, monkeypatch)
+
+    results = sync.sync_system("thk", fetch_first=True)
+
+    assert [repo["had_changes"] for repo in results["repos"]] == [True, False]
+    assert git(repos_dir / "origin", "rev-parse", "HEAD") == sha
+    # One ls-remote per remote, and only the changed repository fetches
+    assert len([args for args, _ in commands if "ls-remote" in args]) == 2
+    assert {cwd.name for args, cwd in commands if "fetch" in args} == {"origin"}
+
+
+def test_status_skips_untracked_files_unless_asked(
+    sync: RepositorySync, pkm_root: Path, origin: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repos_dir = make_system(pkm_root, "thk", [str(origin)])
+    git(repos_dir, "clone", "-q", str(origin))
+    (repos_dir / "origin" / "scratch.txt").write_text("new")
+    commands = record_git(sync, monkeypatch)
+
+    [status] = sync.get_repository_status("thk")
+
+    assert (status["branch"], status["dirty"]) == ("main", False)
+    assert "untracked" not in status
+    [(args, _)] = commands
+    assert "--untracked-files=no" in args
+
+    [status] = sync.get_repository_status("thk", untracked=True)
+
+    assert status["untracked"] is True
+
+
+def test_plan_update_orders_clones_first(
+    sync: RepositorySync, pkm_root: Path, tmp_path: Path, origin: Path
+) -> None:
+    other = tmp_path / "other.git"
+    git(tmp_path, "clone", "-q", "--bare", str(origin), str(other))
+    repos_dir = make_system(pkm_root, "thk", [str(origin), str(other)])
+    git(repos_dir, "clone", "-q", str(origin), "origin")
+
+    plan = sync.plan_update("thk", fetch_first=True)
+
+    entries = {entry["name"]: entry for entry in plan["systems"][0]["repos"]}
+    assert entries["other"]["action"] == "clone"
+    assert entries["other"]["order"] == 1
+    assert entries["origin"]["action"] == "skip"
+    assert plan["counts"] == {"clone": 1, "fast-forward": 0, "merge": 0, "skip": 1, "conflict": 0}
+    # A dry run leaves the sync state alone
+    assert sync.state.get_default_branch(repos_dir / "origin") is None
+
+
+@pytest.mark.parametrize("fetch_first", [False, True])
+def test_diverged_repositories_are_merged_unless_fetch_first(
+    sync: RepositorySync,
+    pkm_root: Path,
+    tmp_path: Path,
+    origin: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    fetch_first: bool,
+) -> None:
+    for name, value in GIT_IDENTITY.items():
+        monkeypatch.setenv(name, value)
+    repos_dir = make_system(pkm_root, "thk", [str(origin)])
+    git(repos_dir, "clone", "-q", str(origin), "origin")
+    repo = repos_dir / "origin"
+    # Diverged branches are reconciled as pull.rebase says, like a plain git pull
+    git(repo, "config", "pull.rebase", "false")
+    local = commit(repo, "local.txt")
+    work = tmp_path / "origin-work"
+    upstream = commit(work, "upstream.txt")
+    git(work, "push", "-q", str(origin), "main")
+    git(repo, "fetch", "-q", "origin")
+
+    [entry] = sync.plan_update("thk", fetch_first=fetch_first)["systems"][0]["repos"]
+    results = sync.update_system("thk", fetch_first=fetch_first)
+
+    assert entry["reason"] == "diverged from origin (1 ahead, 1 behind)"
+    if fetch_first:
+        assert entry["action"] == "conflict"
+        assert results["failed"] == 1
+        assert git(repo, "rev-parse", "HEAD") == local
+    else:
+        assert entry["action"] == "merge"
+        assert results["updated"] == 1
+        for sha in (local, upstream):
+            git(repo, "merge-base", "--is-ancestor", sha, "HEAD")
+
+
+def test_update_plans_inside_the_run(
+    sync: RepositorySync, pkm_root: Path, tmp_path: Path, origin: Path
+) -> None:
+    repos_dir = make_system(pkm_root, "thk", [str(origin)])
+    git(repos_dir, "clone", "-q", str(origin), "origin")
+    work = tmp_path / "origin-work"
+    commit(work, "CHANGES.md")
+    git(work, "push", "-q", str(origin), "main")
+
+    results = sync.update_system("thk", fetch_first=True)
+
+    assert results["updated"] == 1
+    assert git(repos_dir / "origin", "rev-parse", "HEAD") == git(work, "rev-parse", "HEAD")
+    # The probe's spans and scheduler statistics survive the run's reset
+    assert {"probe", "plan"} <= set(results["run_phases"])
+    # Phases nested in planning a repository are not counted again at run level
+    assert "default-branch" not in results["run_phases"]
+    assert results["hosts"]["local"]["operations"] >= 2
+
+
+@pytest.mark.parametrize("dissociate", [False, True])
+def test_clone_borrows_objects_from_the_mirror(
+    sync: RepositorySync, pkm_root: Path, origin: Path, dissociate: bool
+) -> None:
+    url = f"file://{origin}"
+    repos_dir = make_system(pkm_root, "thk", [url])
+
+    results = sync.clone_system(
+        "thk", clone_options=CloneOptions(reference=True, dissociate=dissociate)
+    )
+
+    assert results["cloned"] == 1
+    alternates = repos_dir / "origin" / ".git" / "objects" / "info" / "alternates"
+    if dissociate:
+        assert not alternates.exists()
+    else:
+        borrowed = Path(alternates.read_text().strip())
+        assert borrowed.resolve() == (sync.mirrors.path_for(url) / "objects").resolve()
+    assert git(repos_dir / "origin", "config", "remote.origin.url") == url
+    assert git(repos_dir / "origin", "fsck", "--connectivity-only") == ""
+
+
+def test_sync_fetches_through_the_mirror(
+    sync: RepositorySync,
+    pkm_root: Path,
+    tmp_path: Path,
+    origin: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    url = f"file://{origin}"
+    repos_dir = make_system(pkm_root, "thk", [url])
+    git(repos_dir, "clone", "-q", url, "origin")
+    work = tmp_path / "origin-work"
+    sha = commit(work, "new.txt")
+    git(work, "push", "-q", str(origin), "main")
+    repo = repos_dir / "origin"
+    commands = []
+    run = sync.git.run
+
+    def record(*args: str, **kwargs: object) -> object:
+        if kwargs.get("cwd") == repo:
+            commands.append(args)
+        return run(*args, **kwargs)
+
+    monkeypatch.setattr(sync.git, "run", record)
+
+    results = sync.sync_system("thk", use_mirror=True)
+
+    assert results["synced"] == 1
+    assert git(repo, "rev-parse", "HEAD") == sha
+    mirror = sync.mirrors.path_for(url)
+    assert git(mirror, "rev-parse", "refs/heads/main") == sha
+    # Commands that contact the remote are redirected to the mirror for that command only
+    redirect = ("-c", f"url.{mirror.resolve().as_uri()}.insteadOf={url}")
+    network = [
+        args
+        for args in commands
+        if {"fetch", "pull", "ls-remote"} & set(args) and "." not in args  # not a local pull
+    ]
+    assert network
+    assert all(args[:2] == redirect for args in network)
+    assert git(repo, "config", "remote.origin.url") == url
+
+
+
+def test_system_manifest_sets_branches_and_concurrency(
+    sync: RepositorySync,
+    pkm_root: Path,
+    tmp_path: Path,
+    origin: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    git(origin, "branch", "develop", "main")
+    other = tmp_path / "other.git"
+    git(tmp_path, "clone", "-q", "--bare", str(origin), str(other))
+    repos_dir = make_system(pkm_root, "thk", [str(origin), str(other)])
+    (pkm_root / "systems" / "thk" / "system.yaml").write_text(
+        "concurrency: 1\nbranches:\n  origin: develop\n"
+    )
+
+    active = peak = 0
+    clone_repository = sync._clone_repository
+
+    async def counted(*args: object) -> None:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        try:
+            await clone_repository(*args)
+        finally:
+            active -= 1
+
+    monkeypatch.setattr(sync, "_clone_repository", counted)
+
+    results = sync.clone_system("thk", jobs=4)
+
+    assert results["cloned"] == 2
+    assert peak == 1
+    assert git(repos_dir / "origin", "branch", "--show-current") == "develop"
+    assert git(repos_dir / "other", "branch", "--show-current") == "main"
+
+
+def test_repository_manifest_sets_depth_and_start_order(
+    sync: RepositorySync, pkm_root: Path, tmp_path: Path, origin: Path
+) -> None:
+    other = tmp_path / "other.git"
+    git(tmp_path, "clone", "-q", "--bare", str(origin), str(other))
+    # Local clones ignore --depth unless the source is a file:// URL
+    other_url = f"file://{other}"
+    repos_dir = make_system(pkm_root, "thk", [str(origin), other_url])
+    (repos_dir / "repositories.yaml").write_text(
+        f"repositories:\n  - {{url: '{other_url}', shallow: true, priority: high}}\n"
+    )
+    started = []
+    sync.on_result = lambda _, result: started.append(result["name"])
+
+    results = sync.clone_system("thk", jobs=1)
+
+    assert results["cloned"] == 2
+    assert started == ["other", "origin"]
+    assert git(repos_dir / "other", "rev-list", "--count", "HEAD") == "1"
+    assert git(repos_dir / "origin", "rev-list", "--count", "HEAD") == "2"
+
+
+def test_sparse_checkout_is_applied_at_clone_and_maintained_by_sync(
+    sync: RepositorySync, pkm_root: Path, tmp_path: Path, origin: Path
+) -> None:
+    work = tmp_path / "origin-work"
+    commit(work, "docs/guide.md")
+    git(work, "push", "-q", str(origin), "main")
+    # Partial clones need a file:// URL and a server that allows filters
+    git(origin, "config", "uploadpack.allowFilter", "true")
+    url = f"file://{origin}"
+    repos_dir = make_system(pkm_root, "thk", [])
+    manifest = repos_dir / "repositories.yaml"
+    manifest.write_text(f"repositories:\n  - {{url: '{url}', sparse: [src]}}\n")
+    sync.registry.check_interval = 0
+    repo = repos_dir / "origin"
+
+    assert sync.clone_system("thk")["cloned"] == 1
+    assert (repo / "README.md").exists()
+    assert (repo / "src" / "app.py").exists()
+    assert not (repo / "docs").exists()
+    assert git(repo, "config", "remote.origin.partialclonefilter") == "blob:none"
+
+    manifest.write_text(f"repositories:\n  - {{url: '{url}', sparse: [docs]}}\n")
+    results = sync.sync_system("thk")
+
+    assert results["synced"] == 1
+    assert (repo / "docs" / "guide.md").exists()
+    assert not (repo / "src").exists()
+    assert "sparse" in results["phases"]
+
+    manifest.write_text(f"repositories:\n  - '{url}'\n")
+    assert sync.sync_system("thk")["synced"] == 1
+    assert (repo / "src" / "app.py").exists()
+    assert (repo / "docs" / "guide.md").exists()
+    assert git(repo, "config", "--get-all", "core.sparseCheckout") == "false"
+
+
+def pr_info(pr_id: str, repo: str = "origin", source_branch: str = "feature") -> dict:
+    return {
+        "project": "ETS",
+        "repo": repo,
+        "pr_id": pr_id,
+        "title": f"PR {pr_id}",
+        "source_branch": source_branch,
+        "target_branch": "main",
+        "author": "Dev",
+    }
+
+
+def push_pr(tmp_path: Path, origin: Path, pr_id: str, branch: str) -> str:
+    """Push a feature branch and publish it as a Bitbucket pull request ref."""
+    work = tmp_path / "origin-work"
+    git(work, "checkout", "-q", "-b", branch, "main")
+    sha = commit(work, f"{branch}.txt")
+    git(work, "push", "-q", str(origin), branch)
+    git(origin, "update-ref", f"refs/pull-requests/{pr_id}/from", sha)
+    git(work, "checkout", "-q", "main")
+    return sha
+
+
+def test_checkout_prs_into_worktrees(
+    sync: RepositorySync,
+    pkm_root: Path,
+    tmp_path: Path,
+    origin: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    repos_dir = make_system(pkm_root, "thk", [str(origin)])
+    git(repos_dir, "clone", "-q", str(origin), "origin")
+    first = push_pr(tmp_path, origin, "1", "feature-a")
+    second = push_pr(tmp_path, origin, "2", "feature-b")
+    infos = [pr_info("1", source_branch="feature-a"), pr_info("2", source_branch="feature-b")]
+    monkeypatch.setattr(sync, "get_pr_infos", lambda urls, refresh=False: infos)
+
+    results = sync.checkout_pr_branches(["pr-1", "pr-2"], worktree=True)
+
+    assert [result["status"] for result in results] == ["success", "success"]
+    for result, sha in zip(results, (first, second), strict=True):
+        assert git(Path(result["path"]), "rev-parse", "HEAD") == sha
+    assert results[0]["path"] == str(sync.config.worktrees_dir / "thk" / "origin" / "pr-1")
+    # The main working tree stays on its branch and only the PR refs were fetched
+    clone = repos_dir / "origin"
+    assert git(clone, "branch", "--show-current") == "main"
+    remote_refs = git(clone, "for-each-ref", "--format=%(refname)", "refs/remotes/origin")
+    assert "refs/remotes/origin/feature-a" not in remote_refs.splitlines()
+    assert "refs/remotes/origin/pull-requests/1" in remote_refs.splitlines()
+
+    # A second checkout resets the existing worktree, even after a force-push
+    work = tmp_path / "origin-work"
+    git(work, "checkout", "-q", "feature-a")
+    git(work, "reset", "-q", "--hard", "main")
+    rebased = commit(work, "review-fix.txt")
+    git(work, "push", "-q", "--force", str(origin), "feature-a")
+    git(origin, "update-ref", "refs/pull-requests/1/from", rebased)
+    monkeypatch.setattr(sync, "get_pr_infos", lambda urls, refresh=False: infos[:1])
+
+    assert sync.checkout_pr_branches(["pr-1"], worktree=True)[0]["status"] == "success"
+    assert git(Path(results[0]["path"]), "rev-parse", "HEAD") == rebased
+
+    # Uncommitted changes in a worktree are never discarded
+    (Path(results[0]["path"]) / "README.md").write_text("review notes")
+    [result] = sync.checkout_pr_branches(["pr-1"], worktree=True)
+    assert result["status"] == "failed"
+    assert "uncommitted changes" in result["error"]
+    assert (Path(results[0]["path"]) / "README.md").read_text() == "review notes"
+
+
+def test_checkout_pr_errors_do_not_stop_other_prs(
+    sync: RepositorySync,
+    pkm_root: Path,
+    tmp_path: Path,
+    origin: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    repos_dir = make_system(pkm_root, "thk", [str(origin)])
+    git(repos_dir, "clone", "-q", str(origin), "origin")
+    sha = push_pr(tmp_path, origin, "4", "feature")
+    infos = [pr_info("3", source_branch="gone"), pr_info("4")]
+    monkeypatch.setattr(sync, "get_pr_infos", lambda urls, refresh=False: infos)
+    fetch_pr_ref = sync._fetch_pr_ref
+
+    async def fetch(repo_path: Path, repo_url: str, info: dict, use_mirror: bool) -> str:
+        if info["pr_id"] == "3":
+            raise PermissionError("cannot write to the repository")
+        return await fetch_pr_ref(repo_path, repo_url, info, use_mirror)
+
+    monkeypatch.setattr(sync, "_fetch_pr_ref", fetch)
+
+    results = sync.checkout_pr_branches(["pr-3", "pr-4"], worktree=True)
+
+    assert [result["status"] for result in results] == ["failed", "success"]
+    assert "cannot write to the repository" in results[0]["error"]
+    assert git(Path(results[1]["path"]), "rev-parse", "HEAD") == sha
+
+
+def test_checkout_pr_without_pull_request_refs_fetches_the_branch(
+    sync: RepositorySync,
+    pkm_root: Path,
+    tmp_path: Path,
+    origin: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    repos_dir = make_system(pkm_root, "thk", [str(origin)])
+    git(repos_dir, "clone", "-q", str(origin), "origin")
+    sha = push_pr(tmp_path, origin, "3", "feature")
+    git(origin, "update-ref", "-d", "refs/pull-requests/3/from")
+    infos = [pr_info("3"), pr_info("4", repo="unknown"), RepositorySyncError("HTTP 404")]
+    monkeypatch.setattr(sync, "get_pr_infos", lambda urls, refresh=False: infos)
+
+    results = sync.checkout_pr_branches(["pr-3", "pr-4", "pr-5"])
+
+    assert results[0]["status"] == "success"
+    assert results[0]["path"] == str(repos_dir / "origin")
+    assert git(repos_dir / "origin", "branch", "--show-current") == "feature"
+    assert git(repos_dir / "origin", "rev-parse", "HEAD") == sha
+    assert results[1]["status"] == "failed"
+    assert "not found in any system" in results[1]["error"]
+    assert results[2] == {"url": "pr-5", "status": "failed", "error": "HTTP 404"}
@@ -0,0 +1,70 @@
+"""Tests for SSH connection sharing."""
+
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from pkm_tools.config import PKMConfig
+from pkm_tools.repo_sync import RepositorySync
+from pkm_tools.ssh import SSHMultiplexer, ssh_target
+
+
+@pytest.mark.parametrize(
+    ("repo_url", "target"),
+    [
+        ("ssh://git@git.example.com:7999/ets/tomahawk2.git", ("git", "git.example.com", 7999)),
+        ("git+ssh://git.example.com/ets/common.git", (None, "git.example.com", None)),
+        ("git@github.com:org/repo.git", ("git", "github.com", None)),
+        ("github.com:org/repo.git", (None, "github.com", None)),
+        ("https://github.com/org/repo.git", None),
+        ("file:///srv/git/repo.git", None),
+        ("/srv/git/repo.git", None),
+    ],
+)
+def test_ssh_target(repo_url: str, target: tuple) -> None:
+    assert ssh_target(repo_url) == target
+
+
+def test_command_shares_connections_through_the_control_dir() -> None:
+    ssh = SSHMultiplexer(Path("/run/pkm/ssh"), "ssh -i 'my key'", persist=30)
+
+    assert ssh.options() == [
+        "-o", "ControlMaster=auto",
+        "-o", "ControlPath=/run/pkm/ssh/%C",
+        "-o", "ControlPersist=30",
+    ]
+    assert ssh.command.startswith("ssh -i 'my key' -o ControlMaster=auto ")
+    assert ssh._target_args(("git", "host", 7999)) == ["-p", "7999", "-l", "git", "host"]
+    assert ssh._target_args((None, "host", None)) == ["host"]
+
+
+def test_long_control_dir_falls_back_to_the_temp_dir(tmp_path: Path) -> None:
+    ssh = SSHMultiplexer(tmp_path / ("x" * 80))
+
+    assert ssh.control_dir == Path(tempfile.gettempdir()) / f"pkm-ssh-{os.getuid()}"
+    assert ssh.base_command == ["ssh"]
+
+
+def test_connect_without_ssh_remotes_opens_nothing(tmp_path: Path) -> None:
+    ssh = SSHMultiplexer(tmp_path / "ssh")
+
+    assert asyncio.run(ssh.connect(["https://github.com/org/repo.git", "/srv/repo.git"])) == 0
+    assert not ssh.control_dir.exists()
+
+
+@pytest.mark.parametrize("multiplex", [True, False])
+def test_git_uses_the_shared_ssh_command_when_enabled(config: PKMConfig, multiplex: bool) -> None:
+    config = config.model_copy(update={"ssh_multiplex": multiplex, "git_ssh_command": "ssh -4"})
+    sync = RepositorySync(config)
+
+    if multiplex:
+        assert sync.ssh is not None
+        assert sync.git.ssh_command == sync.ssh.command
+        assert sync.git.ssh_command.startswith("ssh -4 -o ControlMaster=auto")
+    else:
+        assert sync.ssh is None
+        assert sync.git.ssh_command == "ssh -4"
+    sync.state.close()
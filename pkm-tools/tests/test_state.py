@@ -0,0 +1,104 @@
+"""Tests for the SQLite sync state store."""
+
+from pathlib import Path
+
+import pytest
+
+from pkm_tools.state import SyncStateStore
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> SyncStateStore:
+    state = SyncStateStore(tmp_path / ".pkm" / "state.db")
+    yield state
+    state.close()
+
+
+def test_database_is_created_lazily(tmp_path: Path) -> None:
+    db_path = tmp_path / ".pkm" / "state.db"
+    state = SyncStateStore(db_path)
+    assert not db_path.exists()
+
+    assert state.get(tmp_path / "repos" / "repo") is None
+    assert db_path.exists()
+    state.close()
+
+
+def test_update_only_changes_given_fields(store: SyncStateStore, tmp_path: Path) -> None:
+    repo_path = tmp_path / "repos" / "repo"
+
+    store.update(repo_path, url="git@host:org/repo.git", default_branch="main", branch="main")
+    store.update(repo_path, branch="feature", local_sha="abc")
+
+    state = store.get(repo_path)
+    assert state["target_dir"] == str(tmp_path / "repos")
+    assert state["name"] == "repo"
+    assert state["url"] == "git@host:org/repo.git"
+    assert state["default_branch"] == "main"
+    assert state["branch"] == "feature"
+    assert state["local_sha"] == "abc"
+
+
+def test_update_rejects_unknown_fields(store: SyncStateStore, tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="Unknown sync state fields: colour"):
+        store.update(tmp_path / "repo", colour="blue")
+
+
+def test_record_result_success_keeps_default_branch(
+    store: SyncStateStore, tmp_path: Path
+) -> None:
+    repo_path = tmp_path / "repos" / "repo"
+    store.update(repo_path, default_branch="develop")
+
+    store.record_result(repo_path, "url", "synced", 1.5, local_sha="abc")
+
+    state = store.get(repo_path)
+    assert state["default_branch"] == "develop"
+    assert state["last_action"] == "synced"
+    assert state["last_duration"] == 1.5
+    assert state["last_error"] is None
+    assert state["last_synced_at"] is not None
+    assert store.get_default_branch(repo_path) == "develop"
+
+
+def test_record_result_error_clears_default_branch(
+    store: SyncStateStore, tmp_path: Path
+) -> None:
+    repo_path = tmp_path / "repos" / "repo"
+    store.update(repo_path, default_branch="develop")
+
+    store.record_result(repo_path, "url", "failed", 0.2, error="fetch failed")
+
+    state = store.get(repo_path)
+    assert state["last_error"] == "fetch failed"
+    assert state["default_branch"] is None
+    assert store.get_default_branch(repo_path) is None
+
+
+def test_get_for_directory(store: SyncStateStore, tmp_path: Path) -> None:
+    for name in ("beta", "alpha"):
+        store.record_result(tmp_path / "thk" / name, f"url-{name}", "synced", 1.0)
+    store.record_result(tmp_path / "gcp" / "gamma", "url-gamma", "cloned", 2.0)
+
+    entries = store.get_for_directory(tmp_path / "thk")
+
+    assert [entry["name"] for entry in entries] == ["alpha", "beta"]
+    assert entries[0]["path"] == str(tmp_path / "thk" / "alpha")
+    assert store.get_for_directory(tmp_path / "missing") == []
+
+
+def test_schedule_round_trip(store: SyncStateStore, tmp_path: Path) -> None:
+    repo_path = tmp_path / "repos" / "repo"
+
+    store.save_schedule(repo_path, 60.0, 1000.0)
+    store.save_schedule(repo_path, 90.0, 2000.0, last_fetched_at=1900.0)
+
+    assert store.get_schedule() == {
+        str(repo_path): {
+            "path": str(repo_path),
+            "interval": 90.0,
+            "next_fetch_at": 2000.0,
+            "last_fetched_at": 1900.0,
+            "last_changed_at": None,
+        }
+    }